@@ -0,0 +1,121 @@
+"""Benchmark compressed vs. uncompressed checkpoint save/load.
+
+Writes a synthetic state dict with every available codec and measures
+end-to-end save and load time plus on-disk size. Before each load the file
+is evicted from the page cache (best effort, ``posix_fadvise``), so on a
+slow or network disk the load numbers include real read time. Point
+``--dir`` at the disk you care about.
+
+``--disk-mbps`` additionally reports a modelled load time for a disk of the
+given bandwidth, which is useful when benchmarking on a fast local SSD. It
+is ``decode_s + size_bytes / bandwidth``, where ``decode_s`` is the load
+time with the file already in the page cache (so reading it is a memory
+copy, not disk I/O), meaning the read is counted once, at the modelled
+bandwidth.
+
+Usage:
+    python benchmarks/bench_checkpoint_io.py --size-mb 256 --dir /mnt/shared/tmp
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+import torch
+
+from lightning_mcp.lightning.checkpoint_io import COMPRESSION_CODECS, atomic_save, load_checkpoint
+
+
+def _make_state_dict(size_mb: int) -> dict[str, torch.Tensor]:
+    """Mix of dense weights and sparse/low-entropy buffers, like real checkpoints."""
+    n = size_mb * 1024 * 1024 // 4
+    return {
+        "dense.weight": torch.randn(n // 2),
+        "embedding.weight": torch.randn(n // 4).to(torch.bfloat16).float(),
+        "mask": (torch.rand(n // 4) > 0.9).float(),
+    }
+
+
+def _evict(path: str) -> None:
+    if not hasattr(os, "posix_fadvise"):
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    finally:
+        os.close(fd)
+
+
+def _warm(path: str) -> None:
+    """Read the whole file once so later loads are served from the page cache."""
+    with open(path, "rb") as f:
+        while f.read(1 << 24):
+            pass
+
+
+def run(size_mb: int, directory: str, repeats: int, disk_mbps: float | None) -> list[dict]:
+    state_dict = _make_state_dict(size_mb)
+    results = []
+    for codec in (None, *COMPRESSION_CODECS):
+        path = os.path.join(directory, f"bench-{codec or 'raw'}.pt")
+
+        start = time.perf_counter()
+        try:
+            size = atomic_save(state_dict, path, compression=codec)
+        except ImportError:
+            continue  # optional codec dependency not installed
+        save_s = time.perf_counter() - start
+
+        load_times = []
+        for _ in range(repeats):
+            _evict(path)
+            start = time.perf_counter()
+            load_checkpoint(path)
+            load_times.append(time.perf_counter() - start)
+        load_s = min(load_times)
+
+        decode_s = None
+        if disk_mbps:
+            _warm(path)
+            decode_times = []
+            for _ in range(repeats):
+                start = time.perf_counter()
+                load_checkpoint(path)
+                decode_times.append(time.perf_counter() - start)
+            decode_s = min(decode_times)
+        os.unlink(path)
+
+        row = {
+            "codec": codec or "none",
+            "size_bytes": size,
+            "ratio": round(size_mb * 1024 * 1024 / size, 3),
+            "save_s": round(save_s, 4),
+            "load_s": round(load_s, 4),
+        }
+        if decode_s is not None:
+            row["decode_s"] = round(decode_s, 4)
+            row["modelled_load_s"] = round(decode_s + size / (disk_mbps * 1024 * 1024), 4)
+        results.append(row)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--size-mb", type=int, default=64)
+    parser.add_argument("--dir", default=None, help="Directory on the disk to benchmark")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--disk-mbps", type=float, default=None)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as directory:
+        results = run(args.size_mb, directory, args.repeats, args.disk_mbps)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
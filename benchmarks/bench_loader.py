@@ -0,0 +1,72 @@
+"""Benchmark ``TensorBatchLoader`` against ``DataLoader(TensorDataset)``.
+
+Iterates full epochs over an in-memory dataset and reports samples/sec
+for each loader at several batch sizes, in order and shuffled. The stock
+loader indexes one sample at a time and collates; ``TensorBatchLoader``
+slices or gathers each batch in one op per tensor.
+
+Usage:
+    python benchmarks/bench_loader.py --samples 65536 --features 32
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from collections.abc import Iterable
+
+import torch
+from torch.utils.data import DataLoader, TensorDataset
+
+from lightning_mcp.lightning.tensor_loader import TensorBatchLoader
+
+BATCH_SIZES = (8, 64, 512)
+
+
+def _samples_per_second(loader: Iterable, n: int, repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _batch in loader:
+            pass
+        best = min(best, time.perf_counter() - start)
+    return n / best
+
+
+def run(samples: int, features: int, repeats: int) -> list[dict]:
+    x = torch.randn(samples, features)
+    y = torch.randint(0, 10, (samples,))
+    dataset = TensorDataset(x, y)
+
+    results = []
+    for shuffle in (False, True):
+        for batch_size in BATCH_SIZES:
+            stock = _samples_per_second(
+                DataLoader(dataset, batch_size=batch_size, shuffle=shuffle), samples, repeats
+            )
+            sliced = _samples_per_second(
+                TensorBatchLoader(x, y, batch_size=batch_size, shuffle=shuffle), samples, repeats
+            )
+            results.append({
+                "batch_size": batch_size,
+                "shuffle": shuffle,
+                "dataloader_samples_per_s": round(stock),
+                "tensor_batch_loader_samples_per_s": round(sliced),
+                "speedup": round(sliced / stock, 1),
+            })
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--samples", type=int, default=65536)
+    parser.add_argument("--features", type=int, default=32)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.samples, args.features, args.repeats), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,356 @@
+"""Benchmark suite for the MCP transports, handlers and response serialization.
+
+Runs offline on CPU. Groups (select with ``--only``):
+
+- ``stdio``: round-trip latency of ``initialize`` and ``tools/list`` against a
+  ``lightning-mcp`` subprocess;
+- ``framing``: round trip of 10 MB requests over stdio with line framing
+  versus ``Content-Length`` framing;
+- ``http``: requests/sec through ``http_server.app`` (in-process ASGI client);
+- ``handlers``: cold (first call in a fresh interpreter, imports included) and
+  warm latency of each handler with ``SimpleClassifier`` at several sizes;
+- ``serialization``: ``PredictHandler._serialize_predictions`` plus
+  ``build_tool_response`` for prediction outputs from 1 KB to 100 MB.
+
+Every result has a single headline ``value`` with a ``unit`` and a
+``better`` direction, so runs can be compared mechanically. ``--baseline``
+compares against a previous ``--output`` file and exits non-zero when any
+result regressed by more than ``--threshold``.
+
+Usage:
+    python benchmarks/bench_server.py --output baseline.json
+    python benchmarks/bench_server.py --baseline baseline.json --threshold 0.15
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from collections.abc import Callable
+from typing import Any
+
+GROUPS = ("stdio", "framing", "http", "handlers", "serialization")
+
+MODEL_SIZES = {
+    "small": {"input_dim": 4, "num_classes": 3},
+    "medium": {"input_dim": 512, "num_classes": 64},
+    "large": {"input_dim": 8192, "num_classes": 512},
+}
+
+SERIALIZATION_SIZES = {
+    "1KB": 1024,
+    "100KB": 100 * 1024,
+    "10MB": 10 * 1024 * 1024,
+    "100MB": 100 * 1024 * 1024,
+}
+
+_SIMPLE = "lightning_mcp.models.simple.SimpleClassifier"
+
+
+def _handler_requests(model: dict[str, Any]) -> dict[str, tuple[str, dict[str, Any]]]:
+    """(handler module.Class, params) per benchmarked tool."""
+    trainer = {"accelerator": "cpu", "max_epochs": 1, "enable_checkpointing": False}
+    return {
+        "inspect": ("inspect.InspectHandler", {"what": "model", "model": model}),
+        "train": ("train.TrainHandler", {"model": model, "trainer": trainer}),
+        "validate": ("validate.ValidateHandler", {"model": model, "trainer": trainer}),
+        "test": ("test.TestHandler", {"model": model, "trainer": trainer}),
+        "predict": ("predict.PredictHandler", {"model": model, "trainer": trainer}),
+    }
+
+
+def _latency_result(name: str, samples: list[float], **extra: Any) -> dict[str, Any]:
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+    return {
+        "name": name,
+        "value": round(statistics.median(ordered) * 1000.0, 4),
+        "unit": "ms",
+        "better": "lower",
+        "p95_ms": round(p95 * 1000.0, 4),
+        "min_ms": round(ordered[0] * 1000.0, 4),
+        "samples": len(ordered),
+        **extra,
+    }
+
+
+def _time(fn: Callable[[], Any], repeats: int, warmup: int = 1) -> list[float]:
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def bench_stdio(repeats: int) -> list[dict[str, Any]]:
+    proc = subprocess.Popen(
+        [sys.executable, "-c", "from lightning_mcp.cli import main; main()"],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+        bufsize=1,
+    )
+    assert proc.stdin is not None and proc.stdout is not None
+    counter = 0
+
+    def _call(method: str) -> None:
+        nonlocal counter
+        counter += 1
+        proc.stdin.write(json.dumps({"id": str(counter), "method": method, "params": {}}) + "\n")
+        proc.stdin.flush()
+        proc.stdout.readline()
+
+    try:
+        return [
+            _latency_result(f"stdio.{method}", _time(lambda m=method: _call(m), repeats, warmup=5))
+            for method in ("initialize", "tools/list")
+        ]
+    finally:
+        proc.stdin.close()
+        proc.wait(timeout=30)
+
+
+FRAMING_REQUEST_BYTES = 10 * 1024 * 1024
+
+
+def bench_framing(repeats: int) -> list[dict[str, Any]]:
+    # The blob is ignored by tools/list, so the time is transport and parsing
+    blob = "x" * FRAMING_REQUEST_BYTES
+    results = []
+    for framing in ("line", "content-length"):
+        proc = subprocess.Popen(
+            [sys.executable, "-m", "lightning_mcp.cli", "--framing", framing],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+        assert proc.stdin is not None and proc.stdout is not None
+        stdin, stdout = proc.stdin, proc.stdout
+        body = json.dumps({"id": "1", "method": "tools/list", "params": {"blob": blob}}).encode()
+        if framing == "line":
+            message = body + b"\n"
+        else:
+            message = b"Content-Length: %d\r\n\r\n" % len(body) + body
+
+        def _call(
+            framing: str = framing, stdin: Any = stdin, stdout: Any = stdout, message: bytes = message
+        ) -> None:
+            stdin.write(message)
+            stdin.flush()
+            if framing == "line":
+                stdout.readline()
+                return
+            length = 0
+            while header := stdout.readline().strip():
+                name, _, value = header.partition(b":")
+                if name.lower() == b"content-length":
+                    length = int(value)
+            stdout.read(length)
+
+        try:
+            samples = _time(_call, repeats)
+        finally:
+            stdin.close()
+            proc.wait(timeout=60)
+        results.append(
+            _latency_result(
+                f"framing.{framing}.10MB",
+                samples,
+                mb_per_s=round(FRAMING_REQUEST_BYTES / statistics.median(samples) / 1e6, 2),
+            )
+        )
+    return results
+
+
+def bench_http(duration: float) -> list[dict[str, Any]]:
+    from fastapi.testclient import TestClient
+
+    from lightning_mcp.http_server import app
+
+    client = TestClient(app)
+    results = []
+    for method in ("initialize", "tools/list"):
+        body = {"id": "1", "method": method, "params": {}}
+        client.post("/mcp", json=body)
+        count = 0
+        start = time.perf_counter()
+        while (elapsed := time.perf_counter() - start) < duration:
+            client.post("/mcp", json=body)
+            count += 1
+        results.append({
+            "name": f"http.{method}",
+            "value": round(count / elapsed, 2),
+            "unit": "req/s",
+            "better": "higher",
+            "requests": count,
+        })
+    return results
+
+
+_COLD_SCRIPT = """
+import importlib, json, sys, time
+start = time.perf_counter()
+from lightning_mcp.protocol import MCPRequest
+module, cls = sys.argv[1].rsplit(".", 1)
+handler = getattr(importlib.import_module("lightning_mcp.handlers." + module), cls)()
+handler.handle(MCPRequest(id="cold", method="bench", params=json.loads(sys.argv[2])))
+print(time.perf_counter() - start)
+"""
+
+
+def bench_handlers(repeats: int) -> list[dict[str, Any]]:
+    import importlib
+
+    from lightning_mcp.handlers.base import suppress_output
+    from lightning_mcp.protocol import MCPRequest
+
+    results = []
+    for size, dims in MODEL_SIZES.items():
+        model = {"_target_": _SIMPLE, **dims}
+        for tool, (target, params) in _handler_requests(model).items():
+            out = subprocess.run(
+                [sys.executable, "-c", _COLD_SCRIPT, target, json.dumps(params)],
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+            cold_s = float(out.stdout.strip().splitlines()[-1])
+
+            module, cls = target.rsplit(".", 1)
+            handler = getattr(importlib.import_module(f"lightning_mcp.handlers.{module}"), cls)()
+            request = MCPRequest(id="warm", method=f"lightning.{tool}", params=params)
+            with suppress_output():
+                samples = _time(lambda h=handler, r=request: h.handle(r), repeats)
+
+            results.append(_latency_result(f"handlers.{tool}.{size}.warm", samples))
+            results.append({
+                "name": f"handlers.{tool}.{size}.cold",
+                "value": round(cold_s * 1000.0, 4),
+                "unit": "ms",
+                "better": "lower",
+            })
+    return results
+
+
+def bench_serialization(repeats: int, max_bytes: int) -> list[dict[str, Any]]:
+    import torch
+
+    from lightning_mcp.handlers.base import build_tool_response
+    from lightning_mcp.handlers.predict import PredictHandler
+
+    handler = PredictHandler()
+    results = []
+    for label, nbytes in SERIALIZATION_SIZES.items():
+        if nbytes > max_bytes:
+            continue
+        # Batches of 64-wide float32 rows, like logits from a classifier
+        numel = max(64, nbytes // 4)
+        rows = numel // 64
+        batch_rows = max(1, min(rows, 4096))
+        predictions = list(torch.randn(rows, 64).split(batch_rows))
+
+        def _run(p: list[Any] = predictions) -> None:
+            build_tool_response("bench", {"predictions": handler._serialize_predictions(p)})
+
+        # Large payloads take seconds each; fewer repeats keep the suite bounded
+        runs = repeats if nbytes <= 10 * 1024 * 1024 else max(1, repeats // 5)
+        samples = _time(_run, runs, warmup=0 if runs == 1 else 1)
+        results.append(
+            _latency_result(
+                f"serialization.{label}",
+                samples,
+                mb_per_s=round(nbytes / statistics.median(samples) / 1e6, 2),
+            )
+        )
+    return results
+
+
+def compare(current: list[dict[str, Any]], baseline: list[dict[str, Any]], threshold: float) -> list[dict[str, Any]]:
+    """Relative change per result; ``regressed`` when worse than ``threshold``."""
+    previous = {r["name"]: r for r in baseline}
+    rows = []
+    for result in current:
+        base = previous.get(result["name"])
+        if base is None or not base["value"]:
+            continue
+        change = (result["value"] - base["value"]) / base["value"]
+        worse = change if result["better"] == "lower" else -change
+        rows.append({
+            "name": result["name"],
+            "unit": result["unit"],
+            "baseline": base["value"],
+            "current": result["value"],
+            "change": round(change, 4),
+            "regressed": worse > threshold,
+        })
+    return rows
+
+
+def run(groups: list[str], repeats: int, http_duration: float, max_serialize_mb: float) -> dict[str, Any]:
+    results: list[dict[str, Any]] = []
+    if "stdio" in groups:
+        results += bench_stdio(repeats * 10)
+    if "framing" in groups:
+        results += bench_framing(repeats)
+    if "http" in groups:
+        results += bench_http(http_duration)
+    if "handlers" in groups:
+        results += bench_handlers(repeats)
+    if "serialization" in groups:
+        results += bench_serialization(repeats, int(max_serialize_mb * 1024 * 1024))
+
+    import torch
+
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "torch": torch.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "torch_threads": torch.get_num_threads(),
+        },
+        "results": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--only", nargs="+", choices=GROUPS, default=list(GROUPS))
+    parser.add_argument("--repeats", type=int, default=10)
+    parser.add_argument("--http-duration", type=float, default=3.0, help="Seconds per HTTP method")
+    parser.add_argument("--max-serialize-mb", type=float, default=100.0)
+    parser.add_argument("--output", default=None, help="Also write results to this file")
+    parser.add_argument("--baseline", default=None, help="Compare against a previous --output file")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Allowed relative regression")
+    args = parser.parse_args()
+
+    report = run(args.only, args.repeats, args.http_duration, args.max_serialize_mb)
+
+    regressed = False
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        report["comparison"] = compare(report["results"], baseline["results"], args.threshold)
+        regressed = any(row["regressed"] for row in report["comparison"])
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    print(text)
+    sys.exit(1 if regressed else 0)
+
+
+if __name__ == "__main__":
+    main()
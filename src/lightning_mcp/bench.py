@@ -0,0 +1,338 @@
+"""Load generation and traffic record/replay for running MCP servers.
+
+Backs the ``lightning-mcp bench`` subcommand:
+
+- ``bench load`` drives a stdio or HTTP server with ``concurrency`` workers
+  for ``duration`` seconds, picking requests from a weighted mix;
+- ``bench record`` sits between an MCP client and a stdio server and
+  writes every client message, with its arrival time, to a JSONL file;
+- ``bench replay`` re-sends a recording with its original timing (scaled by
+  ``speed``), so production traffic can be reproduced on a dev box.
+
+Both load and replay report throughput and p50/p95/p99 latency per method.
+This module deliberately avoids importing torch or the server, so the
+driver itself stays light.
+"""
+
+from __future__ import annotations
+
+import http.client
+import itertools
+import json
+import random
+import shlex
+import subprocess
+import sys
+import threading
+import time
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, TextIO
+from urllib.parse import urlsplit
+
+DEFAULT_SERVER_COMMAND = f"{shlex.quote(sys.executable)} -m lightning_mcp.cli"
+DEFAULT_MIX: list[dict[str, Any]] = [
+    {"request": {"method": "initialize", "params": {}}, "weight": 1},
+    {"request": {"method": "tools/list", "params": {}}, "weight": 1},
+]
+
+
+class StdioTarget:
+    """A stdio server subprocess shared by many concurrent callers.
+
+    Requests from all threads are written to one pipe; a reader thread
+    matches responses back to callers by ``id``, so ``concurrency`` callers
+    keep up to that many requests queued at the server.
+    """
+
+    def __init__(self, command: str = DEFAULT_SERVER_COMMAND) -> None:
+        self._proc = subprocess.Popen(
+            shlex.split(command),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            bufsize=1,
+        )
+        self._write_lock = threading.Lock()
+        self._pending: dict[str, tuple[threading.Event, list[dict[str, Any]]]] = {}
+        self._reader = threading.Thread(target=self._read, name="lightning-mcp-bench", daemon=True)
+        self._reader.start()
+
+    def call(self, request: dict[str, Any]) -> dict[str, Any]:
+        done = threading.Event()
+        slot: list[dict[str, Any]] = []
+        self._pending[request["id"]] = (done, slot)
+        self.send(request)
+        done.wait()
+        if not slot:
+            raise ConnectionError("Server exited before responding")
+        return slot[0]
+
+    def send(self, message: dict[str, Any]) -> None:
+        assert self._proc.stdin is not None
+        line = json.dumps(message) + "\n"
+        with self._write_lock:
+            self._proc.stdin.write(line)
+            self._proc.stdin.flush()
+
+    def close(self) -> None:
+        assert self._proc.stdin is not None
+        self._proc.stdin.close()
+        self._proc.wait(timeout=30)
+
+    def _read(self) -> None:
+        assert self._proc.stdout is not None
+        for line in self._proc.stdout:
+            response = json.loads(line)
+            waiter = self._pending.pop(str(response.get("id")), None)
+            if waiter is not None:
+                waiter[1].append(response)
+                waiter[0].set()
+        # Server exited: release everyone still waiting
+        for done, _slot in list(self._pending.values()):
+            done.set()
+
+
+class HttpTarget:
+    """``POST /mcp`` with one keep-alive connection per calling thread."""
+
+    def __init__(self, url: str) -> None:
+        parts = urlsplit(url)
+        if parts.scheme != "http" or not parts.hostname:
+            raise ValueError(f"Expected an http:// URL, got '{url}'")
+        self._host = parts.hostname
+        self._port = parts.port or 80
+        self._path = parts.path or "/mcp"
+        self._local = threading.local()
+
+    def call(self, request: dict[str, Any]) -> dict[str, Any]:
+        conn: http.client.HTTPConnection | None = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = http.client.HTTPConnection(self._host, self._port)
+        body = json.dumps(request)
+        try:
+            conn.request("POST", self._path, body, {"Content-Type": "application/json"})
+            response = conn.getresponse()
+            payload = response.read()
+        except (OSError, http.client.HTTPException):
+            conn.close()
+            self._local.conn = None
+            raise
+        if response.status != 200:
+            return {"id": request.get("id"), "error": {"code": response.status, "message": "HTTP error"}}
+        return json.loads(payload)  # type: ignore[no-any-return]
+
+    def send(self, message: dict[str, Any]) -> None:
+        self.call(message)
+
+    def close(self) -> None:
+        pass
+
+
+class LatencyStats:
+    """Per-method latencies and error counts, recorded from many threads."""
+
+    def __init__(self) -> None:
+        self.latencies: dict[str, list[float]] = {}
+        self.errors: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, label: str, seconds: float, ok: bool) -> None:
+        with self._lock:
+            self.latencies.setdefault(label, []).append(seconds)
+            if not ok:
+                # Read-modify-write: not atomic without the lock
+                self.errors[label] = self.errors.get(label, 0) + 1
+
+    def report(self, elapsed: float) -> dict[str, Any]:
+        methods = {}
+        for label, values in sorted(self.latencies.items()):
+            ordered = sorted(values)
+            methods[label] = {
+                "count": len(ordered),
+                "errors": self.errors.get(label, 0),
+                "rps": round(len(ordered) / elapsed, 2) if elapsed > 0 else 0.0,
+                "p50_ms": _percentile_ms(ordered, 0.50),
+                "p95_ms": _percentile_ms(ordered, 0.95),
+                "p99_ms": _percentile_ms(ordered, 0.99),
+                "max_ms": round(ordered[-1] * 1000.0, 3),
+            }
+        total = sum(m["count"] for m in methods.values())
+        return {
+            "duration_s": round(elapsed, 3),
+            "requests": total,
+            "errors": sum(m["errors"] for m in methods.values()),
+            "throughput_rps": round(total / elapsed, 2) if elapsed > 0 else 0.0,
+            "methods": methods,
+        }
+
+
+def label_for(request: dict[str, Any]) -> str:
+    """Reporting label: the method, or ``tools/call:<tool>`` for tool calls."""
+    method = str(request.get("method"))
+    if method == "tools/call":
+        return f"tools/call:{request.get('params', {}).get('name')}"
+    return method
+
+
+def load(
+    target: StdioTarget | HttpTarget,
+    mix: list[dict[str, Any]] | None = None,
+    concurrency: int = 1,
+    duration: float = 10.0,
+    seed: int = 0,
+) -> dict[str, Any]:
+    """Closed-loop load: each worker sends its next request when the last returns.
+
+    Every request in the mix is sent once before the clock starts, which
+    waits out server startup and keeps one-off cold paths out of the numbers.
+    """
+    if concurrency < 1:
+        raise ValueError("'concurrency' must be >= 1")
+    mix = mix or DEFAULT_MIX
+    requests = [entry["request"] for entry in mix]
+    weights = [float(entry.get("weight", 1)) for entry in mix]
+    ids = itertools.count()
+    for request in requests:
+        target.call({**request, "id": f"warmup-{next(ids)}"})
+
+    stats = LatencyStats()
+    deadline = time.perf_counter() + duration
+
+    def _worker(worker: int) -> None:
+        rng = random.Random(seed + worker)
+        while time.perf_counter() < deadline:
+            request = {**rng.choices(requests, weights)[0], "id": f"bench-{next(ids)}"}
+            _timed_call(target, request, stats)
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=_worker, args=(i,)) for i in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    report = stats.report(time.perf_counter() - start)
+    report["concurrency"] = concurrency
+    return report
+
+
+def record(
+    output: TextIO,
+    server_command: str = DEFAULT_SERVER_COMMAND,
+    client_in: TextIO | None = None,
+    client_out: TextIO | None = None,
+) -> None:
+    """Proxy a stdio session to ``server_command``, recording client messages.
+
+    Each line the client sends is forwarded unchanged and appended to
+    ``output`` as ``{"t": <seconds since start>, "message": {...}}``.
+    Server output is relayed back to the client verbatim.
+    """
+    client_in = client_in or sys.stdin
+    client_out = client_out or sys.stdout
+    proc = subprocess.Popen(
+        shlex.split(server_command), stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True, bufsize=1
+    )
+    assert proc.stdin is not None and proc.stdout is not None
+    server_out = proc.stdout
+
+    def _relay() -> None:
+        for line in server_out:
+            client_out.write(line)
+            client_out.flush()
+
+    relay = threading.Thread(target=_relay, daemon=True)
+    relay.start()
+
+    start = time.perf_counter()
+    for line in client_in:
+        if not line.strip():
+            continue
+        t = time.perf_counter() - start
+        proc.stdin.write(line if line.endswith("\n") else line + "\n")
+        proc.stdin.flush()
+        try:
+            message = json.loads(line)
+        except json.JSONDecodeError:
+            continue  # forwarded, but not replayable
+        output.write(json.dumps({"t": round(t, 6), "message": message}) + "\n")
+        output.flush()
+
+    proc.stdin.close()
+    proc.wait()
+    relay.join(timeout=5)
+
+
+def replay(
+    target: StdioTarget | HttpTarget,
+    recording: Iterable[str],
+    speed: float = 1.0,
+    max_workers: int = 64,
+) -> dict[str, Any]:
+    """Re-send recorded messages at their original offsets divided by ``speed``.
+
+    Requests are sent from a thread pool, so a slow response does not delay
+    later sends; ``lag_ms`` reports how late sends were against schedule.
+    """
+    if speed <= 0:
+        raise ValueError("'speed' must be > 0")
+    entries = [json.loads(line) for line in recording if line.strip()]
+    # Wait out server startup so it does not show up as lag on the first sends
+    target.call({"id": "replay-ready", "method": "tools/list", "params": {}})
+
+    stats = LatencyStats()
+    lags: list[float] = []
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for entry in entries:
+            due = start + entry["t"] / speed
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            lags.append(max(0.0, time.perf_counter() - due))
+            message = entry["message"]
+            if isinstance(message, dict) and "id" in message:
+                pool.submit(_timed_call, target, {**message, "id": str(message["id"])}, stats)
+            else:
+                pool.submit(target.send, message)
+    report = stats.report(time.perf_counter() - start)
+    ordered = sorted(lags)
+    report["speed"] = speed
+    report["lag_ms"] = {"p50": _percentile_ms(ordered, 0.50), "p99": _percentile_ms(ordered, 0.99)}
+    return report
+
+
+def parse_mix(methods: list[str] | None, mix_file: str | None) -> list[dict[str, Any]]:
+    """Build a request mix from ``--method NAME[=WEIGHT]`` flags or a JSON file.
+
+    The file holds a list of ``{"request": {"method": ..., "params": ...},
+    "weight": N}`` entries.
+    """
+    mix: list[dict[str, Any]] = []
+    if mix_file is not None:
+        with open(mix_file) as f:
+            mix.extend(json.load(f))
+    for spec in methods or []:
+        name, _, weight = spec.partition("=")
+        mix.append({"request": {"method": name, "params": {}}, "weight": float(weight or 1)})
+    for entry in mix:
+        if not isinstance(entry.get("request"), dict) or "method" not in entry["request"]:
+            raise ValueError(f"Invalid mix entry: {entry!r}")
+    return mix or DEFAULT_MIX
+
+
+def _timed_call(target: StdioTarget | HttpTarget, request: dict[str, Any], stats: LatencyStats) -> None:
+    start = time.perf_counter()
+    try:
+        ok = "error" not in target.call(request)
+    except (OSError, ConnectionError, http.client.HTTPException, ValueError):
+        ok = False
+    stats.record(label_for(request), time.perf_counter() - start, ok)
+
+
+def _percentile_ms(ordered: list[float], q: float) -> float:
+    if not ordered:
+        return 0.0
+    return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000.0, 3)
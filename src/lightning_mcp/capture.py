@@ -0,0 +1,235 @@
+"""Process-wide output isolation with per-request log capture.
+
+Installed once at startup, :class:`OutputCapture` keeps the JSON-RPC channel
+clean without touching file descriptors on every request:
+
+- the original stdout is moved to a private fd that only the server writes to;
+- fds 1 and 2 are pointed at a pipe drained by a reader thread, so output
+  from C extensions and child processes can never reach the channel;
+- ``sys.stdout``/``sys.stderr`` are replaced by proxies that route Python-level
+  writes (``print``, ``warnings``, ``logging``) to the log of the request
+  running in the current context.
+
+Each request gets a bounded ring buffer of captured lines. Lines read from the
+pipe cannot be attributed to a thread; they go to the active request when
+exactly one is running and to a shared "unscoped" ring buffer otherwise.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import io
+import logging
+import os
+import sys
+import threading
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any, TextIO
+
+from lightning_mcp.protocol import MCPResponse
+
+# Default number of lines kept per request
+DEFAULT_MAX_LINES = 200
+
+_installed: OutputCapture | None = None
+_current_log: contextvars.ContextVar[RequestLog | None] = contextvars.ContextVar(
+    "lightning_mcp_request_log", default=None
+)
+
+
+class RequestLog:
+    """Bounded ring buffer of output lines captured during one request."""
+
+    def __init__(self, max_lines: int = DEFAULT_MAX_LINES) -> None:
+        self._lines: deque[str] = deque(maxlen=max_lines)
+        self._partial: dict[str, str] = {}
+        self.dropped = 0
+
+    def write(self, text: str, stream: str) -> None:
+        text = self._partial.pop(stream, "") + text
+        *lines, rest = text.split("\n")
+        if rest:
+            self._partial[stream] = rest
+        for line in lines:
+            self.append(line, stream)
+
+    def append(self, line: str, stream: str) -> None:
+        if not line.strip():
+            return
+        if len(self._lines) == self._lines.maxlen:
+            self.dropped += 1
+        self._lines.append(f"[{stream}] {line.rstrip()}")
+
+    def snapshot(self) -> dict[str, Any]:
+        lines = list(self._lines)
+        lines.extend(f"[{stream}] {rest}" for stream, rest in self._partial.items())
+        return {"output": lines, "dropped": self.dropped}
+
+
+class _StreamProxy(io.TextIOBase):
+    """``sys.stdout``/``sys.stderr`` replacement routing writes per request."""
+
+    def __init__(self, capture: OutputCapture, name: str) -> None:
+        self._capture = capture
+        self._name = name
+
+    @property
+    def name(self) -> str:
+        return f"<{self._name}>"
+
+    @property
+    def encoding(self) -> str:  # type: ignore[override]
+        return "utf-8"
+
+    def writable(self) -> bool:
+        return True
+
+    def isatty(self) -> bool:
+        return False
+
+    def fileno(self) -> int:
+        # fds 1/2 point at the capture pipe, so fd-level writers stay isolated
+        return 1 if self._name == "stdout" else 2
+
+    def write(self, text: str) -> int:
+        self._capture.route(text, self._name)
+        return len(text)
+
+    def flush(self) -> None:
+        pass
+
+
+class OutputCapture:
+    """Redirects process output away from the protocol channel, once."""
+
+    def __init__(self, max_lines: int = DEFAULT_MAX_LINES) -> None:
+        self.max_lines = max_lines
+        self.unscoped = RequestLog(max_lines)
+        self._forward_fd: int | None = None
+        self._active: list[RequestLog] = []
+        self._lock = threading.Lock()
+
+    def install(self, forward_unscoped: bool = False) -> TextIO:
+        """Redirect fds 1/2 and ``sys`` streams; return the protocol channel.
+
+        Args:
+            forward_unscoped: Write lines that belong to no request to the
+                original stderr instead of only keeping them in memory
+                (used by the HTTP server, whose stdout is not the channel).
+
+        Returns:
+            A text stream on a private duplicate of the original stdout.
+        """
+        global _installed
+        if _installed is not None:
+            raise RuntimeError("Output capture is already installed")
+
+        for stream in (sys.stdout, sys.stderr):
+            if stream is not None:
+                stream.flush()
+
+        channel_fd = os.dup(1)
+        if forward_unscoped:
+            self._forward_fd = os.dup(2)
+
+        read_fd, write_fd = os.pipe()
+        os.dup2(write_fd, 1)
+        os.dup2(write_fd, 2)
+        os.close(write_fd)
+        threading.Thread(
+            target=self._drain, args=(read_fd,), name="lightning-mcp-capture", daemon=True
+        ).start()
+
+        original = {id(sys.stdout), id(sys.stderr)}
+        sys.stdout = _StreamProxy(self, "stdout")
+        sys.stderr = _StreamProxy(self, "stderr")
+        self._rebind_log_handlers(original)
+
+        _installed = self
+        return open(channel_fd, "w", encoding="utf-8", closefd=True)
+
+    @contextmanager
+    def request(self) -> Iterator[RequestLog]:
+        """Route output produced in this context into a fresh request log."""
+        log = RequestLog(self.max_lines)
+        token = _current_log.set(log)
+        with self._lock:
+            self._active.append(log)
+        try:
+            yield log
+        finally:
+            with self._lock:
+                self._active.remove(log)
+            _current_log.reset(token)
+
+    def route(self, text: str, stream: str) -> None:
+        """Route a Python-level write to the current request's log."""
+        log = _current_log.get()
+        if log is not None:
+            log.write(text, stream)
+        else:
+            self._unscoped(text, stream)
+
+    def _drain(self, read_fd: int) -> None:
+        """Reader thread: attribute fd-level output line by line."""
+        with open(read_fd, "rb", buffering=0) as pipe:
+            pending = b""
+            while chunk := pipe.read(65536):
+                *lines, pending = (pending + chunk).split(b"\n")
+                for raw in lines:
+                    line = raw.decode("utf-8", errors="replace")
+                    with self._lock:
+                        target = self._active[0] if len(self._active) == 1 else None
+                    if target is not None:
+                        target.append(line, "fd")
+                    else:
+                        self._unscoped(line + "\n", "fd")
+
+    def _unscoped(self, text: str, stream: str) -> None:
+        self.unscoped.write(text, stream)
+        if self._forward_fd is not None:
+            os.write(self._forward_fd, text.encode("utf-8", errors="replace"))
+
+    def _rebind_log_handlers(self, original: set[int]) -> None:
+        """Point logging handlers created before install at the proxies."""
+        loggers = [logging.getLogger()]
+        loggers.extend(
+            logger
+            for logger in logging.Logger.manager.loggerDict.values()
+            if isinstance(logger, logging.Logger)
+        )
+        for logger in loggers:
+            for handler in logger.handlers:
+                if isinstance(handler, logging.StreamHandler) and id(handler.stream) in original:
+                    handler.setStream(sys.stderr)
+
+
+def get_capture() -> OutputCapture | None:
+    """The installed :class:`OutputCapture`, if any."""
+    return _installed
+
+
+@contextmanager
+def capture_request() -> Iterator[RequestLog | None]:
+    """Scope captured output to one request; yields ``None`` if not installed."""
+    if _installed is None:
+        yield None
+        return
+    with _installed.request() as log:
+        yield log
+
+
+def attach_diagnostics(response: MCPResponse, log: RequestLog | None) -> None:
+    """Add the request's captured output to a response (opt-in by callers)."""
+    diagnostics: dict[str, Any] = (
+        log.snapshot() if log is not None else {"output": [], "dropped": 0}
+    )
+    diagnostics["isolated"] = log is not None
+
+    if response.result is not None:
+        response.result["diagnostics"] = diagnostics
+    elif response.error is not None:
+        data = response.error.data if isinstance(response.error.data, dict) else {}
+        response.error.data = {**data, "diagnostics": diagnostics}
@@ -1,8 +1,8 @@
 """Lightning MCP CLI entry point."""
 
 import argparse
+import contextlib
 import os
-import sys
 import warnings
 
 # Suppress all warnings at import time to prevent polluting stdio MCP stream
@@ -22,25 +22,232 @@ def main() -> None:
         help="Run HTTP MCP server instead of stdio",
     )
 
+    parser.add_argument(
+        "--unix",
+        default=None,
+        metavar="PATH",
+        help="Serve many clients from one process on a Unix domain socket",
+    )
+
+    parser.add_argument(
+        "--framing",
+        choices=("auto", "line", "content-length"),
+        default="auto",
+        help="Stdio message framing; 'auto' follows the client's first message",
+    )
+
     parser.add_argument("--host", default="127.0.0.1")
     parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=None,
+        help="Handler calls run in parallel (HTTP, batches; default: min(4, CPUs))",
+    )
+    parser.add_argument(
+        "--queue-depth",
+        type=int,
+        default=16,
+        help="Handler calls allowed to wait before 'server busy' (HTTP, batches)",
+    )
+
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Fork N HTTP worker processes sharing preloaded model weights",
+    )
+    parser.add_argument(
+        "--preload",
+        default=None,
+        metavar="FILE",
+        help='JSON list of {"model": {...}, "checkpoint": path} to load once at startup',
+    )
+
+    parser.add_argument(
+        "--result-cache",
+        default=None,
+        metavar="DIR",
+        help="Cache deterministic validate/test results (seed + deterministic) in DIR",
+    )
+    parser.add_argument(
+        "--result-cache-ttl",
+        type=float,
+        default=7 * 24 * 3600.0,
+        metavar="SECONDS",
+        help="Expire cached results after this long (default: 7 days)",
+    )
+    parser.add_argument(
+        "--result-cache-max-mb",
+        type=float,
+        default=256.0,
+        help="Evict least recently used results beyond this size (default: 256)",
+    )
+
+    parser.add_argument(
+        "--batch-cache-mb",
+        type=float,
+        default=None,
+        metavar="MB",
+        help="Record validate/test batches once and replay them, within this budget",
+    )
+
+    commands = parser.add_subparsers(dest="command")
+    _add_bench_parser(commands)
+    connect = commands.add_parser(
+        "connect", help="Relay stdio to a server started with --unix (for stdio-only clients)"
+    )
+    connect.add_argument("path", help="Socket path given to --unix")
 
     args = parser.parse_args()
 
-    if args.http:
+    if args.command == "bench":
+        _run_bench(args)
+        return
+    if args.command == "connect":
+        from lightning_mcp.shim import connect as relay
+
+        relay(args.path)
+        return
+    if args.unix and (args.http or args.workers is not None):
+        parser.error("--unix cannot be combined with --http or --workers")
+
+    from lightning_mcp.capture import OutputCapture
+
+    if args.result_cache:
+        from lightning_mcp.result_cache import configure_result_cache
+
+        configure_result_cache(
+            args.result_cache, args.result_cache_ttl, int(args.result_cache_max_mb * 1024 * 1024)
+        )
+
+    if args.batch_cache_mb is not None:
+        from lightning_mcp.lightning.batch_cache import configure_batch_cache
+
+        configure_batch_cache(int(args.batch_cache_mb * 1024 * 1024))
+
+    if args.workers is not None:
+        if not args.http:
+            parser.error("--workers requires --http")
+        from lightning_mcp import workers
+
+        if args.preload:
+            workers.preload(workers.load_preload_config(args.preload))
+        workers.serve_workers(
+            args.host, args.port, args.workers, args.max_concurrency, args.queue_depth
+        )
+        return
+
+    if args.preload:
+        from lightning_mcp import workers
+
+        workers.preload(workers.load_preload_config(args.preload))
+
+    if args.unix:
+        # Each connection is served by the shared server; as with HTTP,
+        # output outside a request still reaches the console via stderr
+        OutputCapture().install(forward_unscoped=True)
+        warnings.simplefilter("default")
+
+        from lightning_mcp.executor import BoundedExecutor
+        from lightning_mcp.server import MCPServer
+        from lightning_mcp.unix_server import UnixSocketServer
+
+        mcp = MCPServer(executor=BoundedExecutor(args.max_concurrency, args.queue_depth))
+        with UnixSocketServer(args.unix, mcp) as server, contextlib.suppress(KeyboardInterrupt):
+            server.serve_forever()
+    elif args.http:
+        # Process output is captured per request; anything else (uvicorn
+        # logs, startup messages) still reaches the console via stderr
+        OutputCapture().install(forward_unscoped=True)
+        warnings.simplefilter("default")
+
         import uvicorn
 
-        from lightning_mcp.http_server import app
+        from lightning_mcp.http_server import app, configure_executor
 
+        configure_executor(args.max_concurrency, args.queue_depth)
         uvicorn.run(app, host=args.host, port=args.port)
     else:
-        # For stdio mode, redirect stderr to devnull to keep JSON stream clean
-        with open(os.devnull, "w") as devnull:
-            sys.stderr = devnull
+        # For stdio mode, move the JSON-RPC stream to a private fd and capture
+        # everything written to fds 1/2, so nothing can pollute the stream.
+        # Warnings are kept per request (see the `diagnostics` param).
+        channel = OutputCapture().install()
+        warnings.simplefilter("default")
+
+        from lightning_mcp.executor import BoundedExecutor
+        from lightning_mcp.server import MCPServer
+
+        MCPServer(
+            stdout=channel,
+            framing=args.framing,
+            executor=BoundedExecutor(args.max_concurrency, args.queue_depth),
+        ).serve_forever()
+
+
+def _add_bench_parser(commands: argparse._SubParsersAction) -> None:
+    bench = commands.add_parser("bench", help="Load-test, record or replay MCP traffic")
+    modes = bench.add_subparsers(dest="bench_command", required=True)
+
+    def _target_args(p: argparse.ArgumentParser) -> None:
+        p.add_argument("--url", default=None, help="HTTP endpoint, e.g. http://127.0.0.1:8000/mcp")
+        p.add_argument(
+            "--server-command",
+            default=None,
+            help="Stdio server to spawn when --url is not given (default: lightning-mcp)",
+        )
+
+    load = modes.add_parser("load", help="Drive a server with a request mix")
+    _target_args(load)
+    load.add_argument("--concurrency", type=int, default=1)
+    load.add_argument("--duration", type=float, default=10.0, help="Seconds")
+    load.add_argument(
+        "--method",
+        action="append",
+        help="Method with empty params, optionally weighted: NAME[=WEIGHT] (repeatable)",
+    )
+    load.add_argument("--mix", default=None, help="JSON file with weighted requests")
+    load.add_argument("--seed", type=int, default=0)
+
+    rec = modes.add_parser("record", help="Proxy a stdio session and record client messages")
+    rec.add_argument("--output", required=True, help="JSONL file to write the recording to (overwritten)")
+    rec.add_argument("--server-command", default=None)
+
+    rep = modes.add_parser("replay", help="Replay a recording with its original timing")
+    _target_args(rep)
+    rep.add_argument("recording", help="JSONL file written by 'bench record'")
+    rep.add_argument("--speed", type=float, default=1.0, help="Time scale (2 = twice as fast)")
+
+
+def _run_bench(args: argparse.Namespace) -> None:
+    import json
+
+    from lightning_mcp import bench
+
+    server_command = args.server_command or bench.DEFAULT_SERVER_COMMAND
 
-            from lightning_mcp.server import MCPServer
+    if args.bench_command == "record":
+        # One session per file: offsets restart at 0, so sessions cannot be appended
+        with open(args.output, "w") as output:
+            bench.record(output, server_command)
+        return
 
-            MCPServer().serve_forever()
+    target = bench.HttpTarget(args.url) if args.url else bench.StdioTarget(server_command)
+    try:
+        if args.bench_command == "load":
+            report = bench.load(
+                target,
+                bench.parse_mix(args.method, args.mix),
+                concurrency=args.concurrency,
+                duration=args.duration,
+                seed=args.seed,
+            )
+        else:
+            with open(args.recording) as recording:
+                report = bench.replay(target, recording, speed=args.speed)
+    finally:
+        target.close()
+    print(json.dumps(report, indent=2))
 
 
 if __name__ == "__main__":
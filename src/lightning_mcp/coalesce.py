@@ -0,0 +1,106 @@
+"""Single-flight coalescing of identical in-flight tool calls.
+
+When several clients send the same side-effect-free call (same tool, same
+params) at the same time, only the first one runs; the others wait for it
+and receive a copy of its response under their own JSON-RPC ids. Which
+tools qualify is declared here, in :data:`COALESCED_TOOLS`; it is separate
+from the client-facing ``readOnlyHint`` annotation, since a read-only tool
+such as ``lightning.stats`` can still need a fresh answer per call. Calls
+are only joined while one is running: nothing is cached afterwards.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from collections.abc import Callable
+from typing import Any
+
+from lightning_mcp.metrics import REGISTRY
+from lightning_mcp.protocol import MCPRequest, MCPResponse
+
+# Side-effect-free tools whose concurrent identical calls give the same result
+COALESCED_TOOLS = frozenset({
+    "lightning.inspect",
+    "lightning.validate",
+    "lightning.test",
+    "lightning.predict",
+})
+
+
+def request_key(tool: str, params: dict[str, Any]) -> str:
+    """Tool name plus a hash of params in canonical JSON form.
+
+    ``_meta`` is left out: it carries per-request data such as progress
+    tokens and timing flags that do not change the result.
+    """
+    canonical = json.dumps(
+        {k: v for k, v in params.items() if k != "_meta"},
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return f"{tool}:{hashlib.sha256(canonical.encode()).hexdigest()}"
+
+
+class _Flight:
+    __slots__ = ("done", "followers", "response")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.followers = 0
+        self.response: MCPResponse | None = None
+
+
+class SingleFlight:
+    """Runs at most one call per key at a time; duplicates share its response."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._flights: dict[str, _Flight] = {}
+
+    def call(self, request: MCPRequest, fn: Callable[[], MCPResponse]) -> MCPResponse:
+        """Return ``fn()``, or a copy of an identical in-flight call's response.
+
+        ``request.method`` is the tool name; requests for other tools than
+        :data:`COALESCED_TOOLS` always run.
+        """
+        if request.method not in COALESCED_TOOLS:
+            return fn()
+        key = request_key(request.method, request.params)
+
+        with self._lock:
+            existing = self._flights.get(key)
+            if existing is None:
+                flight = self._flights[key] = _Flight()
+                leader = True
+            else:
+                flight = existing
+                flight.followers += 1
+                leader = False
+
+        if not leader:
+            flight.done.wait()
+            if flight.response is None:
+                # The leader died without a response (e.g. interrupted): run our own
+                return fn()
+            REGISTRY.inc("lightning_mcp_coalesced_requests_total", (("tool", request.method),))
+            return flight.response.model_copy(update={"id": request.id}, deep=True)
+
+        response = None
+        try:
+            response = fn()
+            return response
+        finally:
+            with self._lock:
+                del self._flights[key]
+                followers = flight.followers
+            if followers and response is not None:
+                # Followers copy from a snapshot: the leader's own response may
+                # still be modified (timings, diagnostics) after we return
+                flight.response = response.model_copy(deep=True)
+            flight.done.set()
+
+
+COALESCER = SingleFlight()
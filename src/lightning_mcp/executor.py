@@ -0,0 +1,131 @@
+"""Bounded thread pool for handler work.
+
+Servers run handlers (training, inference, checkpoint I/O) on a
+:class:`BoundedExecutor` instead of an unbounded pool: at most
+``max_workers`` calls run at once and at most ``queue_depth`` more wait for
+a worker. Submitting beyond that raises :class:`ServerBusyError` right
+away, so overload is reported to clients instead of queueing without limit.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import os
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, TypeVar
+
+from lightning_mcp.metrics import REGISTRY
+
+T = TypeVar("T")
+
+# JSON-RPC "server error" code used for busy responses
+SERVER_BUSY_CODE = -32000
+
+
+def default_max_workers() -> int:
+    return max(1, min(4, os.cpu_count() or 1))
+
+
+class ServerBusyError(RuntimeError):
+    """Raised when the executor's workers and queue are all taken."""
+
+
+class BoundedExecutor:
+    """Thread pool with a hard cap on running plus queued calls.
+
+    Submitted callables run in a copy of the caller's context, so context
+    variables (phase timings, per-request output capture) carry over.
+    """
+
+    def __init__(self, max_workers: int | None = None, queue_depth: int = 16) -> None:
+        if max_workers is None:
+            max_workers = default_max_workers()
+        if max_workers < 1:
+            raise ValueError("'max_workers' must be >= 1")
+        if queue_depth < 0:
+            raise ValueError("'queue_depth' must be >= 0")
+        self.max_workers = max_workers
+        self.queue_depth = queue_depth
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="lightning-mcp")
+        self._lock = threading.Lock()
+        self._pending = 0
+
+    @property
+    def pending(self) -> int:
+        """Calls currently running or waiting for a worker."""
+        return self._pending
+
+    def submit(self, fn: Callable[..., T], *args: Any) -> Future[T]:
+        """Schedule ``fn(*args)``; raise :class:`ServerBusyError` if full."""
+        with self._lock:
+            if self._pending >= self.max_workers + self.queue_depth:
+                raise ServerBusyError(
+                    f"Server busy: {self._pending} requests running or queued"
+                )
+            self._pending += 1
+            REGISTRY.set_gauge("lightning_mcp_executor_pending", self._pending)
+
+        ctx = contextvars.copy_context()
+        try:
+            future = self._pool.submit(ctx.run, fn, *args)
+        except BaseException:
+            self._release(None)
+            raise
+        future.add_done_callback(self._release)
+        return future
+
+    def submit_batch(self, fn: Callable[[Any], T], items: list[Any]) -> list[Future[T]]:
+        """Schedule ``fn(item)`` for every item, in order.
+
+        A batch may hold more calls than the executor admits at once, so
+        when it is full this waits for one of the batch's own calls to
+        finish and tries again. Only if none of them is in flight (the
+        executor is full with other work) is an item rejected: its future
+        then holds the :class:`ServerBusyError`. Blocks the calling thread.
+        """
+        futures: list[Future[T]] = []
+        finished = threading.Condition()
+        in_flight = 0
+
+        def _finished(_future: Future[T]) -> None:
+            nonlocal in_flight
+            with finished:
+                in_flight -= 1
+                finished.notify()
+
+        for item in items:
+            while True:
+                try:
+                    future = self.submit(fn, item)
+                except ServerBusyError as exc:
+                    with finished:
+                        if in_flight:
+                            finished.wait()
+                            continue
+                        # The batch's last call may have finished between the
+                        # failed submit and taking the lock, freeing its slot
+                        # with no wakeup left to wait for: retry once
+                        try:
+                            future = self.submit(fn, item)
+                        except ServerBusyError:
+                            future = Future()
+                            future.set_exception(exc)
+                            futures.append(future)
+                            break
+                with finished:
+                    in_flight += 1
+                # Added after the slot-releasing callback, so runs after it
+                future.add_done_callback(_finished)
+                futures.append(future)
+                break
+        return futures
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._pool.shutdown(wait=wait)
+
+    def _release(self, _future: Future[Any] | None) -> None:
+        with self._lock:
+            self._pending -= 1
+            REGISTRY.set_gauge("lightning_mcp_executor_pending", self._pending)
@@ -0,0 +1,161 @@
+"""``Content-Length`` message framing for the stdio transport.
+
+The default stdio framing is one JSON message per line over text streams.
+This module implements the LSP-style alternative: each message is preceded
+by ``Content-Length: N`` (plus optional other headers) and a blank line,
+over the binary stdin/stdout buffers. Bodies are read into one reusable
+``bytearray`` and decoded once, with no per-line text decoding or
+``strip()`` copies, and they may contain newlines.
+
+:func:`detect_framing` lets a server pick the mode from the first bytes
+the client sends, so clients opt in just by using headers.
+"""
+
+from __future__ import annotations
+
+from typing import BinaryIO
+
+FRAMING_MODES = ("auto", "line", "content-length")
+
+_HEADER_END = b"\r\n\r\n"
+# Header names are case-insensitive
+_HEADER_PREFIX = b"content-length:"
+_INITIAL_BUFFER = 64 * 1024
+# Refuse absurd headers instead of buffering without limit
+_MAX_HEADER_BYTES = 8 * 1024
+
+
+class FramingError(ValueError):
+    """Raised when the input is not valid ``Content-Length`` framing."""
+
+
+def detect_framing(stream: BinaryIO) -> str:
+    """``"content-length"`` if the client's first bytes are a header, else ``"line"``.
+
+    Only peeks, so nothing is consumed from ``stream``. Blocks until the
+    client sends its first bytes.
+    """
+    head = stream.peek(len(_HEADER_PREFIX))  # type: ignore[attr-defined]
+    head = head.lstrip()[: len(_HEADER_PREFIX)].lower()
+    # peek() may return fewer bytes than asked for: a partial prefix counts
+    if head and _HEADER_PREFIX.startswith(head):
+        return "content-length"
+    return "line"
+
+
+class FramedReader:
+    """Reads ``Content-Length`` framed messages from a binary stream.
+
+    Input is read in large chunks into a single buffer that grows to the
+    largest message seen and is then reused; :meth:`pending` tells whether
+    more input is already buffered (used to coalesce writes).
+    """
+
+    def __init__(self, stream: BinaryIO) -> None:
+        self._stream = stream
+        self._buf = bytearray(_INITIAL_BUFFER)
+        self._start = 0
+        self._end = 0
+
+    def pending(self) -> bool:
+        """Whether unread input is already buffered."""
+        return self._end > self._start
+
+    def read_message(self) -> str | None:
+        """Return the next message body, or ``None`` at end of input.
+
+        Raises:
+            FramingError: On malformed headers or a truncated body.
+        """
+        header_end = self._buf.find(_HEADER_END, self._start, self._end)
+        while header_end < 0:
+            if self._end - self._start > _MAX_HEADER_BYTES:
+                raise FramingError("Message header too long")
+            if not self._fill():
+                if self.pending() and self._buf[self._start:self._end].strip():
+                    raise FramingError("Unexpected end of input in message header")
+                return None
+            header_end = self._buf.find(_HEADER_END, self._start, self._end)
+
+        length = self._content_length(bytes(self._buf[self._start:header_end]).strip())
+        body_start = header_end + len(_HEADER_END)
+        body_end = body_start + length
+        if body_end > len(self._buf):
+            # Compact before reading the rest of the body
+            body_start, body_end = self._compact(body_start, body_end)
+        while self._end < body_end:
+            if not self._fill():
+                raise FramingError("Unexpected end of input in message body")
+
+        with memoryview(self._buf) as view:
+            body = str(view[body_start:body_end], "utf-8")
+        self._start = body_end
+        if self._start == self._end:
+            self._start = self._end = 0
+        return body
+
+    def _content_length(self, header: bytes) -> int:
+        length = None
+        for line in header.split(b"\r\n"):
+            name, sep, value = line.partition(b":")
+            if not sep:
+                raise FramingError(f"Malformed header line: {line[:80]!r}")
+            if name.strip().lower() == b"content-length":
+                try:
+                    length = int(value.strip())
+                except ValueError:
+                    raise FramingError(f"Invalid Content-Length: {value.strip()[:40]!r}") from None
+        if length is None or length < 0:
+            raise FramingError("Missing Content-Length header")
+        return length
+
+    def _compact(self, body_start: int, body_end: int) -> tuple[int, int]:
+        """Move buffered data to the front, growing the buffer to fit the body."""
+        shift = self._start
+        size = body_end - shift
+        if size > len(self._buf):
+            grown = bytearray(max(size, 2 * len(self._buf)))
+            grown[: self._end - shift] = self._buf[shift:self._end]
+            self._buf = grown
+        else:
+            self._buf[: self._end - shift] = self._buf[shift:self._end]
+        self._start = 0
+        self._end -= shift
+        return body_start - shift, body_end - shift
+
+    def _fill(self) -> bool:
+        """Read more input into the buffer; ``False`` at end of input."""
+        if self._end == len(self._buf):
+            if self._start:
+                self._compact(self._start, self._start)
+            else:
+                self._buf.extend(bytes(len(self._buf)))
+        view = memoryview(self._buf)[self._end:]
+        try:
+            n = self._stream.readinto1(view)  # type: ignore[attr-defined]
+        finally:
+            view.release()
+        if not n:
+            return False
+        self._end += n
+        return True
+
+
+class FramedWriter:
+    """Writes ``Content-Length`` framed messages to a binary stream.
+
+    Messages are only written into the stream's buffer; call :meth:`flush`
+    once there is nothing else to answer, so a pipelined burst of small
+    responses goes out in a few writes instead of one per response.
+    """
+
+    def __init__(self, stream: BinaryIO) -> None:
+        self._stream = stream
+
+    def write(self, body: str) -> None:
+        data = body.encode("utf-8")
+        self._stream.write(b"Content-Length: %d\r\n\r\n" % len(data))
+        self._stream.write(data)
+
+    def flush(self) -> None:
+        self._stream.flush()
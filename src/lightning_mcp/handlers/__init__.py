@@ -1,25 +1,46 @@
 """Lightning MCP handlers.
 
 All handlers suppress stdout/stderr during operations to maintain
-clean MCP JSON-RPC communication over stdio.
+clean MCP JSON-RPC communication over stdio (or, when output capture is
+installed, have it recorded per request).
 """
 
-from lightning_mcp.handlers.base import build_tool_response, load_model, suppress_output
+from lightning_mcp.handlers.base import (
+    build_tool_response,
+    extract_metrics,
+    load_datamodule,
+    load_model,
+    preload_model,
+    shared_weights_bytes,
+    suppress_output,
+)
 from lightning_mcp.handlers.checkpoint import CheckpointHandler
+from lightning_mcp.handlers.data import DataHandler
 from lightning_mcp.handlers.inspect import InspectHandler
+from lightning_mcp.handlers.pipeline import PipelineHandler
 from lightning_mcp.handlers.predict import PredictHandler
+from lightning_mcp.handlers.profile import ProfileHandler
+from lightning_mcp.handlers.stats import StatsHandler
 from lightning_mcp.handlers.test import TestHandler
 from lightning_mcp.handlers.train import TrainHandler
 from lightning_mcp.handlers.validate import ValidateHandler
 
 __all__ = [
     "CheckpointHandler",
+    "DataHandler",
     "InspectHandler",
+    "PipelineHandler",
     "PredictHandler",
+    "ProfileHandler",
+    "StatsHandler",
     "TestHandler",
     "TrainHandler",
     "ValidateHandler",
     "build_tool_response",
+    "extract_metrics",
+    "load_datamodule",
     "load_model",
+    "preload_model",
+    "shared_weights_bytes",
     "suppress_output",
 ]
@@ -5,28 +5,70 @@ Shared code for model loading, MCP response building, and output suppression.
 IMPORTANT: All handler operations that may produce stdout/stderr output
 (model instantiation, training, inference, etc.) MUST be wrapped with
 `suppress_output()` to prevent polluting the MCP JSON-RPC stream.
+When process-wide output capture is installed (see `lightning_mcp.capture`)
+`suppress_output()` is a no-op and the output is kept per request instead.
 """
 
 from __future__ import annotations
 
+import functools
+import glob
+import hashlib
 import importlib
+import inspect
+import itertools
 import json
 import os
 import sys
-from collections.abc import Generator
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Generator, Iterable, Sized
+from concurrent.futures import Future
 from contextlib import contextmanager
-from typing import Any
+from typing import Any, TypeVar
 
 import pytorch_lightning as pl
+import torch
 
+from lightning_mcp.capture import get_capture
+from lightning_mcp.lightning.batch_cache import replay_loader
+from lightning_mcp.lightning.checkpoint_io import extract_state_dict, load_checkpoint
+from lightning_mcp.lightning.trainer import LightningTrainerService, eval_loader_factory
 from lightning_mcp.protocol import MCPResponse
+from lightning_mcp.timing import phase
 
+# Preloaded weights in shared memory, keyed by canonical model config
+_shared_weights: dict[str, dict[str, torch.Tensor]] = {}
+# Content digests of the preloaded weights, by the same key
+_shared_digests: dict[str, str] = {}
 
-def load_model(params: dict[str, Any]) -> pl.LightningModule:
+# A cached datamodule, the lock serializing its use and the DataLoaders it built
+_DataModuleEntry = tuple[pl.LightningDataModule, threading.Lock, list[Any]]
+
+# Recently used datamodules by canonical config (least recently used first)
+_datamodules: OrderedDict[str, _DataModuleEntry] = OrderedDict()
+# Builds in progress, by the same key
+_building: dict[str, Future[_DataModuleEntry]] = {}
+# Guards both maps; never held while building or shutting down workers
+_datamodules_lock = threading.Lock()
+# Each cached datamodule may keep persistent loader worker processes alive
+_MAX_DATAMODULES = 4
+
+T = TypeVar("T")
+
+_LOADER_HOOKS = ("train_dataloader", "val_dataloader", "test_dataloader", "predict_dataloader")
+
+
+def load_model(params: dict[str, Any], shared: bool = False) -> pl.LightningModule:
     """Load a LightningModule from params.
 
     Args:
         params: Must contain 'model' dict with '_target_' key.
+        shared: Read-only use. If the model config was preloaded with
+            :func:`preload_model`, return a fresh module whose parameters
+            are the preloaded shared-memory tensors instead of new weights.
+            Callers must not modify the weights (no training).
 
     Returns:
         Instantiated LightningModule.
@@ -42,34 +84,437 @@ def load_model(params: dict[str, Any]) -> pl.LightningModule:
     if not isinstance(cfg, dict):
         raise TypeError("'model' must be a dict")
 
+    cls = _import_target(cfg, "model", pl.LightningModule)
+
+    kwargs = {k: v for k, v in cfg.items() if k != "_target_"}
+    state = _shared_weights.get(_config_key(cfg)) if shared else None
+    with phase("model_init"):
+        if state is not None:
+            return _with_shared_weights(cls, kwargs, state)
+        return cls(**kwargs)
+
+
+def preload_model(cfg: dict[str, Any], checkpoint: str | None = None) -> int:
+    """Build a model once and move its weights into shared memory.
+
+    Later ``load_model(..., shared=True)`` calls with an identical config
+    reuse these tensors. Preloading before forking worker processes lets
+    every worker map the same physical pages.
+
+    Args:
+        cfg: Model configuration (``_target_`` + kwargs).
+        checkpoint: Optional checkpoint (Lightning or plain state dict)
+            whose weights replace the freshly initialized ones.
+
+    Returns:
+        Size of the shared weights in bytes.
+    """
+    model = load_model({"model": cfg})
+    if checkpoint is not None:
+        model.load_state_dict(extract_state_dict(load_checkpoint(checkpoint)))
+    model.eval()
+
+    state = {name: t.detach().share_memory_() for name, t in model.state_dict().items()}
+    key = _config_key(cfg)
+    _shared_weights[key] = state
+    _shared_digests[key] = _state_digest(state)
+    return sum(t.numel() * t.element_size() for t in state.values())
+
+
+def shared_weights_digest(params: dict[str, Any]) -> str | None:
+    """Digest of the preloaded weights ``load_model(params, shared=True)`` would use.
+
+    ``None`` when the model config was not preloaded.
+    """
+    cfg = params.get("model")
+    if not isinstance(cfg, dict):
+        return None
+    key = _config_key(cfg)
+    return _shared_digests.get(key) if key in _shared_weights else None
+
+
+def shared_weights_bytes() -> int:
+    """Total size of all preloaded shared weights."""
+    return sum(
+        t.numel() * t.element_size() for state in _shared_weights.values() for t in state.values()
+    )
+
+
+def load_datamodule(cfg: dict[str, Any]) -> pl.LightningDataModule:
+    """Build a LightningDataModule from a config (``_target_`` + kwargs).
+
+    Loader settings the class accepts but the config leaves out are filled
+    with tuned defaults (see :func:`loader_defaults`).
+
+    Raises:
+        ValueError: If the config has no string '_target_'.
+        TypeError: If target is not a LightningDataModule.
+    """
+    if not isinstance(cfg, dict):
+        raise TypeError("'datamodule' must be a dict")
+    cls = _import_target(cfg, "datamodule", pl.LightningDataModule)
+
+    kwargs = {k: v for k, v in cfg.items() if k != "_target_"}
+    accepted = inspect.signature(cls).parameters
+    defaults = loader_defaults(kwargs.get("num_workers"))
+    kwargs.update({k: v for k, v in defaults.items() if k in accepted and k not in kwargs})
+    with phase("datamodule_init"):
+        return cls(**kwargs)
+
+
+def loader_defaults(num_workers: int | None = None) -> dict[str, Any]:
+    """DataLoader settings used when a datamodule config does not set them.
+
+    Workers load batches in parallel with the training step and stay alive
+    between epochs; host memory is pinned when batches go to a GPU.
+    """
+    if num_workers is None:
+        num_workers = min(4, max(0, (os.cpu_count() or 1) - 1))
+    return {
+        "num_workers": num_workers,
+        "persistent_workers": num_workers > 0,
+        "prefetch_factor": 2 if num_workers > 0 else None,
+        "pin_memory": torch.cuda.is_available(),
+    }
+
+
+@contextmanager
+def use_datamodule(params: dict[str, Any]) -> Generator[pl.LightningDataModule | None, None, None]:
+    """The cached datamodule for the optional 'datamodule' param, held exclusively.
+
+    Instances are built once per config and reused by later requests, and
+    each one returns the same DataLoader objects every time, so loaders read
+    outside a Trainer run (which shuts workers down at its end) keep their
+    persistent worker processes between requests. The price is that
+    requests sharing a datamodule config run one after another for their
+    whole duration (trainer run included), where separate instances would
+    run concurrently. Only the ``_MAX_DATAMODULES`` most recently used
+    configs are kept; the workers of an evicted datamodule are shut down as
+    soon as no request uses it.
+    """
+    cfg = params.get("datamodule")
+    if cfg is None:
+        yield None
+        return
+    key = _config_key(cfg)
+    entry = _cached_datamodule(key, cfg)
+    datamodule, lock, loaders = entry
+    lock.acquire()
+    try:
+        yield datamodule
+    finally:
+        # Checked under the cache lock, so an eviction either found the
+        # entry free (and shut it down itself) or is seen here
+        with _datamodules_lock:
+            evicted = _datamodules.get(key) is not entry
+            if not evicted:
+                lock.release()
+        if evicted:
+            try:
+                _shutdown_workers(loaders)
+            finally:
+                lock.release()
+
+
+def clear_datamodules() -> None:
+    """Drop all cached datamodules, shutting down their worker processes."""
+    with _datamodules_lock:
+        evicted = _evict(0)
+    _shutdown_evicted(evicted)
+
+
+def _cached_datamodule(key: str, cfg: dict[str, Any]) -> _DataModuleEntry:
+    """The cache entry for ``cfg``, built outside the cache lock on a miss.
+
+    Concurrent misses on one config wait for the first request's build
+    instead of building their own copy; other configs are not held up.
+    """
+    with _datamodules_lock:
+        entry = _datamodules.get(key)
+        if entry is not None:
+            _datamodules.move_to_end(key)
+            return entry
+        building = _building.get(key)
+        if building is not None:
+            owner = False
+        else:
+            building = _building[key] = Future()
+            owner = True
+    if not owner:
+        return building.result()
+
+    try:
+        datamodule = load_datamodule(cfg)
+        loaders: list[Any] = []
+        for name in _LOADER_HOOKS:
+            setattr(datamodule, name, _memoized(getattr(datamodule, name), loaders))
+    except BaseException as exc:
+        with _datamodules_lock:
+            del _building[key]
+        building.set_exception(exc)
+        raise
+    entry = (datamodule, threading.Lock(), loaders)
+    with _datamodules_lock:
+        del _building[key]
+        _datamodules[key] = entry
+        evicted = _evict(_MAX_DATAMODULES)
+    building.set_result(entry)
+    _shutdown_evicted(evicted)
+    return entry
+
+
+def _evict(keep: int) -> list[_DataModuleEntry]:
+    """Drop least recently used entries beyond ``keep`` (cache lock held).
+
+    Returns the dropped entries no request is using, with their locks
+    acquired; a request still using one shuts it down when it is done.
+    """
+    idle = []
+    while len(_datamodules) > keep:
+        entry = _datamodules.popitem(last=False)[1]
+        if entry[1].acquire(blocking=False):
+            idle.append(entry)
+    return idle
+
+
+def _shutdown_evicted(entries: list[_DataModuleEntry]) -> None:
+    for _, lock, loaders in entries:
+        try:
+            _shutdown_workers(loaders)
+        finally:
+            lock.release()
+
+
+def _shutdown_workers(loaders: list[Any]) -> None:
+    for loader in loaders:
+        # A DataLoader keeps its persistent-worker iterator here; a later
+        # iteration would start new workers
+        iterator = getattr(loader, "_iterator", None)
+        if iterator is not None:
+            loader._iterator = None
+            shutdown = getattr(iterator, "_shutdown_workers", None)
+            if shutdown is not None:
+                shutdown()
+
+
+def _memoized(method: Callable[[], Any], built: list[Any]) -> Callable[[], Any]:
+    loader = None
+
+    @functools.wraps(method)
+    def cached() -> Any:
+        nonlocal loader
+        if loader is None:
+            loader = method()
+            built.append(loader)
+        return loader
+
+    return cached
+
+
+def _import_target(cfg: dict[str, Any], name: str, base: type[T]) -> type[T]:
+    """The class named by ``cfg['_target_']``, checked to subclass ``base``."""
     target = cfg.get("_target_")
     if not isinstance(target, str):
-        raise ValueError("'model._target_' must be a string")
+        raise ValueError(f"'{name}._target_' must be a string")
 
     module_path, class_name = target.rsplit(".", 1)
-    module = importlib.import_module(module_path)
+    with phase("import"):
+        module = importlib.import_module(module_path)
     cls = getattr(module, class_name)
 
     if not isinstance(cls, type):
         raise TypeError(f"{target} is not a class")
 
-    if not issubclass(cls, pl.LightningModule):
-        raise TypeError(f"{target} is not a LightningModule")
+    if not issubclass(cls, base):
+        raise TypeError(f"{target} is not a {base.__name__}")
+    return cls
 
-    kwargs = {k: v for k, v in cfg.items() if k != "_target_"}
-    return cls(**kwargs)
+
+def _config_key(cfg: dict[str, Any]) -> str:
+    return json.dumps(cfg, sort_keys=True, default=str)
+
+
+def _state_digest(state: dict[str, torch.Tensor]) -> str:
+    h = hashlib.sha256()
+    for name, t in sorted(state.items()):
+        h.update(f"{name}:{t.dtype}:{tuple(t.shape)}".encode())
+        h.update(t.detach().cpu().contiguous().reshape(-1).view(torch.uint8).numpy().tobytes())
+    return h.hexdigest()
+
+
+def _with_shared_weights(
+    cls: type[pl.LightningModule], kwargs: dict[str, Any], state: dict[str, torch.Tensor]
+) -> pl.LightningModule:
+    """Instantiate ``cls`` with ``state`` assigned as its tensors (no copy).
+
+    The module is first built on the meta device so no throwaway weights
+    are allocated; modules whose init needs real data, or that hold
+    tensors outside their state dict, fall back to a regular init.
+    """
+    try:
+        with torch.device("meta"):
+            model = cls(**kwargs)
+        model.load_state_dict(state, assign=True)
+        if not any(t.is_meta for t in (*model.parameters(), *model.buffers())):
+            return model.eval()
+    except (RuntimeError, NotImplementedError):
+        pass
+    model = cls(**kwargs)
+    model.load_state_dict(state, assign=True)
+    return model.eval()
+
+
+def checkpoint_path(params: dict[str, Any]) -> str | None:
+    """The optional 'ckpt_path' to evaluate, checked to exist."""
+    path = params.get("ckpt_path")
+    if path is None:
+        return None
+    if not isinstance(path, str):
+        raise TypeError("'ckpt_path' must be a string path")
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Checkpoint not found: {path}")
+    return path
+
+
+def load_weights(model: pl.LightningModule, path: str) -> None:
+    """Load a checkpoint's weights (Lightning or plain state dict) into ``model``."""
+    with phase("read"):
+        checkpoint = load_checkpoint(path)
+    model.load_state_dict(extract_state_dict(checkpoint))
+
+
+def resolve_checkpoints(params: dict[str, Any]) -> list[str] | None:
+    """Paths from 'checkpoints': a list of paths or a glob pattern (sorted).
+
+    Returns ``None`` when the param is absent.
+    """
+    spec = params.get("checkpoints")
+    if spec is None:
+        return None
+    if isinstance(spec, str):
+        paths = sorted(glob.glob(spec))
+        if not paths:
+            raise FileNotFoundError(f"No checkpoints match '{spec}'")
+        return paths
+    if not isinstance(spec, list) or not spec or not all(isinstance(p, str) for p in spec):
+        raise TypeError("'checkpoints' must be a glob pattern or a non-empty list of paths")
+    for path in spec:
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Checkpoint not found: {path}")
+    return list(spec)
+
+
+def evaluate_checkpoints(
+    trainer_service: LightningTrainerService,
+    model: pl.LightningModule,
+    stage: str,
+    paths: list[str],
+    datamodule: pl.LightningDataModule | None = None,
+) -> list[dict[str, Any]]:
+    """Validate or test ``model`` with each checkpoint's weights in turn.
+
+    The model and Trainer are built once by the caller. The stage's
+    dataloader (of ``datamodule`` if given) is iterated once and its
+    batches kept in memory, so every checkpoint is scored on the same data
+    without regenerating or reloading it; only the weights are swapped
+    between runs. The trainer's ``limit_{val,test}_batches`` (a count or a
+    fraction) is applied while materializing.
+    """
+    make_loader = eval_loader_factory(model, stage, datamodule)
+    run = trainer_service.validate if stage == "validate" else trainer_service.test
+    trainer = trainer_service.trainer
+    limit_attr = f"limit_{'val' if stage == 'validate' else 'test'}_batches"
+    limit = getattr(trainer, limit_attr)
+
+    with phase("materialize_data"):
+        source = make_loader()
+        batches: Iterable[Any] = source
+        if isinstance(limit, int):
+            batches = itertools.islice(source, limit)
+        elif isinstance(limit, float) and limit < 1.0 and isinstance(source, Sized):
+            # Same rounding as Lightning
+            batches = itertools.islice(batches, int(len(source) * limit))
+        loader = replay_loader(list(batches))
+
+    results = []
+    # The limit is already applied: a fraction must not shrink the cached batches again
+    setattr(trainer, limit_attr, 1.0)
+    try:
+        for path in paths:
+            start = time.perf_counter()
+            load_weights(model, path)
+            run(model, dataloaders=loader)
+            results.append({
+                "path": path,
+                "metrics": extract_metrics(trainer),
+                "time_ms": round((time.perf_counter() - start) * 1000.0, 3),
+                # Each run restarts the stage's record: this is the run's own
+                "performance": trainer_service.performance.summary(stage),
+            })
+    finally:
+        setattr(trainer, limit_attr, limit)
+    return results
+
+
+def rank_checkpoints(
+    results: list[dict[str, Any]], params: dict[str, Any], default_metric: str
+) -> dict[str, Any]:
+    """Order ``results`` by the 'rank_by' metric ('mode' "min" or "max")."""
+    metric = params.get("rank_by", default_metric)
+    mode = params.get("mode", "min")
+    if not isinstance(metric, str):
+        raise TypeError("'rank_by' must be a metric name")
+    if mode not in ("min", "max"):
+        raise ValueError("'mode' must be 'min' or 'max'")
+    missing = [r["path"] for r in results if metric not in r["metrics"]]
+    if missing:
+        raise ValueError(f"Metric '{metric}' not logged for: {', '.join(missing)}")
+
+    ranked = sorted(results, key=lambda r: r["metrics"][metric], reverse=mode == "max")
+    for rank, entry in enumerate(ranked, start=1):
+        entry["rank"] = rank
+    return {
+        "rank_by": metric,
+        "mode": mode,
+        "ranking": [r["path"] for r in ranked],
+        "best": ranked[0],
+    }
+
+
+def apply_seed(params: dict[str, Any]) -> None:
+    """Seed all RNGs from the optional integer 'seed' param."""
+    seed = params.get("seed")
+    if seed is None:
+        return
+    if not isinstance(seed, int) or isinstance(seed, bool):
+        raise TypeError("'seed' must be an integer")
+    pl.seed_everything(seed, workers=True, verbose=False)
+
+
+def extract_metrics(trainer: pl.Trainer) -> dict[str, float]:
+    """Convert the trainer's ``callback_metrics`` to plain floats."""
+    with phase("metrics"):
+        metrics = {}
+        for k, v in trainer.callback_metrics.items():
+            if hasattr(v, "item"):
+                metrics[k] = float(v.item())
+            elif isinstance(v, (int, float)):
+                metrics[k] = float(v)
+        return metrics
 
 
 def build_tool_response(request_id: str, result: dict[str, Any]) -> MCPResponse:
     """Build MCP CallToolResult response.
     """
+    with phase("serialize"):
+        text = json.dumps(result, indent=2)
     return MCPResponse(
         id=request_id,
         result={
             "content": [
                 {
                     "type": "text",
-                    "text": json.dumps(result, indent=2),
+                    "text": text,
                 }
             ],
             "structuredContent": result,
@@ -82,8 +527,13 @@ def build_tool_response(request_id: str, result: dict[str, Any]) -> MCPResponse:
 def suppress_output() -> Generator[None, None, None]:
     """Suppress stdout/stderr to prevent polluting JSON-RPC stream.
 
-    Uses both Python-level and OS-level redirection.
+    Uses both Python-level and OS-level redirection. If output capture is
+    installed, fds 1/2 are already isolated and this does nothing.
     """
+    if get_capture() is not None:
+        yield
+        return
+
     old_stdout = sys.stdout
     old_stderr = sys.stderr
     old_stdout_fd = os.dup(1)
@@ -1,78 +1,169 @@
 """Checkpoint handler for PyTorch Lightning models.
 
-Provides save, load, and list operations for model checkpoints.
+Provides save, load, list, and compare operations for model checkpoints.
 All operations suppress stdout/stderr to avoid polluting MCP JSON-RPC stream.
 """
 
 from __future__ import annotations
 
+import fnmatch
 import os
-from pathlib import Path
 from typing import Any
 
 import torch
+from torch import nn
 
 from lightning_mcp.handlers.base import build_tool_response, load_model, suppress_output
+from lightning_mcp.lightning.checkpoint_io import (
+    COMPRESSION_CODECS,
+    atomic_save,
+    cast_state_dict,
+    extract_state_dict,
+    is_lightning_checkpoint,
+    load_checkpoint,
+    read_compression_header,
+)
 from lightning_mcp.protocol import MCPRequest, MCPResponse
+from lightning_mcp.timing import phase
+
+# Elements per slice when diffing tensors; bounds the temporaries per tensor
+_COMPARE_CHUNK_ELEMS = 1 << 20
+
+# Export dtypes accepted by `save`
+_EXPORT_DTYPES = {
+    "bf16": torch.bfloat16,
+    "fp16": torch.float16,
+}
+
+# Normalization layers keep fp32 weights on reduced-precision export
+_NORM_LAYERS = (
+    nn.modules.batchnorm._BatchNorm,
+    nn.GroupNorm,
+    nn.LayerNorm,
+    nn.modules.instancenorm._InstanceNorm,
+    nn.LocalResponseNorm,
+)
 
 
 class CheckpointHandler:
-    """Handler for checkpoint operations: save, load, list."""
+    """Handler for checkpoint operations: save, load, list, compare."""
 
     def handle(self, request: MCPRequest) -> MCPResponse:
-        params = request.params
+        return build_tool_response(request.id, self.run(request.params))
+
+    def run(self, params: dict[str, Any], model: nn.Module | None = None) -> dict[str, Any]:
+        """Run a checkpoint action; return the result payload.
+
+        ``save`` and ``load`` act on ``model`` when given instead of building
+        one from the 'model' configuration.
+        """
         action = params.get("action")
 
         if not isinstance(action, str):
-            raise ValueError("'action' is required (save, load, list)")
+            raise ValueError("'action' is required (save, load, list, compare)")
 
         if action == "save":
-            result = self._save(params)
-        elif action == "load":
-            result = self._load(params)
-        elif action == "list":
-            result = self._list(params)
-        else:
-            raise ValueError(f"Unknown action: {action}")
-
-        return build_tool_response(request.id, result)
+            return self._save(params, model)
+        if action == "load":
+            return self._load(params, model)
+        if action == "list":
+            return self._list(params)
+        if action == "compare":
+            return self._compare(params)
+        raise ValueError(f"Unknown action: {action}")
 
-    def _save(self, params: dict[str, Any]) -> dict[str, Any]:
+    def _save(self, params: dict[str, Any], model: nn.Module | None = None) -> dict[str, Any]:
         """Save model checkpoint.
 
         Args:
-            params: Must contain 'path' and 'model' configuration.
+            params: Must contain 'path' and 'model' configuration. Optional
+                'compression' ("zstd", "lz4" or "zlib") and 'compression_level'.
+                Optional 'dtype' ("bf16" or "fp16") exports fp32 weights at
+                reduced precision; normalization layers and tensors matching
+                'keep_full_precision' glob patterns stay fp32.
 
         Returns:
-            Dict with action, path, model_class, and num_parameters.
+            Dict with action, path, model_class, num_parameters, size and
+            compression details (plus precision stats when 'dtype' is set).
         """
         path = params.get("path")
         if not isinstance(path, str):
             raise ValueError("'path' is required for save")
 
-        with suppress_output():
-            model = load_model(params)
+        compression = params.get("compression")
+        if compression is not None and compression not in COMPRESSION_CODECS:
+            raise ValueError(
+                f"'compression' must be one of {', '.join(COMPRESSION_CODECS)}"
+            )
+        level = params.get("compression_level")
+        if level is not None and not isinstance(level, int):
+            raise TypeError("'compression_level' must be an integer")
 
-            # Ensure directory exists
-            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        dtype_name = params.get("dtype")
+        if dtype_name is not None and dtype_name not in _EXPORT_DTYPES:
+            raise ValueError(f"'dtype' must be one of {', '.join(_EXPORT_DTYPES)}")
+        patterns = params.get("keep_full_precision", [])
+        if not isinstance(patterns, list) or not all(isinstance(p, str) for p in patterns):
+            raise TypeError("'keep_full_precision' must be a list of strings")
 
-            torch.save(model.state_dict(), path)
+        precision: dict[str, Any] = {}
+        with suppress_output():
+            if model is None:
+                model = load_model(params)
+            state_dict = model.state_dict()
+            if dtype_name is not None:
+                keep = self._full_precision_names(model, state_dict, patterns)
+                state_dict, stats = cast_state_dict(state_dict, _EXPORT_DTYPES[dtype_name], keep)
+                precision = {
+                    "dtype": dtype_name,
+                    "bytes_saved": stats["bytes_before"] - stats["bytes_after"],
+                    "max_abs_deviation": stats["max_abs_deviation"],
+                    "kept_full_precision": stats["kept"],
+                }
+            with phase("write"):
+                size_bytes = atomic_save(state_dict, path, compression, level)
 
         return {
             "action": "save",
             "path": path,
             "model_class": model.__class__.__name__,
             "num_parameters": sum(p.numel() for p in model.parameters()),
+            "size_bytes": size_bytes,
+            **self._compression_info(path, size_bytes),
+            **precision,
         }
 
-    def _load(self, params: dict[str, Any]) -> dict[str, Any]:
+    def _full_precision_names(
+        self,
+        model: nn.Module,
+        state_dict: dict[str, torch.Tensor],
+        patterns: list[str],
+    ) -> set[str]:
+        """State dict keys to keep at fp32: norm layers plus glob matches."""
+        keep: set[str] = set()
+        for module_name, module in model.named_modules():
+            if isinstance(module, _NORM_LAYERS):
+                prefix = f"{module_name}." if module_name else ""
+                keep.update(
+                    f"{prefix}{name}" for name, _ in module.named_parameters(recurse=False)
+                )
+                keep.update(f"{prefix}{name}" for name, _ in module.named_buffers(recurse=False))
+        for pattern in patterns:
+            keep.update(k for k in state_dict if fnmatch.fnmatchcase(k, pattern))
+        return keep
+
+    def _load(self, params: dict[str, Any], model: nn.Module | None = None) -> dict[str, Any]:
         """Load model from checkpoint.
 
+        Accepts bare state dicts as well as full Lightning ``.ckpt`` files;
+        for the latter only the model weights are restored. Reduced-precision
+        exports are upcast to the model's dtype by ``load_state_dict``.
+
         Args:
             params: Must contain 'path' and 'model' configuration.
 
         Returns:
-            Dict with action, path, model_class, and num_parameters.
+            Dict with action, path, format, model_class, and num_parameters.
         """
         path = params.get("path")
         if not isinstance(path, str):
@@ -82,19 +173,22 @@ class CheckpointHandler:
             raise FileNotFoundError(f"Checkpoint not found: {path}")
 
         with suppress_output():
-            model = load_model(params)
-            state_dict = torch.load(path, weights_only=True)
-            model.load_state_dict(state_dict)
+            if model is None:
+                model = load_model(params)
+            with phase("read"):
+                checkpoint = load_checkpoint(path)
+            model.load_state_dict(extract_state_dict(checkpoint))
 
         return {
             "action": "load",
             "path": path,
+            "format": "lightning" if is_lightning_checkpoint(checkpoint) else "state_dict",
             "model_class": model.__class__.__name__,
             "num_parameters": sum(p.numel() for p in model.parameters()),
         }
 
     def _list(self, params: dict[str, Any]) -> dict[str, Any]:
-        """List checkpoints in directory."""
+        """List checkpoints in directory, with compression ratios."""
         directory = params.get("directory", ".")
 
         if not os.path.isdir(directory):
@@ -104,10 +198,12 @@ class CheckpointHandler:
         for f in os.listdir(directory):
             if f.endswith((".ckpt", ".pt", ".pth")):
                 full_path = os.path.join(directory, f)
+                size_bytes = os.path.getsize(full_path)
                 checkpoints.append({
                     "name": f,
                     "path": full_path,
-                    "size_bytes": os.path.getsize(full_path),
+                    "size_bytes": size_bytes,
+                    **self._compression_info(full_path, size_bytes),
                 })
 
         return {
@@ -116,3 +212,121 @@ class CheckpointHandler:
             "checkpoints": checkpoints,
             "count": len(checkpoints),
         }
+
+    def _compare(self, params: dict[str, Any]) -> dict[str, Any]:
+        """Compare two checkpoints tensor by tensor.
+
+        Both files are memory-mapped and every tensor pair is diffed in
+        fixed-size slices, so memory use does not grow with checkpoint size.
+        Full Lightning checkpoints are compared on their model weights.
+
+        Args:
+            params: Must contain 'path' and 'other_path'. Optional
+                'changed_only' drops identical tensors from the report.
+
+        Returns:
+            Dict with a per-key report (equal, max_abs_diff, diff_norm,
+            rel_diff), keys present in only one file, and summary counts.
+        """
+        path = params.get("path")
+        other_path = params.get("other_path")
+        if not isinstance(path, str) or not isinstance(other_path, str):
+            raise ValueError("'path' and 'other_path' are required for compare")
+        for p in (path, other_path):
+            if not os.path.exists(p):
+                raise FileNotFoundError(f"Checkpoint not found: {p}")
+        changed_only = bool(params.get("changed_only", False))
+
+        a = extract_state_dict(load_checkpoint(path, mmap=True))
+        b = extract_state_dict(load_checkpoint(other_path, mmap=True))
+
+        report: dict[str, dict[str, Any]] = {}
+        num_changed = num_mismatched = 0
+        for key, ta in a.items():
+            if key not in b:
+                continue
+            tb = b[key]
+            if ta.shape != tb.shape:
+                num_mismatched += 1
+                report[key] = {
+                    "equal": False,
+                    "shape": list(ta.shape),
+                    "other_shape": list(tb.shape),
+                }
+                continue
+            entry = self._diff_tensors(ta, tb)
+            if not entry["equal"]:
+                num_changed += 1
+            if not (changed_only and entry["equal"]):
+                report[key] = entry
+
+        only_in_path = [k for k in a if k not in b]
+        only_in_other = [k for k in b if k not in a]
+        return {
+            "action": "compare",
+            "path": path,
+            "other_path": other_path,
+            "tensors": report,
+            "only_in_path": only_in_path,
+            "only_in_other": only_in_other,
+            "summary": {
+                "compared": len(a) - len(only_in_path),
+                "changed": num_changed,
+                "shape_mismatch": num_mismatched,
+                "identical": (
+                    num_changed == 0
+                    and num_mismatched == 0
+                    and not only_in_path
+                    and not only_in_other
+                ),
+            },
+        }
+
+    def _diff_tensors(self, a: torch.Tensor, b: torch.Tensor) -> dict[str, Any]:
+        """Diff statistics for two same-shape tensors, computed slice by slice.
+
+        NaNs (and infinities) at the same position count as equal and add
+        nothing to the diff, so a diverged checkpoint matches its own copy.
+        """
+        flat_a = a.reshape(-1)
+        flat_b = b.reshape(-1)
+        floating = a.is_floating_point() or b.is_floating_point()
+        equal = True
+        max_abs = 0.0
+        diff_sq = 0.0
+        norm_sq = 0.0
+
+        for start in range(0, flat_a.numel(), _COMPARE_CHUNK_ELEMS):
+            ca = flat_a[start : start + _COMPARE_CHUNK_ELEMS].double()
+            cb = flat_b[start : start + _COMPARE_CHUNK_ELEMS].double()
+            diff = (cb - ca).abs_()
+            if floating:
+                diff.masked_fill_((ca == cb) | (ca.isnan() & cb.isnan()), 0.0)
+                same = torch.equal(ca, cb) or torch.allclose(ca, cb, rtol=0, atol=0, equal_nan=True)
+            else:
+                same = torch.equal(ca, cb)
+            equal = equal and bool(same)
+            max_abs = max(max_abs, diff.max().item())
+            diff_sq += diff.square_().sum().item()
+            norm_sq += ca.square().nansum().item()
+
+        diff_norm = diff_sq**0.5
+        norm = norm_sq**0.5
+        return {
+            "equal": equal,
+            "shape": list(a.shape),
+            "dtype": str(a.dtype).removeprefix("torch."),
+            "max_abs_diff": max_abs,
+            "diff_norm": diff_norm,
+            "rel_diff": diff_norm / norm if norm > 0 else (0.0 if diff_norm == 0 else None),
+        }
+
+    def _compression_info(self, path: str, size_bytes: int) -> dict[str, Any]:
+        """Codec and raw/stored size ratio, read from the file header only."""
+        header = read_compression_header(path)
+        if header is None:
+            return {"compression": None, "compression_ratio": 1.0}
+        return {
+            "compression": header["codec"],
+            "compression_ratio": round(header["raw_size"] / max(size_bytes, 1), 3),
+        }
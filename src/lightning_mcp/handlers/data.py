@@ -0,0 +1,77 @@
+"""Data handler for memory-mapped sharded datasets.
+
+Provides ``ingest`` (convert a CSV or ``.npz`` file into shards plus an
+index) and ``describe`` for the format in ``lightning_mcp.lightning.shards``,
+which ``ShardedDataModule`` reads for training and evaluation.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any
+
+from lightning_mcp.handlers.base import build_tool_response
+from lightning_mcp.protocol import MCPRequest, MCPResponse
+from lightning_mcp.timing import phase
+
+
+class DataHandler:
+    """Handler for dataset operations: ingest, describe."""
+
+    def handle(self, request: MCPRequest) -> MCPResponse:
+        return build_tool_response(request.id, self.run(request.params))
+
+    def run(self, params: dict[str, Any]) -> dict[str, Any]:
+        action = params.get("action")
+
+        if not isinstance(action, str):
+            raise ValueError("'action' is required (ingest, describe)")
+
+        if action == "ingest":
+            return self._ingest(params)
+        if action == "describe":
+            return self._describe(params)
+        raise ValueError(f"Unknown action: {action}")
+
+    def _ingest(self, params: dict[str, Any]) -> dict[str, Any]:
+        """Convert 'source' (.csv or .npz) into a sharded dataset at 'output'.
+
+        Args:
+            params: Must contain 'source' and 'output'. Optional 'shard_rows'
+                (default 65536); for CSV, 'label_column' (stored as int64
+                field 'y') and 'dtype' of the feature field 'x' (default
+                float32).
+        """
+        from lightning_mcp.lightning.shards import ingest
+
+        source = params.get("source")
+        output = params.get("output")
+        if not isinstance(source, str) or not isinstance(output, str):
+            raise ValueError("'source' and 'output' paths are required for ingest")
+        label_column = params.get("label_column")
+        if label_column is not None and not isinstance(label_column, str):
+            raise TypeError("'label_column' must be a string")
+
+        start = time.perf_counter()
+        with phase("ingest"):
+            dataset = ingest(
+                source,
+                output,
+                shard_rows=params.get("shard_rows", 65536),
+                label_column=label_column,
+                dtype=params.get("dtype", "float32"),
+            )
+        return {
+            "action": "ingest",
+            "source": source,
+            **dataset.describe(),
+            "time_ms": round((time.perf_counter() - start) * 1000.0, 3),
+        }
+
+    def _describe(self, params: dict[str, Any]) -> dict[str, Any]:
+        from lightning_mcp.lightning.shards import ShardedDataset
+
+        path = params.get("path")
+        if not isinstance(path, str):
+            raise ValueError("'path' is required for describe")
+        return {"action": "describe", **ShardedDataset(path).describe()}
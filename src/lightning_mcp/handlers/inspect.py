@@ -15,6 +15,7 @@ from pytorch_lightning.utilities.model_summary import ModelSummary
 
 from lightning_mcp.handlers.base import build_tool_response, load_model, suppress_output
 from lightning_mcp.protocol import MCPRequest, MCPResponse
+from lightning_mcp.timing import phase
 
 
 class InspectHandler:
@@ -41,7 +42,7 @@ class InspectHandler:
     def _inspect_model(self, params: dict[str, Any]) -> dict[str, Any]:
         """Inspect model architecture and parameters."""
         with suppress_output():
-            model = load_model(params)
+            model = load_model(params, shared=True)
         return {
             "class": model.__class__.__name__,
             "num_parameters": sum(p.numel() for p in model.parameters()),
@@ -54,8 +55,9 @@ class InspectHandler:
     def _inspect_summary(self, params: dict[str, Any]) -> dict[str, str]:
         """Generate model summary."""
         with suppress_output():
-            model = load_model(params)
-            summary = ModelSummary(model, max_depth=2)
+            model = load_model(params, shared=True)
+            with phase("summary"):
+                summary = ModelSummary(model, max_depth=2)
         return {"summary": str(summary)}
 
     def _inspect_environment(self) -> dict[str, Any]:
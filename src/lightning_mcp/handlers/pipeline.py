@@ -0,0 +1,139 @@
+"""Pipeline handler for PyTorch Lightning models.
+
+Runs an ordered list of train, validate, test, checkpoint and predict steps
+against a single model instance, built once and kept in memory, so e.g.
+validation sees the weights training just produced. Each step reuses the
+corresponding handler's logic and the results come back in one response.
+All operations suppress stdout/stderr to avoid polluting MCP JSON-RPC stream.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any
+
+from lightning_mcp.handlers.base import build_tool_response, load_model, suppress_output
+from lightning_mcp.handlers.checkpoint import CheckpointHandler
+from lightning_mcp.handlers.predict import PredictHandler
+from lightning_mcp.handlers.test import TestHandler
+from lightning_mcp.handlers.train import TrainHandler
+from lightning_mcp.handlers.validate import ValidateHandler
+from lightning_mcp.protocol import MCPRequest, MCPResponse
+from lightning_mcp.timing import phase
+
+_STEP_TOOLS = ("train", "validate", "test", "checkpoint", "predict")
+
+
+class PipelineHandler:
+    """Handler for multi-step pipelines over one in-memory model."""
+
+    def __init__(self) -> None:
+        self._train = TrainHandler()
+        self._validate = ValidateHandler()
+        self._test = TestHandler()
+        self._predict = PredictHandler()
+        self._checkpoint = CheckpointHandler()
+
+    def handle(self, request: MCPRequest) -> MCPResponse:
+        params = request.params
+        steps = self._steps(params)
+
+        start = time.perf_counter()
+        with suppress_output(), phase("model_load"):
+            model = load_model(params)
+        load_ms = (time.perf_counter() - start) * 1000.0
+
+        results: list[dict[str, Any]] = []
+        failed: int | None = None
+        error: str | None = None
+        for index, (tool, step_params) in enumerate(steps):
+            if failed is not None:
+                results.append({"tool": tool, "status": "skipped"})
+                continue
+            step_start = time.perf_counter()
+            try:
+                with phase(f"step_{index}_{tool}"):
+                    output = self._run_step(tool, model, step_params)
+            except Exception as exc:
+                # Later steps depend on this one: stop, but keep what completed
+                failed, error = index, f"{type(exc).__name__}: {exc}"
+                results.append({
+                    "tool": tool,
+                    "status": "failed",
+                    "time_ms": round((time.perf_counter() - step_start) * 1000.0, 3),
+                    "error": error,
+                })
+                continue
+            results.append({
+                "tool": tool,
+                "status": "completed",
+                "time_ms": round((time.perf_counter() - step_start) * 1000.0, 3),
+                "result": output,
+            })
+
+        result: dict[str, Any] = {
+            "status": "completed" if failed is None else "failed",
+            "model": {
+                "class": model.__class__.__name__,
+                "num_parameters": sum(p.numel() for p in model.parameters()),
+            },
+            "steps": results,
+            "timings_ms": {
+                "model_load": round(load_ms, 3),
+                "total": round((time.perf_counter() - start) * 1000.0, 3),
+            },
+        }
+        if failed is not None:
+            result["failed_step"] = failed
+            result["error"] = error
+
+        return build_tool_response(request.id, result)
+
+    def _steps(self, params: dict[str, Any]) -> list[tuple[str, dict[str, Any]]]:
+        """Validate every step up front; return (tool, params) pairs.
+
+        Steps inherit the pipeline's 'trainer' configuration, with a step's
+        own 'trainer' keys taking precedence, and its 'datamodule' unless
+        they set their own.
+        """
+        steps = params.get("steps")
+        if not isinstance(steps, list) or not steps:
+            raise ValueError("'steps' must be a non-empty list")
+        trainer = params.get("trainer", {})
+        if not isinstance(trainer, dict):
+            raise TypeError("'trainer' must be a dict")
+
+        parsed = []
+        for index, step in enumerate(steps):
+            if not isinstance(step, dict):
+                raise TypeError(f"Step {index} must be a dict")
+            tool = step.get("tool")
+            if isinstance(tool, str):
+                tool = tool.removeprefix("lightning.")
+            if tool not in _STEP_TOOLS:
+                raise ValueError(
+                    f"Step {index}: unknown tool {step.get('tool')!r} "
+                    f"(expected one of {', '.join(_STEP_TOOLS)})"
+                )
+            step_trainer = step.get("trainer", {})
+            if not isinstance(step_trainer, dict):
+                raise TypeError(f"Step {index}: 'trainer' must be a dict")
+            if tool == "checkpoint" and not isinstance(step.get("action"), str):
+                raise ValueError(f"Step {index}: 'action' is required for checkpoint")
+            step_params = {k: v for k, v in step.items() if k not in ("tool", "model")}
+            step_params["trainer"] = {**trainer, **step_trainer}
+            if "datamodule" in params:
+                step_params.setdefault("datamodule", params["datamodule"])
+            parsed.append((tool, step_params))
+        return parsed
+
+    def _run_step(self, tool: str, model: Any, params: dict[str, Any]) -> dict[str, Any]:
+        if tool == "train":
+            return self._train.run(model, params)
+        if tool == "validate":
+            return self._validate.run(model, params)
+        if tool == "test":
+            return self._test.run(model, params)
+        if tool == "predict":
+            return self._predict.run(model, params)
+        return self._checkpoint.run(params, model)
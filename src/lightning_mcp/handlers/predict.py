@@ -8,11 +8,18 @@ from __future__ import annotations
 
 from typing import Any
 
+import pytorch_lightning as pl
 import torch
 
-from lightning_mcp.handlers.base import build_tool_response, load_model, suppress_output
+from lightning_mcp.handlers.base import (
+    build_tool_response,
+    load_model,
+    suppress_output,
+    use_datamodule,
+)
 from lightning_mcp.lightning.trainer import LightningTrainerService
 from lightning_mcp.protocol import MCPRequest, MCPResponse
+from lightning_mcp.timing import phase
 
 
 class PredictHandler:
@@ -22,12 +29,19 @@ class PredictHandler:
         params = request.params
 
         with suppress_output():
-            model = load_model(params)
+            model = load_model(params, shared=True)
+
+        return build_tool_response(request.id, self.run(model, params))
+
+    def run(self, model: pl.LightningModule, params: dict[str, Any]) -> dict[str, Any]:
+        """Run prediction with an already-built ``model``; return the result payload."""
+        with suppress_output(), use_datamodule(params) as datamodule:
             trainer_service = self._load_trainer(params)
-            predictions = trainer_service.predict(model)
+            predictions = trainer_service.predict(model, datamodule=datamodule)
 
         # Convert predictions to serializable format
-        serialized = self._serialize_predictions(predictions)
+        with phase("serialize_predictions"):
+            serialized = self._serialize_predictions(predictions)
 
         result = {
             "status": "completed",
@@ -38,7 +52,7 @@ class PredictHandler:
             "num_batches": len(predictions) if predictions else 0,
         }
 
-        return build_tool_response(request.id, result)
+        return result
 
     def _load_trainer(self, params: dict[str, Any]) -> LightningTrainerService:
         cfg = params.get("trainer", {})
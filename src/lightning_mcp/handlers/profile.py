@@ -0,0 +1,121 @@
+"""Profile handler for PyTorch Lightning models.
+
+Runs a bounded number of training or prediction steps under
+``torch.profiler`` and returns the most expensive ops. Since the trainer
+runs without a logger, this is the way to profile through the MCP API.
+All operations suppress stdout/stderr to avoid polluting MCP JSON-RPC stream.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from lightning_mcp.handlers.base import (
+    build_tool_response,
+    load_model,
+    suppress_output,
+    use_datamodule,
+)
+from lightning_mcp.lightning.profiling import SORT_KEYS, StepProfiler
+from lightning_mcp.lightning.trainer import LightningTrainerService
+from lightning_mcp.protocol import MCPRequest, MCPResponse
+
+_MODES = ("train", "predict")
+_DEFAULT_SCHEDULE = {"wait": 1, "warmup": 1, "active": 3}
+
+
+class ProfileHandler:
+    """Handler for profiling training or prediction steps."""
+
+    def handle(self, request: MCPRequest) -> MCPResponse:
+        params = request.params
+
+        mode = params.get("mode", "train")
+        if mode not in _MODES:
+            raise ValueError(f"Unknown profile mode '{mode}' (expected one of {', '.join(_MODES)})")
+
+        steps = self._schedule(params)
+        top_n = params.get("top_n", 20)
+        if not isinstance(top_n, int) or top_n < 1:
+            raise ValueError("'top_n' must be a positive integer")
+        sort_by = params.get("sort_by", "self_cpu_time_total")
+        if sort_by not in SORT_KEYS:
+            raise ValueError(
+                f"Unknown sort key '{sort_by}' (expected one of {', '.join(SORT_KEYS)})"
+            )
+        trace_path = params.get("trace_path")
+        if trace_path is not None and not isinstance(trace_path, str):
+            raise TypeError("'trace_path' must be a string")
+
+        profiler = StepProfiler(
+            **steps,
+            record_shapes=bool(params.get("record_shapes", True)),
+            profile_memory=bool(params.get("profile_memory", True)),
+            trace_path=trace_path,
+        )
+
+        with suppress_output(), use_datamodule(params) as datamodule:
+            model = load_model(params)
+            trainer_service = self._load_trainer(params, profiler, mode)
+            if mode == "train":
+                # Profiler overhead would skew the server's training throughput
+                trainer_service.fit(model, datamodule=datamodule, record_metrics=False)
+            else:
+                trainer_service.predict(model, datamodule=datamodule)
+
+        result = {
+            "status": "completed",
+            "mode": mode,
+            "model": {
+                "class": model.__class__.__name__,
+            },
+            "schedule": steps,
+            "steps_run": profiler.steps,
+            "complete": profiler.steps >= profiler.total_steps,
+            "sort_by": sort_by,
+            "ops": profiler.op_table(top_n, sort_by),
+            "trace_path": trace_path if profiler.events is not None else None,
+        }
+
+        return build_tool_response(request.id, result)
+
+    def _schedule(self, params: dict[str, Any]) -> dict[str, int]:
+        cfg = params.get("schedule", {})
+        if not isinstance(cfg, dict):
+            raise TypeError("'schedule' must be a dict")
+        unknown = sorted(set(cfg) - set(_DEFAULT_SCHEDULE))
+        if unknown:
+            raise ValueError(
+                f"Unknown schedule key(s) {', '.join(unknown)} "
+                f"(expected {', '.join(_DEFAULT_SCHEDULE)})"
+            )
+        steps = {**_DEFAULT_SCHEDULE, **cfg}
+        for key in ("wait", "warmup", "active"):
+            if not isinstance(steps[key], int) or steps[key] < 0:
+                raise ValueError(f"'schedule.{key}' must be a non-negative integer")
+        if steps["active"] < 1:
+            raise ValueError("'schedule.active' must be >= 1")
+        return {key: steps[key] for key in _DEFAULT_SCHEDULE}
+
+    def _load_trainer(
+        self, params: dict[str, Any], profiler: StepProfiler, mode: str
+    ) -> LightningTrainerService:
+        cfg = params.get("trainer", {})
+        if not isinstance(cfg, dict):
+            raise TypeError("'trainer' must be a dict")
+
+        # Run exactly one profiling cycle worth of batches
+        bounds: dict[str, Any]
+        if mode == "train":
+            bounds = {
+                "max_steps": profiler.total_steps,
+                "max_epochs": -1,
+                "limit_val_batches": 0,
+                "num_sanity_val_steps": 0,
+                "enable_checkpointing": False,
+            }
+        else:
+            bounds = {"limit_predict_batches": profiler.total_steps}
+
+        callbacks = [*(cfg.get("callbacks") or []), profiler]
+        return LightningTrainerService(**{**cfg, **bounds, "callbacks": callbacks})
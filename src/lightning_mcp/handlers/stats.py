@@ -0,0 +1,43 @@
+"""Stats handler exposing the server metrics registry.
+
+Lets clients of the stdio transport, which has no ``GET /metrics``,
+read the same counters, gauges and histograms on demand. Under
+``--workers`` they are those of the worker answering the call.
+"""
+
+from __future__ import annotations
+
+import os
+
+from lightning_mcp.handlers.base import build_tool_response, shared_weights_bytes
+from lightning_mcp.metrics import REGISTRY, memory_breakdown
+from lightning_mcp.protocol import MCPRequest, MCPResponse
+from lightning_mcp.workers import worker_index, worker_memory
+
+_FORMATS = ("json", "prometheus")
+
+
+class StatsHandler:
+    """Handler for dumping server metrics (read-only)."""
+
+    def handle(self, request: MCPRequest) -> MCPResponse:
+        fmt = request.params.get("format", "json")
+        if fmt not in _FORMATS:
+            raise ValueError(f"Unknown stats format '{fmt}' (expected one of {', '.join(_FORMATS)})")
+
+        if fmt == "prometheus":
+            return build_tool_response(request.id, {"format": fmt, "text": REGISTRY.render()})
+
+        result = {
+            "format": fmt,
+            **REGISTRY.snapshot(),
+            "memory": {**memory_breakdown(), "shared_weights_bytes": shared_weights_bytes()},
+        }
+        workers = worker_memory()
+        if workers is not None:
+            result["workers"] = workers
+        index = worker_index()
+        if index is not None:
+            # Counters above cover this worker only
+            result["worker"] = {"index": index, "pid": os.getpid()}
+        return build_tool_response(request.id, result)
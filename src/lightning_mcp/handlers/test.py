@@ -8,9 +8,26 @@ from __future__ import annotations
 
 from typing import Any
 
-from lightning_mcp.handlers.base import build_tool_response, load_model, suppress_output
+import pytorch_lightning as pl
+
+from lightning_mcp.handlers.base import (
+    apply_seed,
+    build_tool_response,
+    checkpoint_path,
+    evaluate_checkpoints,
+    extract_metrics,
+    load_model,
+    load_weights,
+    rank_checkpoints,
+    resolve_checkpoints,
+    shared_weights_digest,
+    suppress_output,
+    use_datamodule,
+)
+from lightning_mcp.lightning.batch_cache import data_key
 from lightning_mcp.lightning.trainer import LightningTrainerService
 from lightning_mcp.protocol import MCPRequest, MCPResponse
+from lightning_mcp.result_cache import result_cache_for
 
 
 class TestHandler:
@@ -19,19 +36,43 @@ class TestHandler:
     def handle(self, request: MCPRequest) -> MCPResponse:
         params = request.params
 
+        paths = resolve_checkpoints(params)
+        if paths is not None:
+            if "ckpt_path" in params:
+                raise ValueError("Pass either 'ckpt_path' or 'checkpoints', not both")
+            return build_tool_response(request.id, self._run_many(params, paths))
+
+        ckpt_path = checkpoint_path(params)
+
+        cache = result_cache_for(params)
+        if cache is not None:
+            weights = shared_weights_digest(params) if ckpt_path is None else None
+            key = cache.key("test", params, ckpt_path, weights)
+            cached = cache.get(key)
+            if cached is not None:
+                return build_tool_response(request.id, cached)
+
         with suppress_output():
-            model = load_model(params)
+            apply_seed(params)
+            # Shared (preloaded) weights must not be overwritten by a checkpoint
+            model = load_model(params, shared=ckpt_path is None)
+            if ckpt_path is not None:
+                load_weights(model, ckpt_path)
+
+        result = self.run(model, params)
+        if cache is not None:
+            cache.put(key, result)
+        return build_tool_response(request.id, result)
+
+    def run(self, model: pl.LightningModule, params: dict[str, Any]) -> dict[str, Any]:
+        """Test an already-built ``model``; return the result payload."""
+        with suppress_output(), use_datamodule(params) as datamodule:
             trainer_service = self._load_trainer(params)
-            trainer_service.test(model)
+            trainer_service.test(model, cache_key=data_key(params), datamodule=datamodule)
 
         # Extract metrics
-        metrics = {}
         trainer = trainer_service.trainer
-        for k, v in trainer.callback_metrics.items():
-            if hasattr(v, "item"):
-                metrics[k] = float(v.item())
-            elif isinstance(v, (int, float)):
-                metrics[k] = float(v)
+        metrics = extract_metrics(trainer)
 
         result = {
             "status": "completed",
@@ -40,9 +81,28 @@ class TestHandler:
                 "num_parameters": sum(p.numel() for p in model.parameters()),
             },
             "metrics": metrics,
+            "performance": trainer_service.performance.summary("test"),
         }
 
-        return build_tool_response(request.id, result)
+        return result
+
+    def _run_many(self, params: dict[str, Any], paths: list[str]) -> dict[str, Any]:
+        """Score every checkpoint on one materialized data pass and rank them."""
+        with suppress_output(), use_datamodule(params) as datamodule:
+            apply_seed(params)
+            model = load_model(params)
+            trainer_service = self._load_trainer(params)
+            results = evaluate_checkpoints(trainer_service, model, "test", paths, datamodule)
+
+        return {
+            "status": "completed",
+            "model": {
+                "class": model.__class__.__name__,
+                "num_parameters": sum(p.numel() for p in model.parameters()),
+            },
+            "checkpoints": results,
+            **rank_checkpoints(results, params, default_metric="test_loss"),
+        }
 
     def _load_trainer(self, params: dict[str, Any]) -> LightningTrainerService:
         cfg = params.get("trainer", {})
@@ -6,9 +6,18 @@ All operations suppress stdout/stderr to avoid polluting MCP JSON-RPC stream.
 
 from __future__ import annotations
 
+import os
 from typing import Any
 
-from lightning_mcp.handlers.base import build_tool_response, load_model, suppress_output
+import pytorch_lightning as pl
+
+from lightning_mcp.handlers.base import (
+    build_tool_response,
+    extract_metrics,
+    load_model,
+    suppress_output,
+    use_datamodule,
+)
 from lightning_mcp.lightning.trainer import LightningTrainerService
 from lightning_mcp.protocol import MCPRequest, MCPResponse
 
@@ -19,20 +28,27 @@ class TrainHandler:
     def handle(self, request: MCPRequest) -> MCPResponse:
         params = request.params
 
+        # Validate before building the model
+        self._resume_path(params)
+
         with suppress_output():
             model = load_model(params)
+
+        return build_tool_response(request.id, self.run(model, params))
+
+    def run(self, model: pl.LightningModule, params: dict[str, Any]) -> dict[str, Any]:
+        """Train an already-built ``model`` in place; return the result payload."""
+        resume_from = self._resume_path(params)
+
+        with suppress_output(), use_datamodule(params) as datamodule:
             trainer_service = self._load_trainer(params)
-            trainer_service.fit(model)
+            trainer_service.fit(model, ckpt_path=resume_from, datamodule=datamodule)
 
         trainer = trainer_service.trainer
+        steps = trainer_service.step_tracker
 
         # Extract metrics
-        metrics = {}
-        for k, v in trainer.callback_metrics.items():
-            if hasattr(v, "item"):
-                metrics[k] = float(v.item())
-            elif isinstance(v, (int, float)):
-                metrics[k] = float(v)
+        metrics = extract_metrics(trainer)
 
         result = {
             "status": "completed",
@@ -45,15 +61,33 @@ class TrainHandler:
                 "max_epochs": trainer.max_epochs,
                 "accelerator": trainer.accelerator.__class__.__name__,
                 "devices": trainer.num_devices,
+                "resumed_from": resume_from,
+                "start_step": steps.start_step,
+                "global_step": trainer.global_step,
+                "steps_run": steps.steps_run,
             },
             "metrics": metrics,
+            "performance": trainer_service.performance.summary("fit"),
         }
 
-        return build_tool_response(request.id, result)
+        if trainer_service.async_checkpoint is not None:
+            result["checkpointing"] = trainer_service.async_checkpoint.summary()
+
+        return result
 
     def _load_trainer(self, params: dict[str, Any]) -> LightningTrainerService:
         cfg = params.get("trainer", {})
         if not isinstance(cfg, dict):
             raise TypeError("'trainer' must be a dict")
 
-        return LightningTrainerService(**cfg)
+        return LightningTrainerService(checkpoint=params.get("checkpoint"), **cfg)
+
+    def _resume_path(self, params: dict[str, Any]) -> str | None:
+        path = params.get("resume_from")
+        if path is None:
+            return None
+        if not isinstance(path, str):
+            raise TypeError("'resume_from' must be a string path")
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Checkpoint not found: {path}")
+        return path
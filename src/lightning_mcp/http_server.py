@@ -1,16 +1,31 @@
+import asyncio
+import json
 import traceback
+from collections.abc import AsyncIterator
+from concurrent.futures import Future
 from typing import Any
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
 
+from lightning_mcp.capture import attach_diagnostics, capture_request
+from lightning_mcp.coalesce import COALESCER
 from lightning_mcp.constants import PROTOCOL_VERSION, SERVER_VERSION
+from lightning_mcp.executor import SERVER_BUSY_CODE, BoundedExecutor, ServerBusyError
 from lightning_mcp.handlers.checkpoint import CheckpointHandler
+from lightning_mcp.handlers.data import DataHandler
 from lightning_mcp.handlers.inspect import InspectHandler
+from lightning_mcp.handlers.pipeline import PipelineHandler
 from lightning_mcp.handlers.predict import PredictHandler
+from lightning_mcp.handlers.profile import ProfileHandler
+from lightning_mcp.handlers.stats import StatsHandler
 from lightning_mcp.handlers.test import TestHandler
 from lightning_mcp.handlers.train import TrainHandler
 from lightning_mcp.handlers.validate import ValidateHandler
+from lightning_mcp.metrics import REGISTRY
+from lightning_mcp.progress import Progress, track_progress
 from lightning_mcp.protocol import MCPError, MCPRequest, MCPResponse
+from lightning_mcp.timing import attach_timings, collect_timings, timings_requested
 from lightning_mcp.tools import list_tools
 
 app = FastAPI(title="Lightning MCP Server")
@@ -21,6 +36,10 @@ validate_handler = ValidateHandler()
 test_handler = TestHandler()
 predict_handler = PredictHandler()
 checkpoint_handler = CheckpointHandler()
+profile_handler = ProfileHandler()
+pipeline_handler = PipelineHandler()
+data_handler = DataHandler()
+stats_handler = StatsHandler()
 
 # Map tool names to handlers
 _tool_handlers = {
@@ -30,33 +49,59 @@ _tool_handlers = {
     "lightning.test": test_handler,
     "lightning.predict": predict_handler,
     "lightning.checkpoint": checkpoint_handler,
+    "lightning.profile": profile_handler,
+    "lightning.pipeline": pipeline_handler,
+    "lightning.data": data_handler,
+    "lightning.stats": stats_handler,
 }
 
+# Answered inline on the event loop; everything else goes to the executor
+_INLINE_METHODS = {"initialize", "tools/list", "lightning.stats"}
+_INLINE_TOOLS = {"lightning.stats"}
+
+# Seconds between keep-alives on SSE responses
+SSE_KEEPALIVE_SECONDS = 15.0
+
+_executor = BoundedExecutor()
+
 
 def _call_handler(request: MCPRequest, handler: Any) -> MCPResponse:
-    """Call handler with proper JSON-RPC 2.0 error code mapping."""
-    try:
-        result: MCPResponse = handler.handle(request)
-        return result
-    except (ValueError, TypeError) as exc:
-        # Invalid params (bad model config, missing fields, etc.)
-        return MCPResponse(
-            id=request.id,
-            error=MCPError(
-                code=-32602,  # JSON-RPC 2.0: Invalid params
-                message=str(exc),
-            ),
-        )
-    except Exception as exc:
-        # Internal error
-        return MCPResponse(
-            id=request.id,
-            error=MCPError(
-                code=-32603,  # JSON-RPC 2.0: Internal error
-                message=str(exc),
-                data={"traceback": traceback.format_exc()},
-            ),
-        )
+    """Call handler with proper JSON-RPC 2.0 error code mapping.
+
+    Output captured while the handler runs is attached to the response
+    when the request opts in with ``"diagnostics": true``. Identical
+    concurrent calls to side-effect-free tools share one execution.
+    """
+    return COALESCER.call(request, lambda: _run_handler(request, handler))
+
+
+def _run_handler(request: MCPRequest, handler: Any) -> MCPResponse:
+    with capture_request() as log:
+        try:
+            response: MCPResponse = handler.handle(request)
+        except (ValueError, TypeError) as exc:
+            # Invalid params (bad model config, missing fields, etc.)
+            response = MCPResponse(
+                id=request.id,
+                error=MCPError(
+                    code=-32602,  # JSON-RPC 2.0: Invalid params
+                    message=str(exc),
+                ),
+            )
+        except Exception as exc:
+            # Internal error
+            response = MCPResponse(
+                id=request.id,
+                error=MCPError(
+                    code=-32603,  # JSON-RPC 2.0: Internal error
+                    message=str(exc),
+                    data={"traceback": traceback.format_exc()},
+                ),
+            )
+
+    if request.params.get("diagnostics"):
+        attach_diagnostics(response, log)
+    return response
 
 
 def _dispatch_tool(request_id: str, tool_name: str, tool_params: dict) -> MCPResponse:
@@ -84,8 +129,201 @@ def _dispatch_tool(request_id: str, tool_name: str, tool_params: dict) -> MCPRes
     return _call_handler(synthetic_request, handler)
 
 
-@app.post("/mcp", response_model_exclude_none=True)
-def handle_mcp(request: MCPRequest) -> MCPResponse:
+def configure_executor(max_workers: int | None = None, queue_depth: int = 16) -> None:
+    """Replace the handler executor (called by the CLI before serving)."""
+    global _executor
+    old = _executor
+    _executor = BoundedExecutor(max_workers, queue_depth)
+    old.shutdown(wait=False)
+
+
+def _is_inline(request: MCPRequest) -> bool:
+    """Cheap methods answered on the event loop, never queued behind handlers."""
+    if request.method == "tools/call":
+        return request.params.get("name") in _INLINE_TOOLS
+    return request.method in _INLINE_METHODS or request.method not in _tool_handlers
+
+
+def _timed_route(request: MCPRequest) -> MCPResponse:
+    """Route request, collecting phase timings if ``_meta.timings`` is set."""
+    with collect_timings(timings_requested(request.params)) as timer:
+        if timer is None:
+            return _route(request)
+        with timer.phase("dispatch"):
+            response = _route(request)
+        attach_timings(response, timer)
+    return response
+
+
+def _finish(request: MCPRequest, start: float, response: MCPResponse) -> dict[str, Any]:
+    tool = request.params.get("name") if request.method == "tools/call" else None
+    REGISTRY.request_finished(
+        request.method,
+        # Unknown tool names are not used as labels, to bound cardinality
+        tool if isinstance(tool, str) and tool in _tool_handlers else None,
+        start,
+        response.error.code if response.error is not None else None,
+    )
+    # exclude_none=True per JSON-RPC 2.0: error MUST NOT exist on success
+    return response.model_dump(exclude_none=True)
+
+
+def _busy_response(request: MCPRequest, start: float, exc: ServerBusyError) -> JSONResponse:
+    response = MCPResponse(
+        id=request.id,
+        error=MCPError(code=SERVER_BUSY_CODE, message=str(exc)),
+    )
+    return JSONResponse(
+        _finish(request, start, response),
+        status_code=429,
+        headers={"Retry-After": "1"},
+    )
+
+
+@app.post("/mcp", response_model=None)
+async def handle_mcp(request: MCPRequest | list[Any], http_request: Request) -> Response:
+    """JSON-RPC endpoint.
+
+    A batch (JSON array) is answered with one array, its requests running
+    concurrently on the executor.
+
+    Handler work runs on the bounded executor; when its workers and queue
+    are full the request is rejected at once with HTTP 429 / ``-32000``.
+    Clients that accept ``text/event-stream`` get the MCP streamable-HTTP
+    response mode: an SSE stream with keep-alives (and, given
+    ``_meta.progressToken``, progress notifications of completed steps or
+    batches) while the call runs, then the response as a ``message`` event.
+    """
+    if isinstance(request, list):
+        return await _handle_batch(request)
+
+    start = REGISTRY.request_started()
+    if _is_inline(request):
+        return JSONResponse(_finish(request, start, _timed_route(request)))
+
+    stream = "text/event-stream" in http_request.headers.get("accept", "")
+    progress = Progress() if stream and _progress_token(request) is not None else None
+    try:
+        future = _executor.submit(_tracked_route, request, progress)
+    except ServerBusyError as exc:
+        return _busy_response(request, start, exc)
+
+    if stream:
+        return StreamingResponse(
+            _sse_stream(request, start, future, progress),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache"},
+        )
+
+    response = await asyncio.wrap_future(future)
+    return JSONResponse(_finish(request, start, response))
+
+
+async def _handle_batch(entries: list[Any]) -> Response:
+    if not entries:
+        REGISTRY.inc_error(-32600)
+        error = MCPResponse(id=None, error=MCPError(code=-32600, message="Invalid Request: empty batch"))
+        return JSONResponse(error.model_dump(exclude_none=True))
+    # Waiting for executor slots blocks, so coordinate off the event loop
+    responses = await asyncio.to_thread(_run_batch, entries)
+    if not responses:
+        # Only notifications: nothing to return
+        return Response(status_code=202)
+    return JSONResponse(responses)
+
+
+def _run_batch(entries: list[Any]) -> list[dict[str, Any]]:
+    """Run a batch's requests on the executor; one result per request, in order."""
+    requests: list[tuple[MCPRequest, float]] = []
+    results: list[Any] = []
+    for entry in entries:
+        if isinstance(entry, dict) and "id" not in entry:
+            continue  # notification: no response
+        try:
+            if not isinstance(entry, dict):
+                raise ValueError("Request must be a JSON object")
+            request = MCPRequest(**{**entry, "id": str(entry["id"])})
+        except ValueError as exc:
+            REGISTRY.inc_error(-32600)
+            request_id = str(entry["id"]) if isinstance(entry, dict) else None
+            error = MCPResponse(id=request_id, error=MCPError(code=-32600, message=f"Invalid Request: {exc}"))
+            results.append(error.model_dump(exclude_none=True))
+            continue
+        start = REGISTRY.request_started()
+        if _is_inline(request):
+            results.append(_finish(request, start, _timed_route(request)))
+            continue
+        requests.append((request, start))
+        results.append(len(requests) - 1)
+
+    futures = _executor.submit_batch(_timed_route, [request for request, _ in requests])
+    finished = []
+    for (request, start), future in zip(requests, futures, strict=True):
+        try:
+            response = future.result()
+        except ServerBusyError as exc:
+            response = MCPResponse(id=request.id, error=MCPError(code=SERVER_BUSY_CODE, message=str(exc)))
+        finished.append(_finish(request, start, response))
+    return [finished[r] if isinstance(r, int) else r for r in results]
+
+
+def _tracked_route(request: MCPRequest, progress: Progress | None) -> MCPResponse:
+    with track_progress(progress):
+        return _timed_route(request)
+
+
+def _progress_token(request: MCPRequest) -> Any:
+    meta = request.params.get("_meta")
+    return meta.get("progressToken") if isinstance(meta, dict) else None
+
+
+async def _sse_stream(
+    request: MCPRequest, start: float, future: Future[MCPResponse], progress: Progress | None
+) -> AsyncIterator[str]:
+    token = _progress_token(request)
+    pending = asyncio.wrap_future(future)
+    # MCP requires progress to increase with every notification
+    reported = -1
+    payload = None
+    try:
+        while True:
+            done, _ = await asyncio.wait({pending}, timeout=SSE_KEEPALIVE_SECONDS)
+            if done:
+                break
+            state = progress.state if progress is not None else None
+            if state is None or state[0] <= reported:
+                yield ": keep-alive\n\n"
+                continue
+            reported, total = state
+            params: dict[str, Any] = {"progressToken": token, "progress": reported}
+            if total is not None:
+                params["total"] = total
+            note = {"jsonrpc": "2.0", "method": "notifications/progress", "params": params}
+            yield f"event: message\ndata: {json.dumps(note)}\n\n"
+        payload = _finish(request, start, pending.result())
+    finally:
+        if payload is None:
+            # The client went away (the stream was cancelled): the handler
+            # keeps running, so record the request with its eventual result
+            future.add_done_callback(lambda f: _finish_abandoned(request, start, f))
+    yield f"event: message\ndata: {json.dumps(payload)}\n\n"
+
+
+def _finish_abandoned(request: MCPRequest, start: float, future: Future[MCPResponse]) -> None:
+    try:
+        response = future.result()
+    except Exception as exc:
+        response = MCPResponse(id=request.id, error=MCPError(code=-32603, message=str(exc)))
+    _finish(request, start, response)
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics() -> PlainTextResponse:
+    """Prometheus scrape endpoint."""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+
+def _route(request: MCPRequest) -> MCPResponse:
     try:
         # Core MCP methods
         if request.method == "initialize":
@@ -139,6 +377,18 @@ def handle_mcp(request: MCPRequest) -> MCPResponse:
         if request.method == "lightning.predict":
             return _call_handler(request, predict_handler)
 
+        if request.method == "lightning.profile":
+            return _call_handler(request, profile_handler)
+
+        if request.method == "lightning.pipeline":
+            return _call_handler(request, pipeline_handler)
+
+        if request.method == "lightning.data":
+            return _call_handler(request, data_handler)
+
+        if request.method == "lightning.stats":
+            return _call_handler(request, stats_handler)
+
         return MCPResponse(
             id=request.id,
             error=MCPError(
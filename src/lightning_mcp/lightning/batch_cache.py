@@ -0,0 +1,153 @@
+"""In-memory cache of collated evaluation batches.
+
+Repeated ``validate``/``test`` calls on the same module re-run its whole
+input pipeline (per-sample indexing, ``default_collate``) to produce the
+same batches every time. With the cache enabled
+(``lightning-mcp --batch-cache-mb N``) the first evaluation records the
+collated batches of ``val_dataloader``/``test_dataloader`` and later ones
+replay them directly, so small models become compute-bound instead of
+input-bound.
+
+Entries are keyed by stage, model config, datamodule config and seed, kept
+within a total byte budget (tensor bytes) and evicted least recently used
+first. Replayed batches are the recorded objects themselves: modules must
+not modify batches in place, and loaders that draw fresh random data on
+every call are replayed with the data of the first call.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from typing import Any, cast
+
+import torch
+from torch.utils.data import DataLoader, Dataset
+
+from lightning_mcp.metrics import REGISTRY
+from lightning_mcp.timing import phase
+
+_cache: BatchCache | None = None
+
+
+class BatchCache:
+    """Recorded batch lists, least recently used first, within ``max_bytes``."""
+
+    def __init__(self, max_bytes: int) -> None:
+        if max_bytes <= 0:
+            raise ValueError("'max_bytes' must be > 0")
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[list[Any], int]] = OrderedDict()
+        self._bytes = 0
+        # Keys whose data did not fit the budget; not recorded again
+        self._oversized: set[str] = set()
+
+    @property
+    def nbytes(self) -> int:
+        return self._bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def loader(self, key: str, make_loader: Callable[[], Iterable[Any]]) -> DataLoader[Any] | None:
+        """A loader replaying the batches recorded under ``key``.
+
+        On a miss the batches of ``make_loader()`` are recorded first.
+        Returns ``None`` when they do not fit the budget; the caller then
+        uses its regular loader.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            elif key in self._oversized:
+                return None
+        REGISTRY.inc(
+            "lightning_mcp_batch_cache_requests_total",
+            (("result", "hit" if entry is not None else "miss"),),
+        )
+        if entry is not None:
+            return replay_loader(entry[0])
+
+        with phase("record_batches"):
+            batches = self._record(make_loader())
+        if batches is None:
+            with self._lock:
+                self._oversized.add(key)
+            return None
+        self._store(key, *batches)
+        return replay_loader(batches[0])
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._oversized.clear()
+            self._bytes = 0
+
+    def _record(self, loader: Iterable[Any]) -> tuple[list[Any], int] | None:
+        batches = []
+        size = 0
+        for batch in loader:
+            size += _nbytes(batch)
+            if size > self.max_bytes:
+                return None
+            batches.append(batch)
+        return batches, size
+
+    def _store(self, key: str, batches: list[Any], size: int) -> None:
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._entries[key] = (batches, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+
+
+def configure_batch_cache(max_bytes: int | None) -> BatchCache | None:
+    """Enable the batch cache with a ``max_bytes`` budget (``None`` disables it)."""
+    global _cache
+    _cache = BatchCache(max_bytes) if max_bytes is not None else None
+    return _cache
+
+
+def get_batch_cache() -> BatchCache | None:
+    return _cache
+
+
+def data_key(params: dict[str, Any]) -> str | None:
+    """Cache key for the data of a request: its model and datamodule configs and seed.
+
+    The seed is part of the key because loaders may draw their data from
+    the global RNG (``SimpleClassifier`` does). ``None`` when the request
+    has no model config (e.g. pipeline steps, which run on a model built
+    elsewhere).
+    """
+    if not isinstance(params.get("model"), dict):
+        return None
+    return json.dumps(
+        {"model": params["model"], "datamodule": params.get("datamodule"), "seed": params.get("seed")},
+        sort_keys=True,
+        default=str,
+    )
+
+
+def replay_loader(batches: list[Any]) -> DataLoader[Any]:
+    """A DataLoader yielding the already collated ``batches`` as they are."""
+    # Any sequence is a valid map-style dataset; batch_size=None skips collation
+    return DataLoader(cast(Dataset[Any], batches), batch_size=None)
+
+
+def _nbytes(obj: Any) -> int:
+    if isinstance(obj, torch.Tensor):
+        return obj.numel() * obj.element_size()
+    if isinstance(obj, (list, tuple)):
+        return sum(_nbytes(item) for item in obj)
+    if isinstance(obj, dict):
+        return sum(_nbytes(item) for item in obj.values())
+    return 0
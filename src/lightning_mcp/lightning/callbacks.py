@@ -0,0 +1,608 @@
+"""Lightning callbacks used by :class:`LightningTrainerService`."""
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+from array import array
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+import pytorch_lightning as pl
+import torch
+from lightning_utilities.core.apply_func import apply_to_collection
+from pytorch_lightning.callbacks import Callback
+from pytorch_lightning.utilities.data import extract_batch_size
+
+from lightning_mcp.lightning.checkpoint_io import atomic_save
+from lightning_mcp.metrics import peak_resident_memory_bytes, resident_memory_bytes
+from lightning_mcp.progress import Progress, current_progress
+
+# Share of step time spent waiting on data above which a run is "input-bound"
+INPUT_BOUND_FRACTION = 0.3
+
+
+class StepTracker(Callback):
+    """Record the global step a fit started from and the step it ended at.
+
+    When resuming, ``on_train_start`` runs after the loop state has been
+    restored, so ``start_step`` reflects the checkpoint being resumed.
+    Resuming a run that is already complete skips the training loop (and
+    ``on_train_start``); the fit then starts and ends at the restored step.
+    """
+
+    def __init__(self) -> None:
+        self.start_step = 0
+        self.start_epoch = 0
+        self.end_step = 0
+        self._train_started = False
+
+    @property
+    def steps_run(self) -> int:
+        return self.end_step - self.start_step
+
+    def on_fit_start(self, trainer: pl.Trainer, pl_module: pl.LightningModule) -> None:  # noqa: ARG002
+        self._train_started = False
+
+    def on_train_start(self, trainer: pl.Trainer, pl_module: pl.LightningModule) -> None:  # noqa: ARG002
+        self._train_started = True
+        self.start_step = self.end_step = trainer.global_step
+        self.start_epoch = trainer.current_epoch
+
+    def on_train_end(self, trainer: pl.Trainer, pl_module: pl.LightningModule) -> None:  # noqa: ARG002
+        self.end_step = trainer.global_step
+
+    def on_fit_end(self, trainer: pl.Trainer, pl_module: pl.LightningModule) -> None:  # noqa: ARG002
+        if not self._train_started:
+            self.start_step = self.end_step = trainer.global_step
+            self.start_epoch = trainer.current_epoch
+
+
+class ProgressReporter(Callback):
+    """Report completed steps (fit) or batches (evaluation) to the request's progress.
+
+    A no-op unless the request is tracked (see ``lightning_mcp.progress``).
+    Validation inside fit and the sanity check are not reported separately.
+    """
+
+    def __init__(self) -> None:
+        self._progress: Progress | None = None
+        self._total: int | None = None
+        self._batches = 0
+
+    def on_train_start(self, trainer: pl.Trainer, pl_module: pl.LightningModule) -> None:  # noqa: ARG002
+        self._start(_finite(trainer.estimated_stepping_batches))
+
+    def on_train_batch_end(
+        self,
+        trainer: pl.Trainer,
+        pl_module: pl.LightningModule,  # noqa: ARG002
+        outputs: Any,  # noqa: ARG002
+        batch: Any,  # noqa: ARG002
+        batch_idx: int,  # noqa: ARG002
+    ) -> None:
+        if self._progress is not None:
+            self._progress.update(trainer.global_step, self._total)
+
+    def on_validation_start(self, trainer: pl.Trainer, pl_module: pl.LightningModule) -> None:  # noqa: ARG002
+        if trainer.state.fn == "validate":
+            self._start(_finite(sum(trainer.num_val_batches)))
+
+    def on_validation_batch_end(
+        self,
+        trainer: pl.Trainer,
+        pl_module: pl.LightningModule,  # noqa: ARG002
+        outputs: Any,  # noqa: ARG002
+        batch: Any,  # noqa: ARG002
+        batch_idx: int,  # noqa: ARG002
+        dataloader_idx: int = 0,  # noqa: ARG002
+    ) -> None:
+        if trainer.state.fn == "validate":
+            self._advance()
+
+    def on_test_start(self, trainer: pl.Trainer, pl_module: pl.LightningModule) -> None:  # noqa: ARG002
+        self._start(_finite(sum(trainer.num_test_batches)))
+
+    def on_test_batch_end(
+        self,
+        trainer: pl.Trainer,  # noqa: ARG002
+        pl_module: pl.LightningModule,  # noqa: ARG002
+        outputs: Any,  # noqa: ARG002
+        batch: Any,  # noqa: ARG002
+        batch_idx: int,  # noqa: ARG002
+        dataloader_idx: int = 0,  # noqa: ARG002
+    ) -> None:
+        self._advance()
+
+    def on_predict_start(self, trainer: pl.Trainer, pl_module: pl.LightningModule) -> None:  # noqa: ARG002
+        self._start(_finite(sum(trainer.num_predict_batches)))
+
+    def on_predict_batch_end(
+        self,
+        trainer: pl.Trainer,  # noqa: ARG002
+        pl_module: pl.LightningModule,  # noqa: ARG002
+        outputs: Any,  # noqa: ARG002
+        batch: Any,  # noqa: ARG002
+        batch_idx: int,  # noqa: ARG002
+        dataloader_idx: int = 0,  # noqa: ARG002
+    ) -> None:
+        self._advance()
+
+    def _start(self, total: int | None) -> None:
+        self._progress = current_progress()
+        self._total = total
+        self._batches = 0
+
+    def _advance(self) -> None:
+        if self._progress is not None:
+            self._batches += 1
+            self._progress.update(self._batches, self._total)
+
+
+def _finite(value: float) -> int | None:
+    return int(value) if math.isfinite(value) else None
+
+
+class _StageRecord:
+    """Per-batch timings of one train/validate/test run, in seconds.
+
+    Samples live in ``array('d')`` buffers: 8 bytes per value and no
+    per-sample Python objects, so long runs stay cheap to record.
+    """
+
+    def __init__(self, phases: tuple[str, ...]) -> None:
+        self.phases = {name: array("d") for name in phases}
+        self.step = array("d")
+        self.epochs: list[dict[str, Any]] = []
+        self.samples = 0
+        self.started = self.last_end = self.epoch_start = time.perf_counter()
+        self.epoch_samples = 0
+        self.batch_start = 0.0
+        self.wall = 0.0
+
+    def start_epoch(self) -> None:
+        self.last_end = self.epoch_start = time.perf_counter()
+        self.epoch_samples = 0
+
+    def end_epoch(self, epoch: int) -> None:
+        seconds = time.perf_counter() - self.epoch_start
+        self.epochs.append({
+            "epoch": epoch,
+            "samples": self.epoch_samples,
+            "seconds": round(seconds, 6),
+            "samples_per_sec": round(self.epoch_samples / seconds, 3) if seconds > 0 else 0.0,
+        })
+
+    def start_batch(self) -> None:
+        self.batch_start = time.perf_counter()
+        self.phases["data_wait"].append(self.batch_start - self.last_end)
+
+    def end_batch(self, batch: Any) -> float:
+        now = time.perf_counter()
+        self.step.append(now - self.last_end)
+        n = _batch_size(batch)
+        self.samples += n
+        self.epoch_samples += n
+        self.last_end = now
+        return now
+
+
+class PerformanceMonitor(Callback):
+    """Step-time, throughput and data-stall accounting for every run.
+
+    Each training batch is split into time waiting on the dataloader (from
+    the previous batch's end to this batch's start), ``forward`` (up to
+    ``on_before_backward``), ``backward`` and ``optimizer`` (from
+    ``on_after_backward`` to batch end, including the step and zeroing
+    gradients). Validate/test batches are split into data wait and forward.
+    Register it after other callbacks: hooks of callbacks before it count
+    towards the phase that follows them.
+
+    ``summary(stage)`` reports step-time percentiles, per-epoch samples/sec,
+    the breakdown above and whether the run looks input-bound.
+    """
+
+    _TRAIN_PHASES = ("data_wait", "forward", "backward", "optimizer")
+    _EVAL_PHASES = ("data_wait", "forward")
+
+    def __init__(self) -> None:
+        self._stages: dict[str, _StageRecord] = {}
+        self._before_backward: float | None = None
+        self._after_backward: float | None = None
+
+    def summary(self, stage: str) -> dict[str, Any] | None:
+        """Compact, JSON-serializable report for ``fit``, ``validate`` or ``test``."""
+        record = self._stages.get(stage)
+        if record is None:
+            return None
+
+        totals = {name: sum(values) for name, values in record.phases.items()}
+        busy = sum(totals.values())
+        data_wait_fraction = totals["data_wait"] / busy if busy > 0 else 0.0
+        return {
+            "steps": len(record.step),
+            "samples": record.samples,
+            "seconds": round(record.wall, 6),
+            "samples_per_sec": round(record.samples / record.wall, 3) if record.wall > 0 else 0.0,
+            "step_ms": _distribution_ms(record.step),
+            "time_ms": {name: round(total * 1000.0, 3) for name, total in totals.items()},
+            "data_wait_fraction": round(data_wait_fraction, 4),
+            "bound": "input" if data_wait_fraction >= INPUT_BOUND_FRACTION else "compute",
+            "epochs": record.epochs,
+            "rss_bytes": resident_memory_bytes(),
+            "peak_rss_bytes": peak_resident_memory_bytes(),
+        }
+
+    # -- training ------------------------------------------------------------
+
+    def on_train_start(self, trainer: pl.Trainer, pl_module: pl.LightningModule) -> None:  # noqa: ARG002
+        self._stages["fit"] = _StageRecord(self._TRAIN_PHASES)
+
+    def on_train_epoch_start(self, trainer: pl.Trainer, pl_module: pl.LightningModule) -> None:  # noqa: ARG002
+        self._stages["fit"].start_epoch()
+
+    def on_train_batch_start(
+        self,
+        trainer: pl.Trainer,  # noqa: ARG002
+        pl_module: pl.LightningModule,  # noqa: ARG002
+        batch: Any,  # noqa: ARG002
+        batch_idx: int,  # noqa: ARG002
+    ) -> None:
+        self._before_backward = self._after_backward = None
+        self._stages["fit"].start_batch()
+
+    def on_before_backward(
+        self,
+        trainer: pl.Trainer,  # noqa: ARG002
+        pl_module: pl.LightningModule,  # noqa: ARG002
+        loss: torch.Tensor,  # noqa: ARG002
+    ) -> None:
+        self._before_backward = time.perf_counter()
+
+    def on_after_backward(self, trainer: pl.Trainer, pl_module: pl.LightningModule) -> None:  # noqa: ARG002
+        self._after_backward = time.perf_counter()
+
+    def on_train_batch_end(
+        self,
+        trainer: pl.Trainer,  # noqa: ARG002
+        pl_module: pl.LightningModule,  # noqa: ARG002
+        outputs: Any,  # noqa: ARG002
+        batch: Any,
+        batch_idx: int,  # noqa: ARG002
+    ) -> None:
+        record = self._stages["fit"]
+        now = record.end_batch(batch)
+        forward_end = self._before_backward if self._before_backward is not None else now
+        backward_end = self._after_backward if self._after_backward is not None else forward_end
+        record.phases["forward"].append(forward_end - record.batch_start)
+        record.phases["backward"].append(backward_end - forward_end)
+        record.phases["optimizer"].append(now - backward_end)
+
+    def on_train_epoch_end(self, trainer: pl.Trainer, pl_module: pl.LightningModule) -> None:  # noqa: ARG002
+        self._stages["fit"].end_epoch(trainer.current_epoch)
+
+    def on_train_end(self, trainer: pl.Trainer, pl_module: pl.LightningModule) -> None:  # noqa: ARG002
+        record = self._stages["fit"]
+        record.wall = time.perf_counter() - record.started
+
+    # -- evaluation ----------------------------------------------------------
+
+    def on_validation_start(self, trainer: pl.Trainer, pl_module: pl.LightningModule) -> None:  # noqa: ARG002
+        self._eval_start(trainer, "validate")
+
+    def on_validation_batch_start(
+        self,
+        trainer: pl.Trainer,
+        pl_module: pl.LightningModule,  # noqa: ARG002
+        batch: Any,  # noqa: ARG002
+        batch_idx: int,  # noqa: ARG002
+        dataloader_idx: int = 0,  # noqa: ARG002
+    ) -> None:
+        self._eval_batch_start(trainer, "validate")
+
+    def on_validation_batch_end(
+        self,
+        trainer: pl.Trainer,
+        pl_module: pl.LightningModule,  # noqa: ARG002
+        outputs: Any,  # noqa: ARG002
+        batch: Any,
+        batch_idx: int,  # noqa: ARG002
+        dataloader_idx: int = 0,  # noqa: ARG002
+    ) -> None:
+        self._eval_batch_end(trainer, "validate", batch)
+
+    def on_validation_end(self, trainer: pl.Trainer, pl_module: pl.LightningModule) -> None:  # noqa: ARG002
+        if trainer.state.fn == "fit" and "fit" in self._stages:
+            # Validation inside fit is not time spent waiting for train data
+            self._stages["fit"].last_end = time.perf_counter()
+        self._eval_end(trainer, "validate")
+
+    def on_test_start(self, trainer: pl.Trainer, pl_module: pl.LightningModule) -> None:  # noqa: ARG002
+        self._eval_start(trainer, "test")
+
+    def on_test_batch_start(
+        self,
+        trainer: pl.Trainer,
+        pl_module: pl.LightningModule,  # noqa: ARG002
+        batch: Any,  # noqa: ARG002
+        batch_idx: int,  # noqa: ARG002
+        dataloader_idx: int = 0,  # noqa: ARG002
+    ) -> None:
+        self._eval_batch_start(trainer, "test")
+
+    def on_test_batch_end(
+        self,
+        trainer: pl.Trainer,
+        pl_module: pl.LightningModule,  # noqa: ARG002
+        outputs: Any,  # noqa: ARG002
+        batch: Any,
+        batch_idx: int,  # noqa: ARG002
+        dataloader_idx: int = 0,  # noqa: ARG002
+    ) -> None:
+        self._eval_batch_end(trainer, "test", batch)
+
+    def on_test_end(self, trainer: pl.Trainer, pl_module: pl.LightningModule) -> None:  # noqa: ARG002
+        self._eval_end(trainer, "test")
+
+    # Only standalone validate/test runs are recorded; validation during fit
+    # and the sanity check are skipped.
+
+    def _eval_start(self, trainer: pl.Trainer, stage: str) -> None:
+        if trainer.state.fn == stage:
+            self._stages[stage] = _StageRecord(self._EVAL_PHASES)
+
+    def _eval_batch_start(self, trainer: pl.Trainer, stage: str) -> None:
+        if trainer.state.fn == stage:
+            self._stages[stage].start_batch()
+
+    def _eval_batch_end(self, trainer: pl.Trainer, stage: str, batch: Any) -> None:
+        if trainer.state.fn == stage:
+            record = self._stages[stage]
+            now = record.end_batch(batch)
+            record.phases["forward"].append(now - record.batch_start)
+
+    def _eval_end(self, trainer: pl.Trainer, stage: str) -> None:
+        if trainer.state.fn == stage:
+            record = self._stages[stage]
+            record.end_epoch(0)
+            record.wall = time.perf_counter() - record.started
+
+
+class AsyncCheckpoint(Callback):
+    """Periodic checkpointing that keeps file I/O off the training thread.
+
+    On each trigger the full Lightning checkpoint (weights, optimizer,
+    scheduler and loop state) is snapshotted to host memory -- pinned
+    memory for accelerator tensors -- and handed to a single background
+    writer thread. The writer serializes, fsyncs and atomically renames the
+    file into place. At most ``max_in_flight`` snapshots are held at once;
+    when that bound is reached the training thread waits for the oldest
+    write to finish.
+
+    The wall time the training thread spends inside each save (waiting for
+    a free slot plus taking the snapshot) is recorded in ``saves`` as
+    ``blocked_ms``, next to the background ``write_ms``. Host buffers
+    (pinned for accelerator tensors) are returned to a pool once their
+    snapshot is written and reused by later saves.
+    """
+
+    def __init__(
+        self,
+        dirpath: str,
+        every_n_train_steps: int | None = None,
+        every_n_epochs: int | None = None,
+        max_in_flight: int = 2,
+        filename: str = "epoch={epoch}-step={step}.ckpt",
+    ) -> None:
+        if every_n_train_steps is None and every_n_epochs is None:
+            every_n_epochs = 1
+        if every_n_train_steps is not None and every_n_train_steps < 1:
+            raise ValueError("'every_n_train_steps' must be >= 1")
+        if every_n_epochs is not None and every_n_epochs < 1:
+            raise ValueError("'every_n_epochs' must be >= 1")
+        if max_in_flight < 1:
+            raise ValueError("'max_in_flight' must be >= 1")
+
+        self.dirpath = Path(dirpath)
+        self.every_n_train_steps = every_n_train_steps
+        self.every_n_epochs = every_n_epochs
+        self.max_in_flight = max_in_flight
+        self.filename = filename
+
+        self.saves: list[dict[str, Any]] = []
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._executor: ThreadPoolExecutor | None = None
+        self._pending: list[Future[None]] = []
+        self._error: BaseException | None = None
+        self._last_step = -1
+        self._buffers = _HostBufferPool()
+
+    def setup(self, trainer: pl.Trainer, pl_module: pl.LightningModule, stage: str) -> None:  # noqa: ARG002
+        if stage == "fit" and self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="lightning-mcp-ckpt"
+            )
+
+    def on_train_batch_end(
+        self,
+        trainer: pl.Trainer,
+        pl_module: pl.LightningModule,  # noqa: ARG002
+        outputs: Any,  # noqa: ARG002
+        batch: Any,  # noqa: ARG002
+        batch_idx: int,  # noqa: ARG002
+    ) -> None:
+        n = self.every_n_train_steps
+        if n is not None and trainer.global_step > 0 and trainer.global_step % n == 0:
+            self._save(trainer)
+
+    def on_train_epoch_end(self, trainer: pl.Trainer, pl_module: pl.LightningModule) -> None:  # noqa: ARG002
+        n = self.every_n_epochs
+        if n is not None and (trainer.current_epoch + 1) % n == 0:
+            self._save(trainer)
+
+    def on_train_end(self, trainer: pl.Trainer, pl_module: pl.LightningModule) -> None:  # noqa: ARG002
+        self.wait()
+
+    def teardown(self, trainer: pl.Trainer, pl_module: pl.LightningModule, stage: str) -> None:  # noqa: ARG002
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def wait(self) -> None:
+        """Block until every queued write is durable, re-raising write errors."""
+        for future in self._pending:
+            future.result()
+        self._pending.clear()
+        self._raise_pending_error()
+
+    def summary(self) -> dict[str, Any]:
+        """Compact, JSON-serializable report of the saves performed."""
+        blocked = sorted(s["blocked_ms"] for s in self.saves)
+        return {
+            "dirpath": str(self.dirpath),
+            "num_saves": len(self.saves),
+            "max_in_flight": self.max_in_flight,
+            "blocked_ms_max": blocked[-1] if blocked else 0.0,
+            "blocked_ms_median": blocked[len(blocked) // 2] if blocked else 0.0,
+            "saves": list(self.saves),
+        }
+
+    def _save(self, trainer: pl.Trainer) -> None:
+        # Epoch-end and step triggers can coincide on the same global step
+        if trainer.global_step == self._last_step or self._executor is None:
+            return
+        self._last_step = trainer.global_step
+        self._raise_pending_error()
+
+        start = time.perf_counter()
+        self._slots.acquire()
+        try:
+            checkpoint = trainer._checkpoint_connector.dump_checkpoint(weights_only=False)
+            snapshot, buffers, ready = _snapshot_to_host(checkpoint, self._buffers)
+        except BaseException:
+            self._slots.release()
+            raise
+        blocked_ms = (time.perf_counter() - start) * 1000.0
+
+        path = self.dirpath / self.filename.format(
+            epoch=trainer.current_epoch, step=trainer.global_step
+        )
+        record: dict[str, Any] = {
+            "path": str(path),
+            "epoch": trainer.current_epoch,
+            "step": trainer.global_step,
+            "blocked_ms": round(blocked_ms, 3),
+        }
+        self._pending = [f for f in self._pending if not f.done()]
+        self._pending.append(
+            self._executor.submit(self._write, snapshot, buffers, ready, path, record)
+        )
+
+    def _write(
+        self,
+        snapshot: dict[str, Any],
+        buffers: list[torch.Tensor],
+        ready: torch.cuda.Event | None,
+        path: Path,
+        record: dict[str, Any],
+    ) -> None:
+        try:
+            start = time.perf_counter()
+            if ready is not None:
+                ready.synchronize()
+            record["size_bytes"] = atomic_save(snapshot, path)
+            record["write_ms"] = round((time.perf_counter() - start) * 1000.0, 3)
+            self.saves.append(record)
+        except BaseException as exc:
+            self._error = exc
+        finally:
+            self._buffers.give(buffers)
+            self._slots.release()
+
+    def _raise_pending_error(self) -> None:
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise RuntimeError(f"Asynchronous checkpoint write failed: {error}") from error
+
+
+def _batch_size(batch: Any) -> int:
+    """Number of samples in ``batch``, or 0 if it has no recognizable tensor."""
+    try:
+        return extract_batch_size(batch)
+    except Exception:
+        return 0
+
+
+def _distribution_ms(values: array[float]) -> dict[str, float]:
+    """Nearest-rank percentiles of ``values`` (seconds), in milliseconds."""
+    if not values:
+        return {"p50": 0.0, "p90": 0.0, "p99": 0.0, "max": 0.0, "mean": 0.0}
+    ordered = sorted(values)
+    n = len(ordered)
+
+    def _pct(q: float) -> float:
+        return round(ordered[min(n - 1, int(q * n))] * 1000.0, 3)
+
+    return {
+        "p50": _pct(0.50),
+        "p90": _pct(0.90),
+        "p99": _pct(0.99),
+        "max": round(ordered[-1] * 1000.0, 3),
+        "mean": round(sum(ordered) / n * 1000.0, 3),
+    }
+
+
+class _HostBufferPool:
+    """Host tensors reused across snapshots, by shape, dtype and pinning."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._free: dict[tuple[tuple[int, ...], torch.dtype, bool], list[torch.Tensor]] = {}
+
+    def take(self, t: torch.Tensor, pinned: bool) -> torch.Tensor:
+        key = (tuple(t.shape), t.dtype, pinned)
+        with self._lock:
+            free = self._free.get(key)
+            if free:
+                return free.pop()
+        return torch.empty(t.shape, dtype=t.dtype, pin_memory=pinned)
+
+    def give(self, buffers: list[torch.Tensor]) -> None:
+        with self._lock:
+            for buf in buffers:
+                self._free.setdefault((tuple(buf.shape), buf.dtype, buf.is_pinned()), []).append(buf)
+
+
+def _snapshot_to_host(
+    checkpoint: dict[str, Any], pool: _HostBufferPool
+) -> tuple[dict[str, Any], list[torch.Tensor], torch.cuda.Event | None]:
+    """Copy every tensor in ``checkpoint`` into host buffers from ``pool``.
+
+    CPU tensors are copied, since the optimizer keeps updating them in place.
+    Accelerator tensors are copied asynchronously into pinned buffers; the
+    returned CUDA event marks when those copies have landed. The buffers
+    used are returned so they can go back to the pool after the write.
+    """
+    uses_cuda = False
+    buffers: list[torch.Tensor] = []
+
+    def _to_host(t: torch.Tensor) -> torch.Tensor:
+        nonlocal uses_cuda
+        t = t.detach()
+        if t.device.type not in ("cpu", "cuda"):
+            return t.to("cpu")
+        pinned = t.device.type == "cuda"
+        uses_cuda = uses_cuda or pinned
+        buf = pool.take(t, pinned)
+        buf.copy_(t, non_blocking=pinned)
+        buffers.append(buf)
+        return buf
+
+    snapshot = apply_to_collection(checkpoint, torch.Tensor, _to_host)
+    ready = None
+    if uses_cuda:
+        ready = torch.cuda.Event()
+        ready.record()
+    return snapshot, buffers, ready
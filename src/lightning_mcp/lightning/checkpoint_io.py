@@ -0,0 +1,363 @@
+"""Checkpoint file I/O helpers.
+
+Low-level routines shared by the checkpoint handler and the training
+callbacks. Nothing in here touches MCP request/response types.
+
+Compressed checkpoints use a small chunked container so that both
+compression and decompression can run on several threads::
+
+    MAGIC (8 bytes) | header length (uint32 LE) | JSON header | chunk 0 | chunk 1 | ...
+
+The header records the codec, the size of the uncompressed ``torch.save``
+payload and the compressed length of every chunk. Each chunk is an
+independent frame, so chunks are decoded in parallel straight into one
+preallocated buffer that ``torch.load`` then reads from.
+"""
+
+from __future__ import annotations
+
+import io
+import itertools
+import json
+import os
+import struct
+import threading
+from collections.abc import Callable, Collection
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import IO, Any, cast
+
+import torch
+
+COMPRESSION_CODECS = ("zstd", "lz4", "zlib")
+
+_MAGIC = b"LMCPCKZ1"
+_HEADER_LEN = struct.Struct("<I")
+_CHUNK_SIZE = 4 * 1024 * 1024
+
+
+def atomic_save(
+    obj: Any,
+    path: str | os.PathLike[str],
+    compression: str | None = None,
+    level: int | None = None,
+) -> int:
+    """Serialize ``obj`` with ``torch.save`` and publish it atomically.
+
+    The payload is written to a temporary file next to ``path``, fsynced,
+    and renamed over the destination, so readers never observe a partially
+    written checkpoint. With ``compression`` set, the payload is written in
+    the chunked compressed container described in the module docstring.
+
+    Returns:
+        Size of the published file in bytes.
+    """
+    if compression is None:
+        return _atomic_write(path, lambda f: torch.save(obj, f))
+
+    codec = _get_codec(compression, level)
+    buffer = io.BytesIO()
+    torch.save(obj, buffer)
+    payload = buffer.getbuffer()
+
+    chunks = [payload[i : i + _CHUNK_SIZE] for i in range(0, len(payload), _CHUNK_SIZE)]
+    with ThreadPoolExecutor(max_workers=_num_threads(len(chunks))) as pool:
+        frames = list(pool.map(codec.compress, chunks))
+
+    header = json.dumps({
+        "codec": compression,
+        "raw_size": len(payload),
+        "chunk_size": _CHUNK_SIZE,
+        "chunks": [len(frame) for frame in frames],
+    }).encode()
+
+    def _write(f: IO[bytes]) -> None:
+        f.write(_MAGIC)
+        f.write(_HEADER_LEN.pack(len(header)))
+        f.write(header)
+        for frame in frames:
+            f.write(frame)
+
+    return _atomic_write(path, _write)
+
+
+def load_checkpoint(path: str | os.PathLike[str], mmap: bool = False) -> Any:
+    """Load a checkpoint written by :func:`atomic_save` or plain ``torch.save``.
+
+    Compressed containers are detected by their magic bytes and decoded
+    transparently. Loading always uses ``weights_only=True``.
+
+    With ``mmap=True`` uncompressed checkpoints are memory-mapped: tensor
+    data is only paged in when accessed, so walking a large checkpoint one
+    tensor at a time does not hold it all in memory. Compressed containers
+    cannot be mapped and are decoded in full.
+    """
+    header = read_compression_header(path)
+    if header is None:
+        return torch.load(path, map_location="cpu", weights_only=True, mmap=mmap)
+
+    codec = _get_codec(header["codec"])
+    raw = bytearray(header["raw_size"])
+    view = memoryview(raw)
+    offsets = _chunk_offsets(header)
+
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        def _decode(i: int) -> None:
+            src_offset, src_len, dst_offset, dst_len = offsets[i]
+            frame = os.pread(fd, src_len, src_offset)
+            codec.decompress_into(frame, view[dst_offset : dst_offset + dst_len])
+
+        with ThreadPoolExecutor(max_workers=_num_threads(len(offsets))) as pool:
+            list(pool.map(_decode, range(len(offsets))))
+    finally:
+        os.close(fd)
+
+    return torch.load(cast(IO[bytes], _BufferReader(view)), map_location="cpu", weights_only=True)
+
+
+def read_compression_header(path: str | os.PathLike[str]) -> dict[str, Any] | None:
+    """Return the container header of a compressed checkpoint, else ``None``.
+
+    Only the first few bytes of the file are read, so this is cheap enough
+    to call on every file in a directory listing.
+    """
+    with open(path, "rb") as f:
+        if f.read(len(_MAGIC)) != _MAGIC:
+            return None
+        (header_len,) = _HEADER_LEN.unpack(f.read(_HEADER_LEN.size))
+        header: dict[str, Any] = json.loads(f.read(header_len))
+    header["data_offset"] = len(_MAGIC) + _HEADER_LEN.size + header_len
+    return header
+
+
+def cast_state_dict(
+    state_dict: dict[str, torch.Tensor],
+    dtype: torch.dtype,
+    keep: Collection[str] = (),
+) -> tuple[dict[str, torch.Tensor], dict[str, Any]]:
+    """Cast fp32 tensors of ``state_dict`` to ``dtype`` for export.
+
+    Tensors named in ``keep`` and tensors that are not fp32 (integer
+    buffers, counters) are left untouched. Loading the result into an fp32
+    model upcasts on the fly, since ``load_state_dict`` copies into the
+    existing parameters.
+
+    Returns:
+        The cast state dict and stats: ``bytes_before``, ``bytes_after``,
+        ``max_abs_deviation`` and the ``kept`` tensor names.
+    """
+    cast: dict[str, torch.Tensor] = {}
+    bytes_before = bytes_after = 0
+    max_dev = 0.0
+    kept = []
+
+    for name, tensor in state_dict.items():
+        nbytes = tensor.numel() * tensor.element_size()
+        bytes_before += nbytes
+        if tensor.dtype != torch.float32 or name in keep:
+            if tensor.dtype == torch.float32:
+                kept.append(name)
+            cast[name] = tensor
+            bytes_after += nbytes
+            continue
+
+        low = tensor.detach().to(dtype)
+        if tensor.numel():
+            max_dev = max(max_dev, (low.float() - tensor).abs().max().item())
+        cast[name] = low
+        bytes_after += low.numel() * low.element_size()
+
+    return cast, {
+        "bytes_before": bytes_before,
+        "bytes_after": bytes_after,
+        "max_abs_deviation": max_dev,
+        "kept": kept,
+    }
+
+
+def extract_state_dict(obj: Any) -> dict[str, torch.Tensor]:
+    """Return the model state dict from a loaded checkpoint object."""
+    if not isinstance(obj, dict):
+        raise ValueError("Checkpoint does not contain a state dict")
+    if is_lightning_checkpoint(obj):
+        return obj["state_dict"]  # type: ignore[no-any-return]
+    return obj
+
+
+def is_lightning_checkpoint(obj: Any) -> bool:
+    """Whether ``obj`` is a full Lightning checkpoint rather than a state dict."""
+    return isinstance(obj, dict) and "pytorch-lightning_version" in obj
+
+
+_tmp_counter = itertools.count()
+
+
+def _atomic_write(path: str | os.PathLike[str], write: Callable[[IO[bytes]], None]) -> int:
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    # Unique per write: concurrent saves in one process must not share a file
+    tmp = target.with_name(
+        f".{target.name}.tmp-{os.getpid()}-{threading.get_ident()}-{next(_tmp_counter)}"
+    )
+
+    try:
+        with open(tmp, "wb") as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, target)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+    _fsync_dir(target.parent)
+    return target.stat().st_size
+
+
+def _fsync_dir(directory: Path) -> None:
+    """Persist a rename by fsyncing the containing directory (POSIX only)."""
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _chunk_offsets(header: dict[str, Any]) -> list[tuple[int, int, int, int]]:
+    """(src offset, src len, dst offset, dst len) for every chunk."""
+    offsets = []
+    src = header["data_offset"]
+    raw_size, chunk_size = header["raw_size"], header["chunk_size"]
+    for i, length in enumerate(header["chunks"]):
+        dst = i * chunk_size
+        offsets.append((src, length, dst, min(chunk_size, raw_size - dst)))
+        src += length
+    return offsets
+
+
+def _num_threads(num_chunks: int) -> int:
+    return max(1, min(num_chunks, os.cpu_count() or 1))
+
+
+class _Codec:
+    """Per-chunk compress / decompress-into-buffer for one codec."""
+
+    def __init__(
+        self,
+        compress: Callable[[memoryview], bytes],
+        decompress: Callable[[bytes, int], bytes],
+        decompress_into: Callable[[bytes, memoryview], None] | None = None,
+    ) -> None:
+        self.compress = compress
+        self._decompress = decompress
+        self._decompress_into = decompress_into
+
+    def decompress_into(self, frame: bytes, out: memoryview) -> None:
+        if self._decompress_into is not None:
+            self._decompress_into(frame, out)
+            return
+        data = self._decompress(frame, len(out))
+        if len(data) != len(out):
+            raise ValueError("Corrupt compressed checkpoint: chunk size mismatch")
+        out[:] = data
+
+
+def _get_codec(name: str, level: int | None = None) -> _Codec:
+    """Build the codec ``name``, importing its optional dependency lazily."""
+    if name == "zlib":
+        import zlib
+
+        zlib_level = 6 if level is None else level
+        return _Codec(
+            compress=lambda chunk: zlib.compress(chunk, zlib_level),
+            decompress=lambda frame, size: zlib.decompress(frame, bufsize=size),
+        )
+
+    if name == "zstd":
+        try:
+            import zstandard
+        except ImportError as exc:
+            raise ImportError(
+                "zstd compression requires the 'zstandard' package "
+                "(pip install 'lightning-mcp[compression]')"
+            ) from exc
+
+        zstd_level = 3 if level is None else level
+
+        def _zstd_decompress_into(frame: bytes, out: memoryview) -> None:
+            reader = zstandard.ZstdDecompressor().stream_reader(frame)
+            filled = 0
+            while filled < len(out):
+                n = reader.readinto(out[filled:])
+                if n == 0:
+                    raise ValueError("Corrupt compressed checkpoint: truncated zstd frame")
+                filled += n
+
+        # Compressor/decompressor objects are not thread-safe, so make one per call
+        return _Codec(
+            compress=lambda chunk: zstandard.ZstdCompressor(level=zstd_level).compress(chunk),
+            decompress=lambda frame, size: zstandard.ZstdDecompressor().decompress(
+                frame, max_output_size=size
+            ),
+            decompress_into=_zstd_decompress_into,
+        )
+
+    if name == "lz4":
+        try:
+            import lz4.frame
+        except ImportError as exc:
+            raise ImportError(
+                "lz4 compression requires the 'lz4' package "
+                "(pip install 'lightning-mcp[compression]')"
+            ) from exc
+
+        lz4_level = 0 if level is None else level
+        return _Codec(
+            compress=lambda chunk: lz4.frame.compress(chunk, compression_level=lz4_level),
+            decompress=lambda frame, _size: lz4.frame.decompress(frame),
+        )
+
+    raise ValueError(
+        f"Unknown compression codec '{name}' (expected one of {', '.join(COMPRESSION_CODECS)})"
+    )
+
+
+class _BufferReader(io.RawIOBase):
+    """Seekable file object over an in-memory buffer for ``torch.load``.
+
+    The buffer is not copied up front; each ``readinto`` copies only the
+    requested range into the caller's buffer.
+    """
+
+    def __init__(self, view: memoryview) -> None:
+        self._view = view
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, b: Any) -> int:
+        n = max(0, min(len(b), len(self._view) - self._pos))
+        b[:n] = self._view[self._pos : self._pos + n]
+        self._pos += n
+        return n
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            self._pos = offset
+        elif whence == io.SEEK_CUR:
+            self._pos += offset
+        elif whence == io.SEEK_END:
+            self._pos = len(self._view) + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+        return self._pos
+
+    def tell(self) -> int:
+        return self._pos
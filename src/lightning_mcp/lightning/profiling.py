@@ -0,0 +1,149 @@
+"""``torch.profiler`` integration for bounded training/prediction runs."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+import pytorch_lightning as pl
+import torch
+from pytorch_lightning.callbacks import Callback
+from torch.profiler import ProfilerActivity, profile, schedule
+
+# Columns the op table can be sorted by
+SORT_KEYS = (
+    "self_cpu_time_total",
+    "cpu_time_total",
+    "self_device_time_total",
+    "self_cpu_memory_usage",
+    "count",
+)
+
+
+class StepProfiler(Callback):
+    """Run ``torch.profiler`` over train or predict batches.
+
+    The profiler follows a ``wait``/``warmup``/``active`` schedule, advanced
+    once per batch, and runs a single cycle. When the cycle completes (or
+    the run ends early) the aggregated op statistics are kept in ``events``
+    and, if ``trace_path`` is set, a Chrome trace is written there.
+    """
+
+    def __init__(
+        self,
+        wait: int = 1,
+        warmup: int = 1,
+        active: int = 3,
+        record_shapes: bool = True,
+        profile_memory: bool = True,
+        trace_path: str | None = None,
+    ) -> None:
+        self.wait = wait
+        self.warmup = warmup
+        self.active = active
+        self.record_shapes = record_shapes
+        self.profile_memory = profile_memory
+        self.trace_path = trace_path
+
+        self.steps = 0
+        self.events: Any = None
+        self._profiler: profile | None = None
+
+    @property
+    def total_steps(self) -> int:
+        """Batches needed for one full wait/warmup/active cycle."""
+        return self.wait + self.warmup + self.active
+
+    def on_train_start(self, trainer: pl.Trainer, pl_module: pl.LightningModule) -> None:  # noqa: ARG002
+        self._start()
+
+    def on_train_batch_end(
+        self,
+        trainer: pl.Trainer,  # noqa: ARG002
+        pl_module: pl.LightningModule,  # noqa: ARG002
+        outputs: Any,  # noqa: ARG002
+        batch: Any,  # noqa: ARG002
+        batch_idx: int,  # noqa: ARG002
+    ) -> None:
+        self._step()
+
+    def on_train_end(self, trainer: pl.Trainer, pl_module: pl.LightningModule) -> None:  # noqa: ARG002
+        self._stop()
+
+    def on_predict_start(self, trainer: pl.Trainer, pl_module: pl.LightningModule) -> None:  # noqa: ARG002
+        self._start()
+
+    def on_predict_batch_end(
+        self,
+        trainer: pl.Trainer,  # noqa: ARG002
+        pl_module: pl.LightningModule,  # noqa: ARG002
+        outputs: Any,  # noqa: ARG002
+        batch: Any,  # noqa: ARG002
+        batch_idx: int,  # noqa: ARG002
+        dataloader_idx: int = 0,  # noqa: ARG002
+    ) -> None:
+        self._step()
+
+    def on_predict_end(self, trainer: pl.Trainer, pl_module: pl.LightningModule) -> None:  # noqa: ARG002
+        self._stop()
+
+    def op_table(self, top_n: int = 20, sort_by: str = "self_cpu_time_total") -> list[dict[str, Any]]:
+        """The ``top_n`` ops by ``sort_by`` as JSON-serializable rows.
+
+        Times are in milliseconds, memory in bytes. With ``record_shapes``
+        the same op called with different input shapes gets separate rows.
+        """
+        if sort_by not in SORT_KEYS:
+            raise ValueError(f"Unknown sort key '{sort_by}' (expected one of {', '.join(SORT_KEYS)})")
+        if self.events is None:
+            return []
+
+        def _key(evt: Any) -> float:
+            return float(getattr(evt, sort_by, 0) or 0)
+
+        rows = []
+        for evt in sorted(self.events, key=_key, reverse=True)[:top_n]:
+            row: dict[str, Any] = {
+                "name": evt.key,
+                "calls": evt.count,
+                "self_cpu_time_ms": round(evt.self_cpu_time_total / 1000.0, 3),
+                "cpu_time_ms": round(evt.cpu_time_total / 1000.0, 3),
+                "self_cpu_memory_bytes": int(evt.self_cpu_memory_usage),
+            }
+            device_time = getattr(evt, "self_device_time_total", 0)
+            if device_time:
+                row["self_device_time_ms"] = round(device_time / 1000.0, 3)
+            if self.record_shapes:
+                row["input_shapes"] = [list(shape) for shape in (evt.input_shapes or [])]
+            rows.append(row)
+        return rows
+
+    def _start(self) -> None:
+        activities = [ProfilerActivity.CPU]
+        if torch.cuda.is_available():
+            activities.append(ProfilerActivity.CUDA)
+        self.steps = 0
+        self._profiler = profile(
+            activities=activities,
+            schedule=schedule(wait=self.wait, warmup=self.warmup, active=self.active, repeat=1),
+            on_trace_ready=self._on_trace_ready,
+            record_shapes=self.record_shapes,
+            profile_memory=self.profile_memory,
+        )
+        self._profiler.start()
+
+    def _step(self) -> None:
+        if self._profiler is not None:
+            self.steps += 1
+            self._profiler.step()
+
+    def _stop(self) -> None:
+        if self._profiler is not None:
+            self._profiler.stop()
+            self._profiler = None
+
+    def _on_trace_ready(self, prof: profile) -> None:
+        self.events = prof.key_averages(group_by_input_shape=self.record_shapes)
+        if self.trace_path is not None:
+            Path(self.trace_path).parent.mkdir(parents=True, exist_ok=True)
+            prof.export_chrome_trace(self.trace_path)
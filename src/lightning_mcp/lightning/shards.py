@@ -0,0 +1,523 @@
+"""Memory-mapped sharded datasets for data larger than RAM.
+
+A dataset is a directory of shards plus an ``index.json``::
+
+    {"format": "lightning-mcp-shards", "version": 1, "rows": 100000,
+     "fields": {"x": {"dtype": "<f4", "shape": [32]},
+                "y": {"dtype": "<i8", "shape": []}},
+     "shards": [{"rows": 65536, "files": {"x": "00000.x.npy", "y": "00000.y.npy"}}, ...]}
+
+Each field of a shard is one file with the shard's rows: ``.npy``, or raw
+binary (any other extension) read with the dtype and shape from the index.
+Files are opened with ``np.memmap`` and batches are ``torch.from_numpy``
+views of them, so in-order batches are never copied or parsed; the page
+cache does the I/O. :class:`ShardedBatchLoader` reads upcoming shards on
+background threads while the current one is consumed, so an epoch is
+bounded by disk bandwidth. :func:`ingest` converts CSV or ``.npz`` files
+into this format, one shard in memory at a time.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import csv
+import json
+import math
+import os
+import shutil
+import zipfile
+from collections import deque
+from collections.abc import Iterator, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import ExitStack
+from typing import IO, Any, cast
+
+import pytorch_lightning as pl
+import torch
+import torch.distributed as dist
+
+try:
+    import numpy as np
+except ImportError as exc:
+    raise ImportError(
+        "Sharded datasets require the 'numpy' package (pip install 'lightning-mcp[data]')"
+    ) from exc
+
+FORMAT = "lightning-mcp-shards"
+INDEX_FILE = "index.json"
+
+# Read size of the prefetch threads
+_PREFETCH_CHUNK = 4 * 1024 * 1024
+
+
+class ShardedDataset:
+    """Read-only view of a sharded dataset directory."""
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        self.path = os.fspath(path)
+        index_path = os.path.join(self.path, INDEX_FILE)
+        if not os.path.exists(index_path):
+            raise FileNotFoundError(f"Not a sharded dataset (no {INDEX_FILE}): {self.path}")
+        with open(index_path) as f:
+            index = json.load(f)
+        if index.get("format") != FORMAT:
+            raise ValueError(f"Unknown dataset format in {index_path}: {index.get('format')!r}")
+        self.index = index
+        self.fields: dict[str, dict[str, Any]] = index["fields"]
+        self.shards: list[dict[str, Any]] = index["shards"]
+
+    def __len__(self) -> int:
+        return int(self.index["rows"])
+
+    def shard(self, i: int) -> dict[str, np.ndarray]:
+        """The fields of shard ``i`` as memory maps (copy-on-write, no reads)."""
+        entry = self.shards[i]
+        return {
+            name: _open_field(os.path.join(self.path, file), self.fields[name], entry["rows"])
+            for name, file in entry["files"].items()
+        }
+
+    def warm(self, i: int) -> int:
+        """Read shard ``i``'s files into the page cache; return the bytes read."""
+        buf = bytearray(_PREFETCH_CHUNK)
+        total = 0
+        for file in self.shards[i]["files"].values():
+            with open(os.path.join(self.path, file), "rb", buffering=0) as f:
+                while n := f.readinto(buf):
+                    total += n
+        return total
+
+    def describe(self) -> dict[str, Any]:
+        nbytes = sum(
+            os.path.getsize(os.path.join(self.path, file))
+            for entry in self.shards
+            for file in entry["files"].values()
+        )
+        return {
+            "path": self.path,
+            "rows": len(self),
+            "fields": self.fields,
+            "num_shards": len(self.shards),
+            "shard_rows": [entry["rows"] for entry in self.shards],
+            "size_bytes": nbytes,
+        }
+
+
+class ShardedBatchLoader:
+    """Batches of a :class:`ShardedDataset`, with background shard prefetching.
+
+    Batches are tuples of tensors, one per field in ``fields`` order, and
+    run across shard boundaries. In order, a batch inside one shard is a
+    zero-copy view of the memory map; shuffling visits shards in a random
+    order and rows in a random order within each shard, gathering each
+    batch with one indexing op per field.
+
+    Args:
+        dataset: The dataset to read.
+        batch_size: Rows per batch.
+        fields: Fields to yield (default: all, in index order).
+        shuffle: Shuffle shard and row order every epoch.
+        drop_last: Skip a final batch smaller than ``batch_size``.
+        prefetch: Shards read ahead on background threads (0 disables).
+        num_replicas: Number of distributed shards of the data (default:
+            the world size, or 1). Each shard file's rows are split evenly
+            between them, dropping at most ``num_replicas - 1`` rows.
+        rank: Which part to yield (default: the distributed rank, or 0).
+        seed: Base seed of the per-epoch shuffle order; defaults to 0 when
+            distributed, otherwise the order comes from torch's global RNG.
+    """
+
+    def __init__(
+        self,
+        dataset: ShardedDataset,
+        batch_size: int = 32,
+        fields: Sequence[str] | None = None,
+        shuffle: bool = False,
+        drop_last: bool = False,
+        prefetch: int = 2,
+        num_replicas: int | None = None,
+        rank: int | None = None,
+        seed: int | None = None,
+    ) -> None:
+        if not isinstance(batch_size, int) or batch_size <= 0:
+            raise ValueError("'batch_size' must be a positive integer")
+        if prefetch < 0:
+            raise ValueError("'prefetch' must be >= 0")
+        fields = list(fields) if fields is not None else list(dataset.fields)
+        unknown = [f for f in fields if f not in dataset.fields]
+        if unknown:
+            raise ValueError(f"Unknown fields {unknown}; dataset has {list(dataset.fields)}")
+        distributed = dist.is_available() and dist.is_initialized()
+        if num_replicas is None:
+            num_replicas = dist.get_world_size() if distributed else 1
+        if rank is None:
+            rank = dist.get_rank() if distributed else 0
+        if not 0 <= rank < num_replicas:
+            raise ValueError(f"'rank' must be in [0, {num_replicas}), got {rank}")
+        if seed is None and num_replicas > 1:
+            seed = 0
+
+        self.dataset = dataset
+        self.batch_size = batch_size
+        self.fields = fields
+        self.shuffle = shuffle
+        self.drop_last = drop_last
+        self.prefetch = prefetch
+        self.num_replicas = num_replicas
+        self.rank = rank
+        self.seed = seed
+        self._epoch = 0
+        self.num_samples: int = sum(entry["rows"] // num_replicas for entry in dataset.shards)
+
+    def set_epoch(self, epoch: int) -> None:
+        """Select the shuffle order of ``epoch`` (with a ``seed``)."""
+        self._epoch = epoch
+
+    def __len__(self) -> int:
+        if self.drop_last:
+            return self.num_samples // self.batch_size
+        return math.ceil(self.num_samples / self.batch_size)
+
+    def __iter__(self) -> Iterator[tuple[torch.Tensor, ...]]:
+        # Advance on every new iteration, not on exhaustion: epochs cut short
+        # (``limit_train_batches``, early stopping) must still reshuffle
+        generator = self._generator(self._epoch)
+        self._epoch += 1
+        return self._batches(generator)
+
+    def _batches(self, generator: torch.Generator | None) -> Iterator[tuple[torch.Tensor, ...]]:
+        order = (
+            torch.randperm(len(self.dataset.shards), generator=generator).tolist()
+            if generator is not None
+            else list(range(len(self.dataset.shards)))
+        )
+        pieces: list[dict[str, np.ndarray]] = []
+        pending = 0
+        for i, arrays in self._prefetched(order):
+            part = self.dataset.shards[i]["rows"] // self.num_replicas
+            lo = self.rank * part
+            perm = (
+                (torch.randperm(part, generator=generator) + lo).numpy()
+                if generator is not None
+                else None
+            )
+            pos = 0
+            while pos < part:
+                take = min(self.batch_size - pending, part - pos)
+                if perm is None:
+                    piece = {f: arrays[f][lo + pos : lo + pos + take] for f in self.fields}
+                else:
+                    # Sorted indices read the memory map front to back
+                    idx = np.sort(perm[pos : pos + take])
+                    piece = {f: arrays[f][idx] for f in self.fields}
+                pos += take
+                if not pieces and take == self.batch_size:
+                    yield self._batch(piece)
+                    continue
+                pieces.append(piece)
+                pending += take
+                if pending == self.batch_size:
+                    yield self._batch(_concat(pieces, self.fields))
+                    pieces, pending = [], 0
+        if pieces and not self.drop_last:
+            yield self._batch(_concat(pieces, self.fields))
+
+    def _generator(self, epoch: int) -> torch.Generator | None:
+        if not self.shuffle:
+            return None
+        generator = torch.Generator()
+        if self.seed is not None:
+            generator.manual_seed(self.seed + epoch)
+        else:
+            generator.manual_seed(int(torch.empty((), dtype=torch.int64).random_().item()))
+        return generator
+
+    def _prefetched(self, order: list[int]) -> Iterator[tuple[int, dict[str, np.ndarray]]]:
+        """Open shards in ``order`` while the next ``prefetch`` are read ahead.
+
+        If iteration stops early (the generator is closed), reads that have
+        not started are cancelled and running ones are not waited for.
+        """
+        if self.prefetch == 0:
+            for i in order:
+                yield i, self.dataset.shard(i)
+            return
+        pool = ThreadPoolExecutor(max_workers=self.prefetch)
+        try:
+            upcoming = iter(order)
+            ahead: deque[tuple[int, Future[int]]] = deque()
+
+            def submit_next() -> None:
+                i = next(upcoming, None)
+                if i is not None:
+                    ahead.append((i, pool.submit(self.dataset.warm, i)))
+
+            for _ in range(self.prefetch + 1):
+                submit_next()
+            while ahead:
+                i, warmed = ahead.popleft()
+                warmed.result()
+                submit_next()
+                yield i, self.dataset.shard(i)
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _batch(self, piece: dict[str, np.ndarray]) -> tuple[torch.Tensor, ...]:
+        return tuple(torch.from_numpy(piece[f]) for f in self.fields)
+
+
+class ShardedDataModule(pl.LightningDataModule):
+    """LightningDataModule over sharded dataset directories, one per stage.
+
+    Args:
+        train: Dataset directory for ``fit`` (shuffled unless ``shuffle``
+            is false).
+        val: Dataset directory for validation (also used during ``fit``).
+        test: Dataset directory for ``test``.
+        predict: Dataset directory for ``predict``.
+        batch_size: Rows per batch.
+        fields: Fields to yield per batch, e.g. ``["x", "y"]`` (default: all).
+        shuffle: Shuffle the training data.
+        drop_last: Drop a final partial training batch.
+        prefetch_shards: Shards read ahead on background threads.
+        seed: Shuffle seed (see :class:`ShardedBatchLoader`).
+    """
+
+    def __init__(
+        self,
+        train: str | None = None,
+        val: str | None = None,
+        test: str | None = None,
+        predict: str | None = None,
+        batch_size: int = 32,
+        fields: list[str] | None = None,
+        shuffle: bool = True,
+        drop_last: bool = False,
+        prefetch_shards: int = 2,
+        seed: int | None = None,
+    ) -> None:
+        super().__init__()
+        self.save_hyperparameters()
+        self.paths = {"train": train, "val": val, "test": test, "predict": predict}
+        self.batch_size = batch_size
+        self.fields = fields
+        self.shuffle = shuffle
+        self.drop_last = drop_last
+        self.prefetch_shards = prefetch_shards
+        self.seed = seed
+
+    def train_dataloader(self) -> ShardedBatchLoader:
+        return self._loader("train", shuffle=self.shuffle, drop_last=self.drop_last)
+
+    def val_dataloader(self) -> ShardedBatchLoader:
+        return self._loader("val")
+
+    def test_dataloader(self) -> ShardedBatchLoader:
+        return self._loader("test")
+
+    def predict_dataloader(self) -> ShardedBatchLoader:
+        return self._loader("predict")
+
+    def _loader(self, stage: str, shuffle: bool = False, drop_last: bool = False) -> ShardedBatchLoader:
+        path = self.paths[stage]
+        if path is None:
+            raise ValueError(f"ShardedDataModule has no '{stage}' dataset")
+        return ShardedBatchLoader(
+            ShardedDataset(path),
+            batch_size=self.batch_size,
+            fields=self.fields,
+            shuffle=shuffle,
+            drop_last=drop_last,
+            prefetch=self.prefetch_shards,
+            seed=self.seed,
+        )
+
+
+class ShardWriter:
+    """Writes shards and, on :meth:`close`, the index of a new dataset."""
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        self.path = os.fspath(path)
+        if os.path.exists(os.path.join(self.path, INDEX_FILE)):
+            raise FileExistsError(f"Dataset already exists: {self.path}")
+        self._created = not os.path.isdir(self.path)
+        os.makedirs(self.path, exist_ok=True)
+        self.fields: dict[str, dict[str, Any]] | None = None
+        self.shards: list[dict[str, Any]] = []
+
+    def write(self, arrays: dict[str, np.ndarray]) -> None:
+        """Write one shard; every array has the shard's rows first."""
+        rows = {len(a) for a in arrays.values()}
+        if len(rows) != 1:
+            raise ValueError("All fields of a shard must have the same number of rows")
+        fields = {
+            name: {"dtype": a.dtype.str, "shape": list(a.shape[1:])} for name, a in arrays.items()
+        }
+        if self.fields is None:
+            self.fields = fields
+        elif fields != self.fields:
+            raise ValueError(f"Shard fields {fields} differ from {self.fields}")
+        files = {}
+        for name, a in arrays.items():
+            files[name] = f"{len(self.shards):05d}.{name}.npy"
+            np.save(os.path.join(self.path, files[name]), np.ascontiguousarray(a))
+        self.shards.append({"rows": rows.pop(), "files": files})
+
+    def abort(self) -> None:
+        """Remove the shards written so far, and the directory if this created it."""
+        for entry in self.shards:
+            for file in entry["files"].values():
+                with contextlib.suppress(FileNotFoundError):
+                    os.unlink(os.path.join(self.path, file))
+        self.shards = []
+        if self._created:
+            shutil.rmtree(self.path, ignore_errors=True)
+
+    def close(self) -> ShardedDataset:
+        """Publish the index atomically and return the dataset."""
+        if self.fields is None:
+            raise ValueError("No rows to write")
+        index = {
+            "format": FORMAT,
+            "version": 1,
+            "rows": sum(entry["rows"] for entry in self.shards),
+            "fields": self.fields,
+            "shards": self.shards,
+        }
+        tmp = os.path.join(self.path, f"{INDEX_FILE}.tmp")
+        with open(tmp, "w") as f:
+            json.dump(index, f, indent=1)
+        os.replace(tmp, os.path.join(self.path, INDEX_FILE))
+        return ShardedDataset(self.path)
+
+
+def ingest(
+    source: str,
+    output: str,
+    shard_rows: int = 65536,
+    label_column: str | None = None,
+    dtype: str = "float32",
+) -> ShardedDataset:
+    """Convert a ``.csv`` or ``.npz`` file into a sharded dataset at ``output``.
+
+    CSV files need a header row. They are read in ``shard_rows`` chunks
+    (never whole), with every column except ``label_column`` stored as
+    field ``x`` (``dtype``) and ``label_column`` as field ``y`` (int64).
+    Each array of an ``.npz`` becomes a field of the same name; the arrays
+    must share their first dimension and be stored in C order. They are
+    streamed from the archive in ``shard_rows`` chunks too. If the source
+    turns out to be malformed, the shards already written are removed.
+    """
+    if not isinstance(shard_rows, int) or shard_rows <= 0:
+        raise ValueError("'shard_rows' must be a positive integer")
+    if not source.endswith((".csv", ".npz")):
+        raise ValueError(f"Unsupported source format (expected .csv or .npz): {source}")
+    if not os.path.exists(source):
+        raise FileNotFoundError(f"Source not found: {source}")
+    writer = ShardWriter(output)
+    try:
+        if source.endswith(".npz"):
+            _ingest_npz(source, writer, shard_rows)
+        else:
+            _ingest_csv(source, writer, shard_rows, label_column, np.dtype(dtype))
+        return writer.close()
+    except BaseException:
+        writer.abort()
+        raise
+
+
+def _ingest_npz(source: str, writer: ShardWriter, shard_rows: int) -> None:
+    # np.load would decompress whole arrays (mmap_mode does not apply to
+    # .npz members), so read each member's .npy stream a shard at a time
+    with zipfile.ZipFile(source) as archive, ExitStack() as stack:
+        members = {}
+        for info in archive.infolist():
+            if info.filename.endswith(".npy"):
+                f = stack.enter_context(archive.open(info))
+                members[info.filename[: -len(".npy")]] = (f, *_npy_header(f, info.filename))
+        rows = {shape[0] for _, shape, _ in members.values()}
+        if len(rows) != 1:
+            raise ValueError("All arrays in the .npz must have the same first dimension")
+        n = rows.pop()
+        for start in range(0, n, shard_rows):
+            take = min(shard_rows, n - start)
+            writer.write({
+                name: _read_rows(f, shape, dtype, take) for name, (f, shape, dtype) in members.items()
+            })
+
+
+def _npy_header(f: IO[bytes], name: str) -> tuple[tuple[int, ...], np.dtype]:
+    version = np.lib.format.read_magic(f)
+    if version == (1, 0):
+        shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+    elif version == (2, 0):
+        shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+    else:
+        raise ValueError(f"Unsupported .npy format version {version} in {name}")
+    if not shape:
+        raise ValueError(f"Array {name} has no rows (0-d)")
+    if fortran_order and len(shape) > 1:
+        raise ValueError(f"Array {name} is stored in Fortran order; save it C-contiguous")
+    if dtype.hasobject:
+        raise ValueError(f"Array {name} holds Python objects")
+    return shape, dtype
+
+
+def _read_rows(f: IO[bytes], shape: tuple[int, ...], dtype: np.dtype, rows: int) -> np.ndarray:
+    row_shape = shape[1:]
+    nbytes = rows * math.prod(row_shape) * dtype.itemsize
+    data = f.read(nbytes)
+    if len(data) != nbytes:
+        raise ValueError("Truncated array in .npz")
+    return np.frombuffer(data, dtype=dtype).reshape(rows, *row_shape)
+
+
+def _ingest_csv(
+    source: str, writer: ShardWriter, shard_rows: int, label_column: str | None, dtype: np.dtype
+) -> None:
+    with open(source, newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            raise ValueError(f"Empty CSV file: {source}")
+        label = None
+        if label_column is not None:
+            if label_column not in header:
+                raise ValueError(f"Label column '{label_column}' not in CSV header")
+            label = header.index(label_column)
+        features = [i for i in range(len(header)) if i != label]
+
+        chunk: list[list[str]] = []
+        for row in reader:
+            if row and len(row) != len(header):
+                raise ValueError(
+                    f"CSV line {reader.line_num} has {len(row)} columns, expected {len(header)}"
+                )
+            if row:
+                chunk.append(row)
+            if len(chunk) == shard_rows:
+                writer.write(_csv_arrays(chunk, features, label, dtype))
+                chunk = []
+        if chunk:
+            writer.write(_csv_arrays(chunk, features, label, dtype))
+
+
+def _csv_arrays(
+    rows: list[list[str]], features: list[int], label: int | None, dtype: np.dtype
+) -> dict[str, np.ndarray]:
+    table = np.array(rows)
+    arrays = {"x": table[:, features].astype(dtype)}
+    if label is not None:
+        arrays["y"] = table[:, label].astype(np.float64).astype(np.int64)
+    return arrays
+
+
+def _open_field(path: str, spec: dict[str, Any], rows: int) -> np.ndarray:
+    # Copy-on-write: writable for torch.from_numpy, but never written back
+    if path.endswith(".npy"):
+        return cast(np.ndarray, np.load(path, mmap_mode="c"))
+    return np.memmap(path, dtype=np.dtype(spec["dtype"]), mode="c", shape=(rows, *spec["shape"]))
+
+
+def _concat(pieces: list[dict[str, np.ndarray]], fields: list[str]) -> dict[str, np.ndarray]:
+    return {f: np.concatenate([p[f] for p in pieces]) for f in fields}
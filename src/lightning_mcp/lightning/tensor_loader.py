@@ -0,0 +1,128 @@
+"""Batch loader for tensors already in memory.
+
+``DataLoader(TensorDataset(...), batch_size=n)`` fetches one sample at a
+time and rebuilds each batch with ``default_collate``, which is Python
+overhead per row. :class:`TensorBatchLoader` produces each batch with one
+op per tensor instead: a slice (a view, no copy) in order, or an
+``index_select`` of a random permutation when shuffling.
+
+It is a plain iterable with ``len()``, which Lightning accepts wherever a
+dataloader is expected. Sharding across distributed ranks is built in
+(Lightning only injects a ``DistributedSampler`` into real DataLoaders).
+"""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Iterator
+
+import torch
+import torch.distributed as dist
+
+
+class TensorBatchLoader:
+    """Yields tuples of batch slices of equally long ``tensors``.
+
+    Args:
+        tensors: Tensors sharing their first dimension (e.g. inputs, labels).
+        batch_size: Samples per batch.
+        shuffle: Visit samples in a new random order every epoch.
+        drop_last: Skip a final batch smaller than ``batch_size``.
+        num_replicas: Number of shards (default: the distributed world
+            size, or 1).
+        rank: Shard to yield (default: the distributed rank, or 0).
+        seed: Base seed of the per-epoch shuffle order. Required to agree
+            across ranks, so it defaults to 0 when sharded; unsharded
+            loaders draw the order from torch's global RNG by default.
+
+    As with ``DistributedSampler``, each shard gets ``ceil(n / num_replicas)``
+    samples, wrapping around to pad the last ones.
+    """
+
+    def __init__(
+        self,
+        *tensors: torch.Tensor,
+        batch_size: int = 1,
+        shuffle: bool = False,
+        drop_last: bool = False,
+        num_replicas: int | None = None,
+        rank: int | None = None,
+        seed: int | None = None,
+    ) -> None:
+        if not tensors:
+            raise ValueError("At least one tensor is required")
+        n = tensors[0].shape[0]
+        if any(t.shape[0] != n for t in tensors):
+            raise ValueError("All tensors must have the same first dimension")
+        if not isinstance(batch_size, int) or batch_size <= 0:
+            raise ValueError("'batch_size' must be a positive integer")
+        distributed = dist.is_available() and dist.is_initialized()
+        if num_replicas is None:
+            num_replicas = dist.get_world_size() if distributed else 1
+        if rank is None:
+            rank = dist.get_rank() if distributed else 0
+        if not 0 <= rank < num_replicas:
+            raise ValueError(f"'rank' must be in [0, {num_replicas}), got {rank}")
+        if seed is None and num_replicas > 1:
+            seed = 0
+
+        self.tensors = tensors
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.drop_last = drop_last
+        self.num_replicas = num_replicas
+        self.rank = rank
+        self.seed = seed
+        self._epoch = 0
+        self.num_samples = math.ceil(n / num_replicas)
+
+    def set_epoch(self, epoch: int) -> None:
+        """Select the shuffle order of ``epoch`` (with a ``seed``)."""
+        self._epoch = epoch
+
+    def __len__(self) -> int:
+        if self.drop_last:
+            return self.num_samples // self.batch_size
+        return math.ceil(self.num_samples / self.batch_size)
+
+    def __iter__(self) -> Iterator[tuple[torch.Tensor, ...]]:
+        # Advance on every new iteration, not on exhaustion: epochs cut short
+        # (``limit_train_batches``, early stopping) must still reshuffle
+        epoch = self._epoch
+        self._epoch += 1
+        return self._batches(self._shard_indices(epoch))
+
+    def _batches(self, indices: torch.Tensor | None) -> Iterator[tuple[torch.Tensor, ...]]:
+        epoch_batches = len(self)
+        if indices is None:
+            # Contiguous shard: every batch is a view
+            start = self.rank * self.num_samples
+            for i in range(epoch_batches):
+                lo = start + i * self.batch_size
+                hi = min(lo + self.batch_size, start + self.num_samples)
+                yield tuple(t[lo:hi] for t in self.tensors)
+        else:
+            indices = indices.to(self.tensors[0].device)
+            for i in range(epoch_batches):
+                idx = indices[i * self.batch_size : (i + 1) * self.batch_size]
+                yield tuple(t.index_select(0, idx) for t in self.tensors)
+
+    def _shard_indices(self, epoch: int) -> torch.Tensor | None:
+        """This shard's sample indices in ``epoch``, or ``None`` for an unpadded contiguous range."""
+        n = self.tensors[0].shape[0]
+        total = self.num_samples * self.num_replicas
+        start = self.rank * self.num_samples
+        if not self.shuffle:
+            if start + self.num_samples <= n:
+                return None
+            order = torch.arange(n)
+        else:
+            generator = torch.Generator()
+            if self.seed is not None:
+                generator.manual_seed(self.seed + epoch)
+            else:
+                generator.manual_seed(int(torch.empty((), dtype=torch.int64).random_().item()))
+            order = torch.randperm(n, generator=generator)
+        if total > n:
+            order = order.repeat(math.ceil(total / n))[:total]
+        return order[start : start + self.num_samples]
@@ -1,10 +1,21 @@
 from __future__ import annotations
 
+from collections.abc import Callable
 from typing import Any
 
 import pytorch_lightning as pl
 from pytorch_lightning import Trainer
 
+from lightning_mcp.lightning.batch_cache import get_batch_cache
+from lightning_mcp.lightning.callbacks import (
+    AsyncCheckpoint,
+    PerformanceMonitor,
+    ProgressReporter,
+    StepTracker,
+)
+from lightning_mcp.metrics import REGISTRY
+from lightning_mcp.timing import phase
+
 
 class LightningTrainerService:
     """Thin, explicit wrapper around PyTorch Lightning Trainer.
@@ -19,35 +30,174 @@ class LightningTrainerService:
         polluting stdout when used in MCP server context.
     """
 
-    def __init__(self, **trainer_kwargs: Any) -> None:
+    def __init__(self, checkpoint: dict[str, Any] | None = None, **trainer_kwargs: Any) -> None:
         # Disable progress bar and logger by default for MCP server use
         # These can be overridden by explicit user config if needed
-        defaults = {
+        defaults: dict[str, Any] = {
             "enable_progress_bar": False,
             "logger": False,
             "enable_model_summary": False,
         }
+
+        self._async_checkpoint: AsyncCheckpoint | None = None
+        if checkpoint is not None:
+            if not isinstance(checkpoint, dict):
+                raise TypeError("'checkpoint' must be a dict")
+            if not isinstance(checkpoint.get("dirpath"), str):
+                raise ValueError("'checkpoint.dirpath' must be a string")
+            self._async_checkpoint = AsyncCheckpoint(**checkpoint)
+            # Lightning's ModelCheckpoint writes synchronously on the
+            # training thread; async checkpointing replaces it.
+            defaults["enable_checkpointing"] = False
+
         # User-provided kwargs take precedence
         merged_kwargs = {**defaults, **trainer_kwargs}
-        self._trainer = Trainer(**merged_kwargs)
+
+        self._step_tracker = StepTracker()
+        self._performance = PerformanceMonitor()
+        callbacks = [
+            *(merged_kwargs.get("callbacks") or []),
+            self._step_tracker,
+            ProgressReporter(),
+        ]
+        if self._async_checkpoint is not None:
+            callbacks.append(self._async_checkpoint)
+        # Last, so the batch-end timestamp follows every other callback's
+        # on_train_batch_end (e.g. a checkpoint snapshot) instead of
+        # counting it as time waiting on data
+        callbacks.append(self._performance)
+        merged_kwargs["callbacks"] = callbacks
+        with phase("trainer_init"):
+            self._trainer = Trainer(**merged_kwargs)
 
     @property
     def trainer(self) -> Trainer:
         """Expose the underlying Trainer when needed (read-only)."""
         return self._trainer
 
-    def fit(self, model: pl.LightningModule) -> None:
-        """Run training."""
-        self._trainer.fit(model)
+    @property
+    def async_checkpoint(self) -> AsyncCheckpoint | None:
+        """The async checkpoint callback, if checkpointing was requested."""
+        return self._async_checkpoint
+
+    @property
+    def step_tracker(self) -> StepTracker:
+        """Start/end global step of the most recent fit."""
+        return self._step_tracker
+
+    @property
+    def performance(self) -> PerformanceMonitor:
+        """Step timing and throughput of the runs on this trainer."""
+        return self._performance
+
+    def fit(
+        self,
+        model: pl.LightningModule,
+        ckpt_path: str | None = None,
+        datamodule: pl.LightningDataModule | None = None,
+        record_metrics: bool = True,
+    ) -> None:
+        """Run training, optionally resuming from a full Lightning checkpoint.
+
+        When ``ckpt_path`` is given, weights, optimizer/scheduler state and
+        loop progress are restored, so only the remaining epochs/steps run.
+        A ``datamodule`` replaces the model's own dataloaders. With
+        ``record_metrics=False`` the run is left out of the server's
+        training metrics (e.g. profiling runs, slowed down by the profiler).
+        """
+        with phase("fit"):
+            self._trainer.fit(model, datamodule=datamodule, ckpt_path=ckpt_path)
+        summary = self._performance.summary("fit")
+        if summary is not None and record_metrics:
+            REGISTRY.record_training(
+                self._step_tracker.steps_run, summary["samples"], summary["seconds"]
+            )
 
-    def validate(self, model: pl.LightningModule) -> list[Any]:
-        """Run validation."""
-        return list(self._trainer.validate(model, verbose=False))
+    def validate(
+        self,
+        model: pl.LightningModule,
+        dataloaders: Any = None,
+        cache_key: str | None = None,
+        datamodule: pl.LightningDataModule | None = None,
+    ) -> list[Any]:
+        """Run validation.
 
-    def test(self, model: pl.LightningModule) -> list[Any]:
-        """Run testing."""
-        return list(self._trainer.test(model, verbose=False))
+        With ``cache_key`` and the batch cache enabled, the validation
+        batches (of ``datamodule`` if given, else of the model) are
+        recorded once and replayed afterwards.
+        """
+        with phase("validate"):
+            if dataloaders is None and cache_key is not None:
+                dataloaders = _cached_loader(
+                    "validate", cache_key, eval_loader_factory(model, "validate", datamodule)
+                )
+            if dataloaders is not None:
+                datamodule = None
+            return list(
+                self._trainer.validate(
+                    model, dataloaders=dataloaders, datamodule=datamodule, verbose=False
+                )
+            )
 
-    def predict(self, model: pl.LightningModule, dataloaders: Any = None) -> list[Any] | None:
+    def test(
+        self,
+        model: pl.LightningModule,
+        dataloaders: Any = None,
+        cache_key: str | None = None,
+        datamodule: pl.LightningDataModule | None = None,
+    ) -> list[Any]:
+        """Run testing.
+
+        With ``cache_key`` and the batch cache enabled, the test batches
+        (of ``datamodule`` if given, else of the model) are recorded once
+        and replayed afterwards.
+        """
+        with phase("test"):
+            if dataloaders is None and cache_key is not None:
+                dataloaders = _cached_loader(
+                    "test", cache_key, eval_loader_factory(model, "test", datamodule)
+                )
+            if dataloaders is not None:
+                datamodule = None
+            return list(
+                self._trainer.test(
+                    model, dataloaders=dataloaders, datamodule=datamodule, verbose=False
+                )
+            )
+
+    def predict(
+        self,
+        model: pl.LightningModule,
+        dataloaders: Any = None,
+        datamodule: pl.LightningDataModule | None = None,
+    ) -> list[Any] | None:
         """Run prediction."""
-        return self._trainer.predict(model, dataloaders=dataloaders)
+        with phase("predict"):
+            return self._trainer.predict(model, dataloaders=dataloaders, datamodule=datamodule)
+
+
+def eval_loader_factory(
+    model: pl.LightningModule, stage: str, datamodule: pl.LightningDataModule | None = None
+) -> Callable[[], Any]:
+    """Callable building the ``stage`` ("validate" or "test") dataloader.
+
+    Used to iterate evaluation data outside the Trainer; a datamodule is
+    prepared and set up first, as the Trainer would.
+    """
+    hook = "val_dataloader" if stage == "validate" else "test_dataloader"
+    if datamodule is None:
+        return getattr(model, hook)  # type: ignore[no-any-return]
+
+    def make_loader() -> Any:
+        datamodule.prepare_data()
+        datamodule.setup(stage)
+        return getattr(datamodule, hook)()
+
+    return make_loader
+
+
+def _cached_loader(stage: str, cache_key: str, make_loader: Any) -> Any:
+    cache = get_batch_cache()
+    if cache is None:
+        return None
+    return cache.loader(f"{stage}:{cache_key}", make_loader)
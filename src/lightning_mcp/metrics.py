@@ -0,0 +1,306 @@
+"""Process-wide server metrics in Prometheus text format.
+
+Updates are lock-free on the hot path: every thread writes to its own shard
+(found through a ``threading.local``), and shards are only summed when the
+registry is rendered. The single lock guards shard registration, which
+happens once per thread. Shards of threads that have exited are folded into
+a shared ``retired`` shard and dropped, so short-lived threads do not
+accumulate.
+
+In-flight requests are derived at render time as ``started - finished``, so
+no shared gauge has to be incremented and decremented concurrently.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+from bisect import bisect_left
+from typing import Any
+
+Labels = tuple[tuple[str, str], ...]
+
+# Request latency buckets, in seconds (long upper range for training calls)
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+_HELP = {
+    "lightning_mcp_requests_total": ("counter", "Requests handled, by method and tool."),
+    "lightning_mcp_request_duration_seconds": (
+        "histogram",
+        "Request latency, by method and tool.",
+    ),
+    "lightning_mcp_errors_total": ("counter", "Error responses, by JSON-RPC error code."),
+    "lightning_mcp_coalesced_requests_total": (
+        "counter",
+        "Requests answered by joining an identical in-flight call, by tool.",
+    ),
+    "lightning_mcp_batch_cache_requests_total": (
+        "counter",
+        "Evaluation loader lookups in the batch cache, by result (hit, miss).",
+    ),
+    "lightning_mcp_requests_in_flight": ("gauge", "Requests currently being handled."),
+    "lightning_mcp_executor_pending": (
+        "gauge",
+        "Handler calls running or queued on the bounded executor.",
+    ),
+    "lightning_mcp_train_runs_total": ("counter", "Completed LightningTrainerService fits."),
+    "lightning_mcp_train_steps_total": ("counter", "Optimizer steps run by fits."),
+    "lightning_mcp_train_samples_total": ("counter", "Training samples processed by fits."),
+    "lightning_mcp_train_seconds_total": ("counter", "Wall time spent in training loops."),
+    "lightning_mcp_train_samples_per_second": (
+        "gauge",
+        "Training throughput of the most recent fit.",
+    ),
+    "process_resident_memory_bytes": ("gauge", "Resident set size of this process."),
+    "process_proportional_memory_bytes": (
+        "gauge",
+        "Proportional set size (shared pages divided among their users).",
+    ),
+    "process_shared_memory_bytes": ("gauge", "Resident pages shared with other processes."),
+    "lightning_mcp_torch_threads": ("gauge", "torch intra-op thread count."),
+}
+
+
+class _Shard:
+    """Per-thread metric storage; only its owning thread writes to it."""
+
+    __slots__ = ("counters", "histograms")
+
+    def __init__(self) -> None:
+        self.counters: dict[tuple[str, Labels], float] = {}
+        # name/labels -> [bucket counts..., +Inf count, sum]
+        self.histograms: dict[tuple[str, Labels], list[float]] = {}
+
+    def merge(self, other: _Shard) -> None:
+        """Add the values of ``other`` into this shard."""
+        for key, value in list(other.counters.items()):
+            self.counters[key] = self.counters.get(key, 0.0) + value
+        for key, hist in list(other.histograms.items()):
+            total = self.histograms.setdefault(key, [0.0] * len(hist))
+            for i, v in enumerate(hist):
+                total[i] += v
+
+
+class MetricsRegistry:
+    """Sharded counters, histograms and gauges with Prometheus rendering."""
+
+    def __init__(self) -> None:
+        self._local = threading.local()
+        # Live shards with their owning threads
+        self._shards: list[tuple[_Shard, threading.Thread]] = []
+        # Totals of threads that have exited; guarded by the lock
+        self._retired = _Shard()
+        self._lock = threading.Lock()
+        self._gauges: dict[tuple[str, Labels], float] = {}
+        # Added to every exported series (e.g. the worker index)
+        self._const_labels: Labels = ()
+
+    def _shard(self) -> _Shard:
+        shard: _Shard | None = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = _Shard()
+            self._local.shard = shard
+            with self._lock:
+                self._retire_dead_shards()
+                self._shards.append((shard, threading.current_thread()))
+        return shard
+
+    def _retire_dead_shards(self) -> None:
+        """Fold shards of exited threads into ``_retired`` (lock held)."""
+        live = []
+        for shard, thread in self._shards:
+            if thread.is_alive():
+                live.append((shard, thread))
+            else:
+                # Its thread is gone, so nothing writes to it any more
+                self._retired.merge(shard)
+        self._shards = live
+
+    def set_const_labels(self, labels: Labels) -> None:
+        """Label every exported series with ``labels`` (e.g. ``(("worker", "0"),)``)."""
+        self._const_labels = labels
+
+    def inc(self, name: str, labels: Labels = (), value: float = 1.0) -> None:
+        counters = self._shard().counters
+        key = (name, labels)
+        counters[key] = counters.get(key, 0.0) + value
+
+    def observe(self, name: str, value: float, labels: Labels = ()) -> None:
+        histograms = self._shard().histograms
+        key = (name, labels)
+        hist = histograms.get(key)
+        if hist is None:
+            hist = histograms[key] = [0.0] * (len(LATENCY_BUCKETS) + 2)
+        hist[bisect_left(LATENCY_BUCKETS, value)] += 1
+        hist[-1] += value
+
+    def set_gauge(self, name: str, value: float, labels: Labels = ()) -> None:
+        # Last write wins; a single dict store is atomic under the GIL
+        self._gauges[(name, labels)] = value
+
+    # -- request / training helpers ---------------------------------------
+
+    def request_started(self) -> float:
+        self.inc("lightning_mcp_requests_started")
+        return time.perf_counter()
+
+    def request_finished(
+        self, method: str, tool: str | None, start: float, error_code: int | None
+    ) -> None:
+        if error_code == -32601:
+            # Unknown methods share one label, to bound cardinality
+            method = "<unknown>"
+        labels: Labels = (("method", method), ("tool", tool or ""))
+        self.inc("lightning_mcp_requests_finished")
+        self.inc("lightning_mcp_requests_total", labels)
+        self.observe("lightning_mcp_request_duration_seconds", time.perf_counter() - start, labels)
+        if error_code is not None:
+            self.inc_error(error_code)
+
+    def inc_error(self, code: int) -> None:
+        self.inc("lightning_mcp_errors_total", (("code", str(code)),))
+
+    def record_training(self, steps: int, samples: int, seconds: float) -> None:
+        self.inc("lightning_mcp_train_runs_total")
+        self.inc("lightning_mcp_train_steps_total", value=steps)
+        self.inc("lightning_mcp_train_samples_total", value=samples)
+        self.inc("lightning_mcp_train_seconds_total", value=seconds)
+        if seconds > 0:
+            self.set_gauge("lightning_mcp_train_samples_per_second", samples / seconds)
+
+    # -- export -------------------------------------------------------------
+
+    def collect(self) -> tuple[dict[tuple[str, Labels], float], dict[tuple[str, Labels], list[float]]]:
+        """Sum all shards into counter and histogram totals."""
+        total = _Shard()
+        with self._lock:
+            self._retire_dead_shards()
+            total.merge(self._retired)
+            shards = [shard for shard, _ in self._shards]
+        for shard in shards:
+            total.merge(shard)
+        return total.counters, total.histograms
+
+    def _gauges_now(self, counters: dict[tuple[str, Labels], float]) -> dict[tuple[str, Labels], float]:
+        gauges = dict(self._gauges)
+        started = counters.pop(("lightning_mcp_requests_started", ()), 0.0)
+        finished = counters.pop(("lightning_mcp_requests_finished", ()), 0.0)
+        gauges[("lightning_mcp_requests_in_flight", ())] = started - finished
+        gauges[("process_resident_memory_bytes", ())] = float(resident_memory_bytes())
+        memory = memory_breakdown()
+        if memory:
+            gauges[("process_proportional_memory_bytes", ())] = float(memory["pss_bytes"])
+            gauges[("process_shared_memory_bytes", ())] = float(memory["shared_bytes"])
+        torch = sys.modules.get("torch")
+        if torch is not None:
+            gauges[("lightning_mcp_torch_threads", ())] = float(torch.get_num_threads())
+        return gauges
+
+    def render(self) -> str:
+        """Render all metrics in Prometheus text exposition format."""
+        counters, histograms = self.collect()
+        gauges = self._gauges_now(counters)
+        const = self._const_labels
+
+        families: dict[str, list[str]] = {}
+        for (name, labels), value in sorted(counters.items()):
+            families.setdefault(name, []).append(f"{name}{_fmt(const + labels)} {_num(value)}")
+        for (name, labels), value in sorted(gauges.items()):
+            families.setdefault(name, []).append(f"{name}{_fmt(const + labels)} {_num(value)}")
+        for (name, labels), hist in sorted(histograms.items()):
+            labels = const + labels
+            lines = families.setdefault(name, [])
+            cumulative = 0.0
+            for bound, count in zip((*LATENCY_BUCKETS, "+Inf"), hist[:-1], strict=True):
+                cumulative += count
+                le = (("le", str(bound)),)
+                lines.append(f"{name}_bucket{_fmt(labels + le)} {_num(cumulative)}")
+            lines.append(f"{name}_sum{_fmt(labels)} {hist[-1]:.6f}")
+            lines.append(f"{name}_count{_fmt(labels)} {_num(cumulative)}")
+
+        out = []
+        for name in sorted(families):
+            kind, help_text = _HELP.get(name, ("untyped", name))
+            out.append(f"# HELP {name} {help_text}")
+            out.append(f"# TYPE {name} {kind}")
+            out.extend(families[name])
+        return "\n".join(out) + "\n"
+
+    def snapshot(self) -> dict[str, Any]:
+        """JSON-serializable view of the registry (for the ``lightning.stats`` tool)."""
+        counters, histograms = self.collect()
+        gauges = self._gauges_now(counters)
+
+        def _key(name: str, labels: Labels) -> str:
+            return f"{name}{_fmt(self._const_labels + labels)}"
+
+        return {
+            "counters": {_key(*k): v for k, v in sorted(counters.items())},
+            "gauges": {_key(*k): v for k, v in sorted(gauges.items())},
+            "histograms": {
+                _key(*k): {"count": sum(h[:-1]), "sum": h[-1]} for k, h in sorted(histograms.items())
+            },
+        }
+
+
+def resident_memory_bytes() -> int:
+    """Current RSS (from /proc on Linux; peak RSS elsewhere)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return peak_resident_memory_bytes()
+
+
+def memory_breakdown(pid: int | str = "self") -> dict[str, int]:
+    """RSS split into shared and private pages, plus PSS (Linux only).
+
+    PSS divides each shared page among the processes mapping it, so summing
+    PSS over forked workers gives their true combined footprint. Returns an
+    empty dict where ``/proc/<pid>/smaps_rollup`` is unavailable.
+    """
+    fields: dict[str, int] = {}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                key, _, rest = line.partition(":")
+                parts = rest.split()
+                if len(parts) == 2 and parts[1] == "kB":
+                    fields[key] = int(parts[0]) * 1024
+    except (OSError, ValueError):
+        return {}
+    return {
+        "rss_bytes": fields.get("Rss", 0),
+        "pss_bytes": fields.get("Pss", 0),
+        "shared_bytes": fields.get("Shared_Clean", 0) + fields.get("Shared_Dirty", 0),
+        "private_bytes": fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0),
+    }
+
+
+def peak_resident_memory_bytes() -> int:
+    """High-water mark of this process's RSS."""
+    import resource
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in KiB on Linux and bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _fmt(labels: Labels) -> str:
+    if not labels:
+        return ""
+    inner = ",".join(f'{k}="{_escape(v)}"' for k, v in labels)
+    return "{" + inner + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _num(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(value)
+
+
+REGISTRY = MetricsRegistry()
@@ -5,7 +5,8 @@ from __future__ import annotations
 import pytorch_lightning as pl
 import torch
 from torch import nn
-from torch.utils.data import DataLoader, TensorDataset
+
+from lightning_mcp.lightning.tensor_loader import TensorBatchLoader
 
 
 class SimpleClassifier(pl.LightningModule):
@@ -60,22 +61,22 @@ class SimpleClassifier(pl.LightningModule):
     def configure_optimizers(self):
         return torch.optim.Adam(self.parameters(), lr=self.hparams.lr)  # type: ignore[attr-defined]
 
-    def _make_dataset(self, n_samples: int = 64) -> TensorDataset:
-        """Create synthetic dataset for training/eval."""
+    def _make_dataset(self, n_samples: int = 64) -> tuple[torch.Tensor, torch.Tensor]:
+        """Create synthetic inputs and labels for training/eval."""
         x = torch.randn(n_samples, self.hparams.input_dim)  # type: ignore[attr-defined]
         y = torch.randint(0, self.hparams.num_classes, (n_samples,))  # type: ignore[attr-defined]
-        return TensorDataset(x, y)
+        return x, y
 
-    def train_dataloader(self) -> DataLoader:
-        return DataLoader(self._make_dataset(64), batch_size=8)
+    def train_dataloader(self) -> TensorBatchLoader:
+        return TensorBatchLoader(*self._make_dataset(64), batch_size=8)
 
-    def val_dataloader(self) -> DataLoader:
-        return DataLoader(self._make_dataset(32), batch_size=8)
+    def val_dataloader(self) -> TensorBatchLoader:
+        return TensorBatchLoader(*self._make_dataset(32), batch_size=8)
 
-    def test_dataloader(self) -> DataLoader:
-        return DataLoader(self._make_dataset(32), batch_size=8)
+    def test_dataloader(self) -> TensorBatchLoader:
+        return TensorBatchLoader(*self._make_dataset(32), batch_size=8)
 
-    def predict_dataloader(self) -> DataLoader:
+    def predict_dataloader(self) -> TensorBatchLoader:
         # For prediction, we only need inputs (no labels)
         x = torch.randn(16, self.hparams.input_dim)  # type: ignore[attr-defined]
-        return DataLoader(TensorDataset(x), batch_size=8)
+        return TensorBatchLoader(x, batch_size=8)
@@ -0,0 +1,50 @@
+"""Step progress of the running request, for MCP progress notifications.
+
+The HTTP server opens a :func:`track_progress` scope around a request that
+asks for progress (``params._meta.progressToken``); the trainer's
+:class:`~lightning_mcp.lightning.callbacks.ProgressReporter` stores the
+completed steps (or evaluation batches) of the current run in it. Outside a
+scope nothing is recorded.
+"""
+
+from __future__ import annotations
+
+import contextvars
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+_current: contextvars.ContextVar[Progress | None] = contextvars.ContextVar(
+    "lightning_mcp_progress", default=None
+)
+
+
+class Progress:
+    """Latest ``(progress, total)`` of one request; ``total`` is ``None`` if unknown.
+
+    Written by the handler thread and read by the server; each update is a
+    single attribute store, so readers always see a consistent pair.
+    """
+
+    def __init__(self) -> None:
+        self.state: tuple[int, int | None] | None = None
+
+    def update(self, progress: int, total: int | None) -> None:
+        self.state = (progress, total)
+
+
+def current_progress() -> Progress | None:
+    """The progress of the request being handled, if it asked for any."""
+    return _current.get()
+
+
+@contextmanager
+def track_progress(progress: Progress | None) -> Iterator[None]:
+    """Record progress of the enclosed block into ``progress`` (``None``: off)."""
+    if progress is None:
+        yield
+        return
+    token = _current.set(progress)
+    try:
+        yield
+    finally:
+        _current.reset(token)
@@ -0,0 +1,198 @@
+"""Disk-backed memoization of deterministic validate/test results.
+
+Evaluating the same model config, checkpoint and seed with deterministic
+algorithms gives the same metrics every time, so those results can be
+stored and returned without running the trainer again. The cache is
+off unless configured (``lightning-mcp --result-cache DIR``), and a request
+only uses it when it sets ``seed`` and ``trainer.deterministic: true``.
+
+Entries are keyed by tool, canonical params, the content digest of the
+checkpoint being evaluated (or of the preloaded weights used instead of
+one) and the torch/Lightning/Python versions, and are evicted by age (TTL) and, oldest-used first, by total size.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+# Params that do not affect the computed result
+_IGNORED_PARAMS = ("_meta", "diagnostics", "cache")
+# Checkpoint paths whose content digest is remembered
+_MAX_DIGESTS = 1024
+
+_cache: ResultCache | None = None
+
+
+class ResultCache:
+    """JSON result files under ``directory``, one per key."""
+
+    def __init__(
+        self,
+        directory: str,
+        ttl_seconds: float = 7 * 24 * 3600.0,
+        max_bytes: int = 256 * 1024 * 1024,
+    ) -> None:
+        if ttl_seconds <= 0:
+            raise ValueError("'ttl_seconds' must be > 0")
+        if max_bytes <= 0:
+            raise ValueError("'max_bytes' must be > 0")
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # path -> ((size, mtime, inode), sha256) of its latest version, so hits
+        # do not rehash checkpoints; least recently used first
+        self._digests: OrderedDict[str, tuple[tuple[int, int, int], str]] = OrderedDict()
+        self._versions = _environment_versions()
+
+    def key(
+        self,
+        tool: str,
+        params: dict[str, Any],
+        ckpt_path: str | None = None,
+        weights_digest: str | None = None,
+    ) -> str:
+        """Cache key for ``tool`` called with ``params`` on ``ckpt_path``.
+
+        ``weights_digest`` identifies preloaded shared weights evaluated
+        instead of a checkpoint; without it, a re-preload with different
+        weights would hit the old entries.
+        """
+        canonical = json.dumps(
+            {
+                "tool": tool,
+                "params": {k: v for k, v in params.items() if k not in _IGNORED_PARAMS},
+                "checkpoint": self._digest(ckpt_path) if ckpt_path is not None else None,
+                "weights": weights_digest,
+                "versions": self._versions,
+            },
+            sort_keys=True,
+            separators=(",", ":"),
+            default=str,
+        )
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        """The stored result marked ``cached: true``, or ``None`` on a miss."""
+        path = self._path(key)
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        if time.time() - entry["created"] > self.ttl_seconds:
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(path)
+            return None
+        # Access time drives size-based eviction (least recently used first)
+        with contextlib.suppress(FileNotFoundError):
+            os.utime(path)
+        return {**entry["result"], "cached": True, "cached_at": entry["created"]}
+
+    def put(self, key: str, result: dict[str, Any]) -> None:
+        """Store ``result`` atomically, then evict down to ``max_bytes``."""
+        path = self._path(key)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({"created": time.time(), "result": result}, f)
+        os.replace(tmp, path)
+        self._evict()
+
+    def clear(self) -> None:
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".json"):
+                with contextlib.suppress(FileNotFoundError):
+                    os.unlink(entry.path)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _evict(self) -> None:
+        with self._lock:
+            now = time.time()
+            entries = []
+            total = 0
+            for entry in os.scandir(self.directory):
+                if not entry.name.endswith(".json"):
+                    continue
+                try:
+                    st = entry.stat()
+                except FileNotFoundError:
+                    continue
+                # mtime is refreshed on hits; a file unused for a whole TTL is stale
+                if now - st.st_mtime > self.ttl_seconds:
+                    with contextlib.suppress(FileNotFoundError):
+                        os.unlink(entry.path)
+                    continue
+                entries.append((st.st_mtime, st.st_size, entry.path))
+                total += st.st_size
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                with contextlib.suppress(FileNotFoundError):
+                    os.unlink(path)
+                total -= size
+
+    def _digest(self, path: str) -> str:
+        path = os.path.abspath(path)
+        st = os.stat(path)
+        stamp = (st.st_size, st.st_mtime_ns, st.st_ino)
+        with self._lock:
+            known = self._digests.get(path)
+            if known is not None and known[0] == stamp:
+                self._digests.move_to_end(path)
+                return known[1]
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            while chunk := f.read(1 << 20):
+                h.update(chunk)
+        digest = h.hexdigest()
+        with self._lock:
+            # A rewritten checkpoint replaces its old version's entry
+            self._digests[path] = (stamp, digest)
+            self._digests.move_to_end(path)
+            while len(self._digests) > _MAX_DIGESTS:
+                self._digests.popitem(last=False)
+        return digest
+
+
+def configure_result_cache(
+    directory: str | None,
+    ttl_seconds: float = 7 * 24 * 3600.0,
+    max_bytes: int = 256 * 1024 * 1024,
+) -> ResultCache | None:
+    """Enable the result cache in ``directory`` (``None`` disables it)."""
+    global _cache
+    _cache = ResultCache(directory, ttl_seconds, max_bytes) if directory is not None else None
+    return _cache
+
+
+def result_cache_for(params: dict[str, Any]) -> ResultCache | None:
+    """The configured cache, if this request is deterministic and may use it.
+
+    That requires an integer ``seed``, ``trainer.deterministic`` set to
+    ``true`` and no ``"cache": false`` opt-out.
+    """
+    if _cache is None or params.get("cache", True) is False:
+        return None
+    trainer = params.get("trainer")
+    if not isinstance(params.get("seed"), int) or not isinstance(trainer, dict):
+        return None
+    if trainer.get("deterministic") is not True:
+        return None
+    return _cache
+
+
+def _environment_versions() -> dict[str, Any]:
+    from lightning_mcp.handlers.inspect import InspectHandler
+
+    env = InspectHandler()._inspect_environment()
+    return {k: env[k] for k in ("python", "torch", "lightning")}
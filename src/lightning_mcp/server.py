@@ -3,17 +3,36 @@ from __future__ import annotations
 import json
 import logging
 import sys
+import time
 import traceback
-from typing import Any, TextIO
+import uuid
+from concurrent.futures import Future
+from typing import Any, BinaryIO, TextIO, cast
 
+from lightning_mcp.capture import attach_diagnostics, capture_request, get_capture
+from lightning_mcp.coalesce import COALESCER
 from lightning_mcp.constants import PROTOCOL_VERSION, SERVER_VERSION
+from lightning_mcp.executor import SERVER_BUSY_CODE, BoundedExecutor, ServerBusyError
+from lightning_mcp.framing import (
+    FRAMING_MODES,
+    FramedReader,
+    FramedWriter,
+    FramingError,
+    detect_framing,
+)
 from lightning_mcp.handlers.checkpoint import CheckpointHandler
+from lightning_mcp.handlers.data import DataHandler
 from lightning_mcp.handlers.inspect import InspectHandler
+from lightning_mcp.handlers.pipeline import PipelineHandler
 from lightning_mcp.handlers.predict import PredictHandler
+from lightning_mcp.handlers.profile import ProfileHandler
+from lightning_mcp.handlers.stats import StatsHandler
 from lightning_mcp.handlers.test import TestHandler
 from lightning_mcp.handlers.train import TrainHandler
 from lightning_mcp.handlers.validate import ValidateHandler
+from lightning_mcp.metrics import REGISTRY
 from lightning_mcp.protocol import MCPError, MCPRequest, MCPResponse
+from lightning_mcp.timing import attach_timings, collect_timings, find_timings, timings_requested
 from lightning_mcp.tools import list_tools
 
 # Suppress non-critical logs
@@ -30,7 +49,12 @@ class MCPServer:
     """Stdio-based MCP server.
 
     Reads MCP requests as JSON objects (one per line) from stdin
-    and writes MCP responses as JSON objects to stdout.
+    and writes MCP responses as JSON objects to stdout. With
+    ``framing="content-length"`` messages are instead framed by LSP-style
+    headers over the binary streams; ``"auto"`` picks whichever the client
+    uses first. JSON-RPC batches (top-level arrays) are answered with one
+    array, their requests running concurrently on ``executor`` when output
+    capture is installed (and one after another otherwise).
 
     Fully compliant with JSON-RPC 2.0 and MCP 2024-11-05 specification.
     """
@@ -39,9 +63,16 @@ class MCPServer:
         self,
         stdin: TextIO | None = None,
         stdout: TextIO | None = None,
+        framing: str = "line",
+        executor: BoundedExecutor | None = None,
     ) -> None:
+        if framing not in FRAMING_MODES:
+            raise ValueError(f"Unknown framing '{framing}' (expected one of {', '.join(FRAMING_MODES)})")
         self.stdin = stdin or sys.stdin
         self.stdout = stdout or sys.stdout
+        self.framing = framing
+        # Runs the requests of JSON-RPC batches concurrently
+        self._executor = executor or BoundedExecutor()
 
         self._train_handler = TrainHandler()
         self._inspect_handler = InspectHandler()
@@ -49,69 +80,188 @@ class MCPServer:
         self._test_handler = TestHandler()
         self._predict_handler = PredictHandler()
         self._checkpoint_handler = CheckpointHandler()
+        self._profile_handler = ProfileHandler()
+        self._pipeline_handler = PipelineHandler()
+        self._data_handler = DataHandler()
+        self._stats_handler = StatsHandler()
+
+        # Map tool names to handlers
+        self._tool_handlers: dict[str, Any] = {
+            "lightning.train": self._train_handler,
+            "lightning.inspect": self._inspect_handler,
+            "lightning.validate": self._validate_handler,
+            "lightning.test": self._test_handler,
+            "lightning.predict": self._predict_handler,
+            "lightning.checkpoint": self._checkpoint_handler,
+            "lightning.profile": self._profile_handler,
+            "lightning.pipeline": self._pipeline_handler,
+            "lightning.data": self._data_handler,
+            "lightning.stats": self._stats_handler,
+        }
 
     def serve_forever(self) -> None:
-        """Run the MCP server loop."""
-        for line in self.stdin:
+        """Run the MCP server loop with the configured framing."""
+        framing = self.framing
+        if framing == "auto":
+            # Text-only streams (e.g. StringIO) can only carry lines
+            buffer = getattr(self.stdin, "buffer", None)
+            framing = detect_framing(buffer) if buffer is not None else "line"
+        if framing == "content-length":
+            self.serve_framed(_binary_stream(self.stdin), _binary_stream(self.stdout))
+        else:
+            self.serve_stream(self.stdin, self.stdout)
+
+    def serve_stream(self, stdin: TextIO, stdout: TextIO) -> None:
+        """Serve line-delimited JSON-RPC from ``stdin`` until EOF.
+
+        Handlers are shared across calls, so one server can serve several
+        streams (e.g. socket connections) concurrently, one thread each.
+        """
+        for line in stdin:
             line = line.strip()
             if not line:
                 continue
+            response = self._handle_message(line)
+            if response:
+                stdout.write(self._serialize_response(response))
+                stdout.write("\n")
+                stdout.flush()
 
-            response = None
-            data = None  # Initialize for error handling scope
+    def serve_framed(self, stdin: BinaryIO, stdout: BinaryIO) -> None:
+        """Serve ``Content-Length`` framed JSON-RPC from binary streams until EOF.
+
+        Responses are flushed only once no further input is buffered, so
+        pipelined requests are answered with coalesced writes.
+        """
+        reader = FramedReader(stdin)
+        writer = FramedWriter(stdout)
+        while True:
             try:
-                # Parse as dict first to distinguish requests from notifications
-                data = json.loads(line)
+                body = reader.read_message()
+            except FramingError as exc:
+                # The stream cannot be resynchronized: report and stop
+                REGISTRY.inc_error(-32700)
+                writer.write(self._serialize_response(MCPResponse(
+                    id=None,
+                    error=MCPError(code=-32700, message=f"Parse error: {exc}"),
+                )))
+                writer.flush()
+                return
+            if body is None:
+                break
+            response = self._handle_message(body)
+            if response:
+                writer.write(self._serialize_response(response))
+            if not reader.pending():
+                writer.flush()
+        writer.flush()
 
-                # Check if this is a notification (no id field)
-                if "id" not in data:
-                    # Notifications require no response, skip processing
-                    continue
+    def _handle_message(self, raw: str) -> MCPResponse | list[MCPResponse] | None:
+        """Handle one JSON-RPC message or batch; ``None`` when nothing is owed."""
+        try:
+            data = json.loads(raw)
+        except json.JSONDecodeError as exc:
+            # Parse error: id MUST be null per JSON-RPC 2.0 spec
+            REGISTRY.inc_error(-32700)
+            return MCPResponse(
+                id=None,
+                error=MCPError(
+                    code=-32700,  # Parse error
+                    message="Parse error: Invalid JSON",
+                    data={"details": str(exc)},
+                ),
+            )
+        if isinstance(data, list):
+            return self._handle_batch(data)
+        return self._handle_entry(data)
 
-                # This is a request, parse it properly
-                request = self._parse_request(line)
-                response = self._dispatch(request)
+    def _handle_batch(self, entries: list[Any]) -> MCPResponse | list[MCPResponse] | None:
+        """Handle a JSON-RPC batch, running its requests on the executor.
 
-            except json.JSONDecodeError as exc:
-                # Parse error: id MUST be null per JSON-RPC 2.0 spec
-                response = MCPResponse(
+        Responses come back in request order, one per request; notifications
+        get none, and a batch of only notifications gets no reply at all.
+        """
+        if not entries:
+            REGISTRY.inc_error(-32600)
+            return MCPResponse(
+                id=None,
+                error=MCPError(code=-32600, message="Invalid Request: empty batch"),
+            )
+
+        calls = [entry for entry in entries if isinstance(entry, dict) and "id" in entry]
+        if get_capture() is None:
+            # Without capture, handlers redirect the process-wide fds 1/2
+            # (suppress_output); overlapping calls would restore each
+            # other's redirections and could leave stdout on /dev/null
+            futures = iter([_completed(self._handle_entry(entry)) for entry in calls])
+        else:
+            futures = iter(self._executor.submit_batch(self._handle_entry, calls))
+        responses = []
+        for entry in entries:
+            if not isinstance(entry, dict):
+                REGISTRY.inc_error(-32600)
+                responses.append(MCPResponse(
                     id=None,
-                    error=MCPError(
-                        code=-32700,  # Parse error
-                        message="Parse error: Invalid JSON",
-                        data={"details": str(exc)},
-                    ),
-                )
-            except InvalidRequestError as exc:
-                # Invalid Request: id MUST be null if not extractable
-                request_id = None
-                if isinstance(data, dict) and "id" in data:
-                    request_id = str(data["id"])
-                response = MCPResponse(
-                    id=request_id,
-                    error=MCPError(
-                        code=-32600,  # Invalid Request
-                        message=f"Invalid Request: {exc}",
-                    ),
-                )
-            except Exception as exc:
-                # Internal error: preserve request ID if available
-                request_id = None
-                if isinstance(data, dict) and "id" in data:
-                    request_id = str(data["id"])
-                response = self._handle_fatal_error(exc, request_id)
+                    error=MCPError(code=-32600, message="Invalid Request: Request must be a JSON object"),
+                ))
+            elif "id" in entry:
+                try:
+                    response = next(futures).result()
+                except ServerBusyError as exc:
+                    REGISTRY.inc_error(SERVER_BUSY_CODE)
+                    response = MCPResponse(
+                        id=str(entry["id"]),
+                        error=MCPError(code=SERVER_BUSY_CODE, message=str(exc)),
+                    )
+                if response is not None:
+                    responses.append(response)
+        return responses or None
+
+    def _handle_entry(self, data: Any) -> MCPResponse | None:
+        """Handle one decoded request; ``None`` for notifications."""
+        response = None
+        dispatched = False
+        try:
+            # Check if this is a notification (no id field)
+            if "id" not in data:
+                # Notifications require no response, skip processing
+                return None
+
+            # This is a request, parse it properly
+            request = self._parse_request(data)
+            response = self._dispatch(request)
+            dispatched = True
+
+        except InvalidRequestError as exc:
+            # Invalid Request: id MUST be null if not extractable
+            request_id = None
+            if isinstance(data, dict) and "id" in data:
+                request_id = str(data["id"])
+            response = MCPResponse(
+                id=request_id,
+                error=MCPError(
+                    code=-32600,  # Invalid Request
+                    message=f"Invalid Request: {exc}",
+                ),
+            )
+        except Exception as exc:
+            # Internal error: preserve request ID if available
+            request_id = None
+            if isinstance(data, dict) and "id" in data:
+                request_id = str(data["id"])
+            response = self._handle_fatal_error(exc, request_id)
 
-            if response:
-                self._write_response(response)
+        if not dispatched and response.error is not None:
+            # Rejected before dispatch, so not counted per method
+            REGISTRY.inc_error(response.error.code)
+        return response
 
-    def _parse_request(self, raw: str) -> MCPRequest:
-        """Parse incoming request line to MCPRequest.
+    def _parse_request(self, data: Any) -> MCPRequest:
+        """Validate a decoded message and build an MCPRequest from it.
 
         Raises:
             InvalidRequestError: If the request is malformed.
         """
-        data = json.loads(raw)
-
         # Validate it's an object
         if not isinstance(data, dict):
             raise InvalidRequestError("Request must be a JSON object")
@@ -127,7 +277,28 @@ class MCPServer:
         return MCPRequest(**data)
 
     def _dispatch(self, request: MCPRequest) -> MCPResponse:
-        """Dispatch request to appropriate handler."""
+        """Dispatch request, recording metrics and, if ``_meta.timings`` is
+        set, phase timings."""
+        start = REGISTRY.request_started()
+        with collect_timings(timings_requested(request.params)) as timer:
+            if timer is None:
+                response = self._route(request)
+            else:
+                with timer.phase("dispatch"):
+                    response = self._route(request)
+                attach_timings(response, timer)
+        tool = request.params.get("name") if request.method == "tools/call" else None
+        REGISTRY.request_finished(
+            request.method,
+            # Unknown tool names are not used as labels, to bound cardinality
+            tool if isinstance(tool, str) and tool in self._tool_handlers else None,
+            start,
+            response.error.code if response.error is not None else None,
+        )
+        return response
+
+    def _route(self, request: MCPRequest) -> MCPResponse:
+        """Route request to appropriate handler."""
         # Handle MCP core methods
         if request.method == "initialize":
             return MCPResponse(
@@ -184,6 +355,18 @@ class MCPServer:
         if request.method == "lightning.predict":
             return self._call_handler(request, self._predict_handler)
 
+        if request.method == "lightning.profile":
+            return self._call_handler(request, self._profile_handler)
+
+        if request.method == "lightning.pipeline":
+            return self._call_handler(request, self._pipeline_handler)
+
+        if request.method == "lightning.data":
+            return self._call_handler(request, self._data_handler)
+
+        if request.method == "lightning.stats":
+            return self._call_handler(request, self._stats_handler)
+
         # Unknown method (not a tool, not a core MCP method)
         return MCPResponse(
             id=request.id,
@@ -200,17 +383,7 @@ class MCPServer:
 
         Per MCP spec, unknown tools return -32602 (Invalid params).
         """
-        # Map tool names to handlers
-        tool_handlers = {
-            "lightning.train": self._train_handler,
-            "lightning.inspect": self._inspect_handler,
-            "lightning.validate": self._validate_handler,
-            "lightning.test": self._test_handler,
-            "lightning.predict": self._predict_handler,
-            "lightning.checkpoint": self._checkpoint_handler,
-        }
-
-        handler = tool_handlers.get(tool_name)
+        handler = self._tool_handlers.get(tool_name)
         if handler is None:
             # MCP spec: unknown tool returns -32602 Invalid params
             return MCPResponse(
@@ -230,29 +403,41 @@ class MCPServer:
         return self._call_handler(synthetic_request, handler)
 
     def _call_handler(self, request: MCPRequest, handler: Any) -> MCPResponse:
-        """Call handler with proper error code mapping."""
-        try:
-            result: MCPResponse = handler.handle(request)
-            return result
-        except (ValueError, TypeError) as exc:
-            # Invalid params (bad model config, missing fields, etc.)
-            return MCPResponse(
-                id=request.id,
-                error=MCPError(
-                    code=-32602,  # JSON-RPC 2.0: Invalid params
-                    message=str(exc),
-                ),
-            )
-        except Exception as exc:
-            # Internal error
-            return MCPResponse(
-                id=request.id,
-                error=MCPError(
-                    code=-32603,  # JSON-RPC 2.0: Internal error
-                    message=str(exc),
-                    data={"traceback": traceback.format_exc()},
-                ),
-            )
+        """Call handler with proper error code mapping.
+
+        Output captured while the handler runs is attached to the response
+        when the request opts in with ``"diagnostics": true``. Identical
+        concurrent calls to side-effect-free tools share one execution.
+        """
+        return COALESCER.call(request, lambda: self._run_handler(request, handler))
+
+    def _run_handler(self, request: MCPRequest, handler: Any) -> MCPResponse:
+        with capture_request() as log:
+            try:
+                response: MCPResponse = handler.handle(request)
+            except (ValueError, TypeError) as exc:
+                # Invalid params (bad model config, missing fields, etc.)
+                response = MCPResponse(
+                    id=request.id,
+                    error=MCPError(
+                        code=-32602,  # JSON-RPC 2.0: Invalid params
+                        message=str(exc),
+                    ),
+                )
+            except Exception as exc:
+                # Internal error
+                response = MCPResponse(
+                    id=request.id,
+                    error=MCPError(
+                        code=-32603,  # JSON-RPC 2.0: Internal error
+                        message=str(exc),
+                        data={"traceback": traceback.format_exc()},
+                    ),
+                )
+
+        if request.params.get("diagnostics"):
+            attach_diagnostics(response, log)
+        return response
 
     def _handle_fatal_error(self, exc: Exception, request_id: str | None) -> MCPResponse:
         """Handle fatal errors during request processing."""
@@ -265,12 +450,37 @@ class MCPServer:
             ),
         )
 
-    def _write_response(self, response: MCPResponse) -> None:
-        """Write response to stdout as JSON."""
+    def _serialize_response(self, response: MCPResponse | list[MCPResponse]) -> str:
+        """Serialize a response, or a batch of them, to a JSON string."""
+        if isinstance(response, list):
+            return "[" + ",".join(self._serialize_response(r) for r in response) + "]"
+        start = time.perf_counter()
         # exclude_none=True per JSON-RPC 2.0: error MUST NOT exist on success
-        json.dump(response.model_dump(exclude_none=True), self.stdout)
-        self.stdout.write("\n")
-        self.stdout.flush()
+        payload = response.model_dump(exclude_none=True)
+        timings = find_timings(payload)
+        if timings is None:
+            return json.dumps(payload)
+        # The timing has to cover json.dumps too: dump a placeholder first,
+        # then splice the measured value in
+        placeholder = f"response_dump-{uuid.uuid4().hex}"
+        timings["response_dump"] = placeholder
+        text = json.dumps(payload)
+        elapsed = round((time.perf_counter() - start) * 1000.0, 3)
+        return text.replace(json.dumps(placeholder), repr(elapsed), 1)
+
+
+def _completed(response: MCPResponse | None) -> Future[MCPResponse | None]:
+    future: Future[MCPResponse | None] = Future()
+    future.set_result(response)
+    return future
+
+
+def _binary_stream(stream: TextIO | BinaryIO) -> BinaryIO:
+    """The binary buffer under a text stream, or ``stream`` if already binary."""
+    buffer = getattr(stream, "buffer", None)
+    if buffer is not None:
+        return cast(BinaryIO, buffer)
+    return cast(BinaryIO, stream)
 
 
 def main() -> None:
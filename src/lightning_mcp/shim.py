@@ -0,0 +1,55 @@
+"""Stdio-to-socket shim for ``lightning-mcp connect``.
+
+Lets stdio-only MCP clients use a shared ``--unix`` server: bytes are
+relayed between this process's stdin/stdout and the socket unchanged.
+Only the standard library is imported, so the shim starts in
+milliseconds instead of paying for torch.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import os
+import socket
+import sys
+import threading
+from typing import BinaryIO
+
+_CHUNK = 65536
+
+
+def connect(path: str, stdin: BinaryIO | None = None, stdout: BinaryIO | None = None) -> None:
+    """Relay ``stdin`` to the server on ``path`` and its replies to ``stdout``.
+
+    On stdin EOF the write side of the socket is shut down; the shim exits
+    once the server has answered everything and closed the connection.
+    """
+    stdin = stdin or sys.stdin.buffer
+    stdout = stdout or sys.stdout.buffer
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.connect(path)
+
+    def _upstream() -> None:
+        try:
+            while chunk := _read_available(stdin):
+                sock.sendall(chunk)
+        finally:
+            with contextlib.suppress(OSError):
+                sock.shutdown(socket.SHUT_WR)
+
+    threading.Thread(target=_upstream, name="lightning-mcp-shim", daemon=True).start()
+    try:
+        while chunk := sock.recv(_CHUNK):
+            stdout.write(chunk)
+            stdout.flush()
+    finally:
+        sock.close()
+
+
+def _read_available(stream: BinaryIO) -> bytes:
+    """Read whatever is available (up to a chunk) without waiting for a full one."""
+    try:
+        return os.read(stream.fileno(), _CHUNK)
+    except (AttributeError, OSError, ValueError):
+        # Not backed by a file descriptor (e.g. BytesIO in tests)
+        return stream.read(_CHUNK)
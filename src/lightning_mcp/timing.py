@@ -0,0 +1,92 @@
+"""Opt-in per-request phase timing.
+
+Servers open a :func:`collect_timings` scope when a request asks for timings
+(``params._meta.timings = true``); code anywhere below it marks phases with
+:func:`phase`. Without an active scope :func:`phase` returns a shared no-op
+context manager, so instrumentation costs one context-variable lookup.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import time
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from typing import Any
+
+from lightning_mcp.protocol import MCPResponse
+
+_current: contextvars.ContextVar[PhaseTimer | None] = contextvars.ContextVar(
+    "lightning_mcp_phase_timer", default=None
+)
+_NOOP: AbstractContextManager[None] = nullcontext()
+
+
+class PhaseTimer:
+    """Accumulates wall time per named phase, in milliseconds."""
+
+    def __init__(self) -> None:
+        self.phases: dict[str, float] = {}
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def record(self, name: str, seconds: float) -> None:
+        self.phases[name] = self.phases.get(name, 0.0) + seconds * 1000.0
+
+    def as_dict(self) -> dict[str, float]:
+        return {name: round(ms, 3) for name, ms in self.phases.items()}
+
+
+def phase(name: str) -> AbstractContextManager[None]:
+    """Time the enclosed block as ``name`` if timings are being collected."""
+    timer = _current.get()
+    if timer is None:
+        return _NOOP
+    return timer.phase(name)
+
+
+def timings_requested(params: dict[str, Any]) -> bool:
+    """Whether request params opt in via ``_meta.timings``."""
+    meta = params.get("_meta")
+    return isinstance(meta, dict) and bool(meta.get("timings"))
+
+
+@contextmanager
+def collect_timings(enabled: bool) -> Iterator[PhaseTimer | None]:
+    """Collect phase timings for the enclosed block when ``enabled``."""
+    if not enabled:
+        yield None
+        return
+    timer = PhaseTimer()
+    token = _current.set(timer)
+    try:
+        yield timer
+    finally:
+        _current.reset(token)
+
+
+def attach_timings(response: MCPResponse, timer: PhaseTimer) -> None:
+    """Store the collected timings under ``_meta.timings`` in the response.
+
+    Successful responses carry them in ``result``; errors in ``error.data``.
+    """
+    if response.result is not None:
+        response.result.setdefault("_meta", {})["timings"] = timer.as_dict()
+    elif response.error is not None:
+        data = response.error.data if isinstance(response.error.data, dict) else {}
+        response.error.data = {**data, "_meta": {"timings": timer.as_dict()}}
+
+
+def find_timings(payload: dict[str, Any]) -> dict[str, Any] | None:
+    """Locate attached timings in a dumped response payload, if any."""
+    container = payload.get("result") or payload.get("error", {}).get("data")
+    if not isinstance(container, dict):
+        return None
+    timings = container.get("_meta", {}).get("timings")
+    return timings if isinstance(timings, dict) else None
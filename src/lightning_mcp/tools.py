@@ -2,6 +2,15 @@ from __future__ import annotations
 
 from typing import Any
 
+# Accepted by every tool (see lightning_mcp.capture)
+_DIAGNOSTICS_PARAM = {
+    "type": "boolean",
+    "description": (
+        "Attach this request's captured stdout/stderr and warnings to the "
+        "result (default false)."
+    ),
+}
+
 
 def list_tools() -> list[dict[str, Any]]:
     """
@@ -11,7 +20,7 @@ def list_tools() -> list[dict[str, Any]]:
     Execution is handled by existing MCP handlers.
     """
 
-    return [
+    tools: list[dict[str, Any]] = [
         {
             "name": "lightning.train",
             "description": "Train a PyTorch Lightning model with explicit configuration.",
@@ -26,6 +35,27 @@ def list_tools() -> list[dict[str, Any]]:
                         "type": "object",
                         "description": "Trainer configuration.",
                     },
+                    "datamodule": {
+                        "type": "object",
+                        "description": (
+                            "DataModule configuration (_target_ + kwargs), used instead "
+                            "of the model's dataloaders; cached across calls."
+                        ),
+                    },
+                    "checkpoint": {
+                        "type": "object",
+                        "description": (
+                            "Asynchronous periodic checkpointing: dirpath, "
+                            "every_n_train_steps, every_n_epochs, max_in_flight."
+                        ),
+                    },
+                    "resume_from": {
+                        "type": "string",
+                        "description": (
+                            "Path to a full Lightning checkpoint to resume from "
+                            "(restores optimizer, scheduler and loop state)."
+                        ),
+                    },
                 },
                 "required": ["model"],
             },
@@ -33,6 +63,7 @@ def list_tools() -> list[dict[str, Any]]:
         {
             "name": "lightning.inspect",
             "description": "Inspect models or runtime environment.",
+            "annotations": {"readOnlyHint": True},
             "inputSchema": {
                 "type": "object",
                 "properties": {
@@ -51,6 +82,7 @@ def list_tools() -> list[dict[str, Any]]:
         {
             "name": "lightning.validate",
             "description": "Validate a PyTorch Lightning model.",
+            "annotations": {"readOnlyHint": True},
             "inputSchema": {
                 "type": "object",
                 "properties": {
@@ -62,6 +94,47 @@ def list_tools() -> list[dict[str, Any]]:
                         "type": "object",
                         "description": "Trainer configuration.",
                     },
+                    "datamodule": {
+                        "type": "object",
+                        "description": (
+                            "DataModule configuration (_target_ + kwargs), used instead "
+                            "of the model's dataloaders; cached across calls."
+                        ),
+                    },
+                    "ckpt_path": {
+                        "type": "string",
+                        "description": "Checkpoint whose weights to evaluate.",
+                    },
+                    "checkpoints": {
+                        "oneOf": [
+                            {"type": "string"},
+                            {"type": "array", "items": {"type": "string"}},
+                        ],
+                        "description": (
+                            "Glob or list of checkpoints to evaluate on one shared "
+                            "data pass, ranked by 'rank_by' (excludes 'ckpt_path')."
+                        ),
+                    },
+                    "rank_by": {
+                        "type": "string",
+                        "description": "Metric ranking 'checkpoints' (default val_loss).",
+                    },
+                    "mode": {
+                        "type": "string",
+                        "enum": ["min", "max"],
+                        "description": "Whether lower (default) or higher 'rank_by' is better.",
+                    },
+                    "seed": {
+                        "type": "integer",
+                        "description": "Seed for all RNGs.",
+                    },
+                    "cache": {
+                        "type": "boolean",
+                        "description": (
+                            "Use the server's result cache (default true); applies "
+                            "only with 'seed' and trainer.deterministic."
+                        ),
+                    },
                 },
                 "required": ["model"],
             },
@@ -69,6 +142,7 @@ def list_tools() -> list[dict[str, Any]]:
         {
             "name": "lightning.test",
             "description": "Test a PyTorch Lightning model.",
+            "annotations": {"readOnlyHint": True},
             "inputSchema": {
                 "type": "object",
                 "properties": {
@@ -80,6 +154,47 @@ def list_tools() -> list[dict[str, Any]]:
                         "type": "object",
                         "description": "Trainer configuration.",
                     },
+                    "datamodule": {
+                        "type": "object",
+                        "description": (
+                            "DataModule configuration (_target_ + kwargs), used instead "
+                            "of the model's dataloaders; cached across calls."
+                        ),
+                    },
+                    "ckpt_path": {
+                        "type": "string",
+                        "description": "Checkpoint whose weights to evaluate.",
+                    },
+                    "checkpoints": {
+                        "oneOf": [
+                            {"type": "string"},
+                            {"type": "array", "items": {"type": "string"}},
+                        ],
+                        "description": (
+                            "Glob or list of checkpoints to evaluate on one shared "
+                            "data pass, ranked by 'rank_by' (excludes 'ckpt_path')."
+                        ),
+                    },
+                    "rank_by": {
+                        "type": "string",
+                        "description": "Metric ranking 'checkpoints' (default test_loss).",
+                    },
+                    "mode": {
+                        "type": "string",
+                        "enum": ["min", "max"],
+                        "description": "Whether lower (default) or higher 'rank_by' is better.",
+                    },
+                    "seed": {
+                        "type": "integer",
+                        "description": "Seed for all RNGs.",
+                    },
+                    "cache": {
+                        "type": "boolean",
+                        "description": (
+                            "Use the server's result cache (default true); applies "
+                            "only with 'seed' and trainer.deterministic."
+                        ),
+                    },
                 },
                 "required": ["model"],
             },
@@ -87,6 +202,7 @@ def list_tools() -> list[dict[str, Any]]:
         {
             "name": "lightning.predict",
             "description": "Run prediction/inference with a PyTorch Lightning model.",
+            "annotations": {"readOnlyHint": True},
             "inputSchema": {
                 "type": "object",
                 "properties": {
@@ -98,24 +214,39 @@ def list_tools() -> list[dict[str, Any]]:
                         "type": "object",
                         "description": "Trainer configuration.",
                     },
+                    "datamodule": {
+                        "type": "object",
+                        "description": (
+                            "DataModule configuration (_target_ + kwargs), used instead "
+                            "of the model's dataloaders; cached across calls."
+                        ),
+                    },
                 },
                 "required": ["model"],
             },
         },
         {
             "name": "lightning.checkpoint",
-            "description": "Manage model checkpoints: save, load, or list.",
+            "description": "Manage model checkpoints: save, load, list, or compare.",
             "inputSchema": {
                 "type": "object",
                 "properties": {
                     "action": {
                         "type": "string",
-                        "enum": ["save", "load", "list"],
+                        "enum": ["save", "load", "list", "compare"],
                         "description": "Action to perform.",
                     },
                     "path": {
                         "type": "string",
-                        "description": "Checkpoint file path (for save/load).",
+                        "description": "Checkpoint file path (for save/load/compare).",
+                    },
+                    "other_path": {
+                        "type": "string",
+                        "description": "Second checkpoint file path (for compare).",
+                    },
+                    "changed_only": {
+                        "type": "boolean",
+                        "description": "Report only tensors that differ (for compare).",
                     },
                     "directory": {
                         "type": "string",
@@ -125,8 +256,212 @@ def list_tools() -> list[dict[str, Any]]:
                         "type": "object",
                         "description": "Model configuration (for save/load).",
                     },
+                    "compression": {
+                        "type": "string",
+                        "enum": ["zstd", "lz4", "zlib"],
+                        "description": "Compression codec for save (load detects it).",
+                    },
+                    "compression_level": {
+                        "type": "integer",
+                        "description": "Codec-specific compression level for save.",
+                    },
+                    "dtype": {
+                        "type": "string",
+                        "enum": ["bf16", "fp16"],
+                        "description": "Export fp32 weights at reduced precision (save).",
+                    },
+                    "keep_full_precision": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": (
+                            "Glob patterns of tensors kept at fp32 on reduced-precision "
+                            "export; normalization layers are always kept."
+                        ),
+                    },
                 },
                 "required": ["action"],
             },
         },
+        {
+            "name": "lightning.profile",
+            "description": (
+                "Profile a bounded number of training or prediction steps "
+                "with torch.profiler."
+            ),
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "model": {
+                        "type": "object",
+                        "description": "Model configuration (_target_ + kwargs).",
+                    },
+                    "trainer": {
+                        "type": "object",
+                        "description": "Trainer configuration.",
+                    },
+                    "datamodule": {
+                        "type": "object",
+                        "description": (
+                            "DataModule configuration (_target_ + kwargs), used instead "
+                            "of the model's dataloaders; cached across calls."
+                        ),
+                    },
+                    "mode": {
+                        "type": "string",
+                        "enum": ["train", "predict"],
+                        "description": "Profile training (default) or prediction steps.",
+                    },
+                    "schedule": {
+                        "type": "object",
+                        "description": "Profiler schedule in steps: wait, warmup, active.",
+                        "properties": {
+                            "wait": {"type": "integer"},
+                            "warmup": {"type": "integer"},
+                            "active": {"type": "integer"},
+                        },
+                    },
+                    "top_n": {
+                        "type": "integer",
+                        "description": "Number of ops to return (default 20).",
+                    },
+                    "sort_by": {
+                        "type": "string",
+                        "enum": [
+                            "self_cpu_time_total",
+                            "cpu_time_total",
+                            "self_device_time_total",
+                            "self_cpu_memory_usage",
+                            "count",
+                        ],
+                        "description": "Op table sort key.",
+                    },
+                    "record_shapes": {
+                        "type": "boolean",
+                        "description": "Group ops by input shape (default true).",
+                    },
+                    "profile_memory": {
+                        "type": "boolean",
+                        "description": "Track tensor memory allocation (default true).",
+                    },
+                    "trace_path": {
+                        "type": "string",
+                        "description": "Write a Chrome trace (chrome://tracing) to this path.",
+                    },
+                },
+                "required": ["model"],
+            },
+        },
+        {
+            "name": "lightning.pipeline",
+            "description": (
+                "Run train, validate, test, checkpoint and predict steps in order "
+                "on one in-memory model, with per-step timings."
+            ),
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "model": {
+                        "type": "object",
+                        "description": "Model configuration (_target_ + kwargs), built once.",
+                    },
+                    "trainer": {
+                        "type": "object",
+                        "description": "Trainer configuration shared by all steps.",
+                    },
+                    "datamodule": {
+                        "type": "object",
+                        "description": (
+                            "DataModule configuration (_target_ + kwargs), used instead "
+                            "of the model's dataloaders; shared by all steps."
+                        ),
+                    },
+                    "steps": {
+                        "type": "array",
+                        "description": (
+                            "Ordered steps. Each has 'tool' (train, validate, test, "
+                            "checkpoint, predict) plus that tool's arguments except "
+                            "'model'; a step's 'trainer' overrides the shared one."
+                        ),
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "tool": {
+                                    "type": "string",
+                                    "enum": ["train", "validate", "test", "checkpoint", "predict"],
+                                },
+                            },
+                            "required": ["tool"],
+                        },
+                    },
+                },
+                "required": ["model", "steps"],
+            },
+        },
+        {
+            "name": "lightning.data",
+            "description": (
+                "Convert CSV or .npz files into memory-mapped dataset shards, "
+                "or describe a sharded dataset."
+            ),
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "action": {
+                        "type": "string",
+                        "enum": ["ingest", "describe"],
+                        "description": "Action to perform.",
+                    },
+                    "source": {
+                        "type": "string",
+                        "description": (
+                            "CSV (with header) or .npz file to convert (for ingest); "
+                            "read one shard at a time."
+                        ),
+                    },
+                    "output": {
+                        "type": "string",
+                        "description": "New dataset directory (for ingest).",
+                    },
+                    "path": {
+                        "type": "string",
+                        "description": "Dataset directory (for describe).",
+                    },
+                    "shard_rows": {
+                        "type": "integer",
+                        "description": "Rows per shard (default 65536).",
+                    },
+                    "label_column": {
+                        "type": "string",
+                        "description": "CSV column stored as int64 field 'y'; the rest form 'x'.",
+                    },
+                    "dtype": {
+                        "type": "string",
+                        "description": "dtype of the CSV feature field 'x' (default float32).",
+                    },
+                },
+                "required": ["action"],
+            },
+        },
+        {
+            "name": "lightning.stats",
+            "description": (
+                "Dump server metrics: request counts, latencies, errors, "
+                "memory and training throughput."
+            ),
+            "annotations": {"readOnlyHint": True},
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "format": {
+                        "type": "string",
+                        "enum": ["json", "prometheus"],
+                        "description": "Structured JSON (default) or Prometheus text.",
+                    },
+                },
+            },
+        },
     ]
+    for tool in tools:
+        tool["inputSchema"]["properties"]["diagnostics"] = dict(_DIAGNOSTICS_PARAM)
+    return tools
+
@@ -0,0 +1,80 @@
+"""Unix domain socket transport.
+
+One warm process serves many local clients. Each connection speaks the
+same line-delimited JSON-RPC as the stdio transport and is handled on its
+own thread by a single shared :class:`~lightning_mcp.server.MCPServer`, so
+torch is imported once and handlers (and anything they cache) are shared.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import io
+import os
+import socket
+import socketserver
+import stat
+
+from lightning_mcp.server import MCPServer
+
+
+class _ConnectionHandler(socketserver.StreamRequestHandler):
+    server: UnixSocketServer
+    # With buffering on both sides, setup() makes these socket.makefile()
+    # BufferedReader/BufferedWriter objects
+    rfile: io.BufferedReader
+    wfile: io.BufferedWriter
+    # Buffered writes: each response goes out in one send on flush
+    wbufsize = -1
+
+    def handle(self) -> None:
+        reader = io.TextIOWrapper(self.rfile, encoding="utf-8")
+        writer = io.TextIOWrapper(self.wfile, encoding="utf-8")
+        # A client that disconnects mid-response just ends its session
+        with contextlib.suppress(BrokenPipeError, ConnectionResetError):
+            self.server.mcp.serve_stream(reader, writer)
+
+
+class UnixSocketServer(socketserver.ThreadingUnixStreamServer):
+    """Accepts MCP clients on ``path``; one thread per connection."""
+
+    daemon_threads = True
+
+    def __init__(self, path: str, mcp: MCPServer | None = None) -> None:
+        self.path = path
+        self.mcp = mcp or MCPServer()
+        _remove_stale_socket(path)
+        super().__init__(path, _ConnectionHandler, bind_and_activate=False)
+        try:
+            self.server_bind()
+            # Only the owner may connect. Set before listen(): until then
+            # connection attempts are refused, whatever the file mode.
+            os.chmod(path, 0o600)
+            self.server_activate()
+        except BaseException:
+            self.server_close()
+            raise
+
+    def server_close(self) -> None:
+        super().server_close()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+
+def _remove_stale_socket(path: str) -> None:
+    """Unlink a socket file left behind by a dead server; refuse a live one."""
+    try:
+        mode = os.stat(path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise FileExistsError(f"{path} exists and is not a socket")
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except (ConnectionRefusedError, FileNotFoundError):
+        os.unlink(path)
+        return
+    finally:
+        probe.close()
+    raise OSError(f"Another server is already listening on {path}")
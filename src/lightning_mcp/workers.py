@@ -0,0 +1,149 @@
+"""Pre-fork multi-worker HTTP serving.
+
+The parent process binds the listening socket and preloads models (their
+weights moved to shared memory), then forks ``N`` workers that each run
+the HTTP app on the inherited socket. Workers share one physical copy of
+the preloaded weights instead of building their own.
+
+Metrics are per process: each worker keeps its own registry, labelled
+``worker="<index>"``, and ``GET /metrics`` or ``lightning.stats`` report
+the worker that happened to accept the connection.
+
+uvicorn's own ``workers=`` option starts workers with ``spawn``, which
+re-imports everything and cannot inherit preloaded tensors, hence the
+explicit ``fork`` here (POSIX only).
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import multiprocessing
+import os
+import signal
+import socket
+import sys
+from typing import Any
+
+# Worker pids, in a shared array created before forking so every worker
+# can report on its siblings; None outside multi-worker mode
+_worker_pids: Any = None
+# Index of this process among the workers; None outside a worker
+_worker_index: int | None = None
+
+
+def load_preload_config(path: str) -> list[dict[str, Any]]:
+    """Read a preload file: a JSON list of ``{"model": {...}, "checkpoint": path}``."""
+    with open(path) as f:
+        entries = json.load(f)
+    if not isinstance(entries, list):
+        raise ValueError("Preload config must be a JSON list")
+    for entry in entries:
+        if not isinstance(entry, dict) or not isinstance(entry.get("model"), dict):
+            raise ValueError(f"Invalid preload entry: {entry!r}")
+    return entries
+
+
+def preload(entries: list[dict[str, Any]]) -> int:
+    """Preload every configured model into shared memory; return total bytes."""
+    from lightning_mcp.handlers.base import preload_model, suppress_output
+
+    total = 0
+    with suppress_output():
+        for entry in entries:
+            total += preload_model(entry["model"], entry.get("checkpoint"))
+    return total
+
+
+def worker_memory() -> list[dict[str, Any]] | None:
+    """Per-worker RSS/PSS/shared/private memory, or ``None`` if single-process."""
+    from lightning_mcp.metrics import memory_breakdown
+
+    if _worker_pids is None:
+        return None
+    return [{"pid": pid, **memory_breakdown(pid)} for pid in _worker_pids if pid]
+
+
+def worker_index() -> int | None:
+    """Index of this worker process, or ``None`` if not a forked worker."""
+    return _worker_index
+
+
+def serve_workers(
+    host: str,
+    port: int,
+    workers: int,
+    max_concurrency: int | None = None,
+    queue_depth: int = 16,
+) -> None:
+    """Fork ``workers`` HTTP workers sharing one socket; wait for them to exit.
+
+    Call :func:`preload` first so the workers inherit the shared weights.
+    SIGTERM/SIGINT received by the parent stop every worker gracefully.
+    """
+    global _worker_pids
+    if workers < 1:
+        raise ValueError("'workers' must be >= 1")
+    if not hasattr(os, "fork"):
+        raise RuntimeError("--workers requires a platform with fork()")
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+
+    _worker_pids = multiprocessing.Array("i", workers, lock=False)
+    children = []
+    for i in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                _worker_main(sock, i, max_concurrency, queue_depth)
+            except BaseException:
+                code = 1
+                import traceback
+
+                traceback.print_exc()
+            finally:
+                os._exit(code)
+        _worker_pids[i] = pid
+        children.append(pid)
+
+    def _forward(_signum: int, _frame: Any) -> None:
+        for pid in children:
+            with contextlib.suppress(ProcessLookupError):
+                os.kill(pid, signal.SIGTERM)
+
+    signal.signal(signal.SIGTERM, _forward)
+    signal.signal(signal.SIGINT, _forward)
+    print(
+        f"lightning-mcp: {workers} workers on http://{host}:{port} (pids {children})",
+        file=sys.stderr,
+        flush=True,
+    )
+    for pid in children:
+        os.waitpid(pid, 0)
+    sock.close()
+
+
+def _worker_main(
+    sock: socket.socket, index: int, max_concurrency: int | None, queue_depth: int
+) -> None:
+    global _worker_index
+    # Installed per worker: the capture's reader thread does not survive fork
+    from lightning_mcp.capture import OutputCapture
+    from lightning_mcp.metrics import REGISTRY
+
+    OutputCapture().install(forward_unscoped=True)
+    _worker_index = index
+    REGISTRY.set_const_labels((("worker", str(index)),))
+
+    import uvicorn
+
+    from lightning_mcp.http_server import app, configure_executor
+
+    configure_executor(max_concurrency, queue_depth)
+    server = uvicorn.Server(uvicorn.Config(app))
+    server.run(sockets=[sock])
@@ -0,0 +1,94 @@
+import os
+
+import pytest
+import torch
+
+from lightning_mcp.handlers import base
+from lightning_mcp.handlers.test import TestHandler
+from lightning_mcp.handlers.validate import ValidateHandler
+from lightning_mcp.models.simple import SimpleClassifier
+from lightning_mcp.protocol import MCPRequest
+
+MODEL = {"_target_": "lightning_mcp.models.simple.SimpleClassifier"}
+TRAINER = {"accelerator": "cpu"}
+
+
+def _call(handler, method, **params):
+    response = handler.handle(MCPRequest(id="bulk-1", method=method, params=params))
+    return response.result["structuredContent"]
+
+
+@pytest.fixture
+def checkpoints(temp_dir):
+    paths = []
+    for i in range(3):
+        path = os.path.join(temp_dir, f"epoch={i}.pt")
+        torch.save(SimpleClassifier().state_dict(), path)
+        paths.append(path)
+    return paths
+
+
+def test_validate_many_checkpoints_matches_single_runs(checkpoints, temp_dir):
+    """A glob of checkpoints is ranked, each scored as a single run would be."""
+    structured = _call(
+        ValidateHandler(), "lightning.validate", model=MODEL, trainer=TRAINER, seed=3,
+        checkpoints=os.path.join(temp_dir, "epoch=*.pt"),
+    )
+
+    assert [r["path"] for r in structured["checkpoints"]] == checkpoints
+    losses = {r["path"]: r["metrics"]["val_loss"] for r in structured["checkpoints"]}
+    assert structured["rank_by"] == "val_loss"
+    assert structured["ranking"] == sorted(losses, key=losses.get)
+    assert structured["best"]["rank"] == 1
+    assert structured["best"]["path"] == structured["ranking"][0]
+
+    # Every checkpoint saw the same data a separate call would have
+    for path in checkpoints:
+        single = _call(ValidateHandler(), "lightning.validate", model=MODEL, trainer=TRAINER, seed=3, ckpt_path=path)
+        assert single["metrics"]["val_loss"] == pytest.approx(losses[path])
+
+
+def test_test_many_checkpoints_ranked_by_max(checkpoints):
+    """mode="max" ranks the highest metric first."""
+    structured = _call(
+        TestHandler(), "lightning.test", model=MODEL, trainer={**TRAINER, "limit_test_batches": 2},
+        checkpoints=checkpoints, rank_by="test_acc", mode="max",
+    )
+
+    accs = [r["metrics"]["test_acc"] for r in structured["checkpoints"]]
+    # Performance is per checkpoint run, not only the last one's
+    assert "performance" not in structured
+    assert [r["performance"]["steps"] for r in structured["checkpoints"]] == [2, 2, 2]
+    assert [structured["checkpoints"][checkpoints.index(p)]["rank"] for p in structured["ranking"]] == [1, 2, 3]
+    assert structured["best"]["metrics"]["test_acc"] == max(accs)
+
+
+def test_checkpoints_glob_without_matches(temp_dir):
+    """A glob matching nothing is an error, not an empty ranking."""
+    with pytest.raises(FileNotFoundError):
+        _call(ValidateHandler(), "lightning.validate", model=MODEL, checkpoints=os.path.join(temp_dir, "*.ckpt"))
+
+
+def test_fractional_limit_applied_once(checkpoints, monkeypatch):
+    """A float limit keeps that fraction of the batches, for every checkpoint."""
+    replayed = []
+    replay = base.replay_loader
+
+    def _spy(batches):
+        replayed.append(len(batches))
+        return replay(batches)
+
+    monkeypatch.setattr(base, "replay_loader", _spy)
+    fraction = _call(
+        ValidateHandler(), "lightning.validate", model=MODEL, seed=3,
+        trainer={**TRAINER, "limit_val_batches": 0.5}, checkpoints=checkpoints,
+    )
+    count = _call(
+        ValidateHandler(), "lightning.validate", model=MODEL, seed=3,
+        trainer={**TRAINER, "limit_val_batches": 2}, checkpoints=checkpoints,
+    )
+
+    # 32 samples in batches of 8: half is 2 batches, not re-halved to 1
+    assert replayed == [2, 2]
+    for a, b in zip(fraction["checkpoints"], count["checkpoints"], strict=True):
+        assert a["metrics"]["val_loss"] == pytest.approx(b["metrics"]["val_loss"])
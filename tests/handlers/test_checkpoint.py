@@ -0,0 +1,275 @@
+import pytest
+import torch
+
+from lightning_mcp.handlers.checkpoint import CheckpointHandler
+from lightning_mcp.handlers.train import TrainHandler
+from lightning_mcp.lightning.checkpoint_io import load_checkpoint
+from lightning_mcp.models.simple import SimpleClassifier
+from lightning_mcp.protocol import MCPRequest
+
+MODEL_CONFIG = {
+    "_target_": "lightning_mcp.models.simple.SimpleClassifier",
+    "input_dim": 4,
+    "num_classes": 3,
+}
+
+
+def test_checkpoint_save_load_roundtrip(temp_dir):
+    """
+    CheckpointHandler should save a state dict and load it back.
+    """
+
+    handler = CheckpointHandler()
+    path = str(temp_dir / "model.pt")
+
+    saved = handler.handle(
+        MCPRequest(
+            id="ckpt-save",
+            method="lightning.checkpoint",
+            params={"action": "save", "path": path, "model": MODEL_CONFIG},
+        )
+    )
+    assert saved.result["structuredContent"]["num_parameters"] > 0
+
+    loaded = handler.handle(
+        MCPRequest(
+            id="ckpt-load",
+            method="lightning.checkpoint",
+            params={"action": "load", "path": path, "model": MODEL_CONFIG},
+        )
+    )
+    structured = loaded.result["structuredContent"]
+    assert structured["format"] == "state_dict"
+    assert structured["model_class"] == "SimpleClassifier"
+
+
+def test_checkpoint_load_full_lightning_checkpoint(temp_dir):
+    """
+    CheckpointHandler should read weights out of a full Lightning .ckpt file.
+    """
+
+    trained = TrainHandler().handle(
+        MCPRequest(
+            id="train-for-ckpt",
+            method="lightning.train",
+            params={
+                "model": MODEL_CONFIG,
+                "trainer": {"max_epochs": 1, "accelerator": "cpu"},
+                "checkpoint": {"dirpath": str(temp_dir)},
+            },
+        )
+    )
+    path = trained.result["structuredContent"]["checkpointing"]["saves"][-1]["path"]
+
+    loaded = CheckpointHandler().handle(
+        MCPRequest(
+            id="ckpt-load-lightning",
+            method="lightning.checkpoint",
+            params={"action": "load", "path": path, "model": MODEL_CONFIG},
+        )
+    )
+    assert loaded.result["structuredContent"]["format"] == "lightning"
+
+
+@pytest.mark.parametrize("codec", ["zlib", "zstd", "lz4"])
+def test_checkpoint_compressed_roundtrip(temp_dir, codec):
+    """
+    Compressed checkpoints should load transparently and report their ratio.
+    """
+
+    if codec == "zstd":
+        pytest.importorskip("zstandard")
+    elif codec == "lz4":
+        pytest.importorskip("lz4")
+
+    handler = CheckpointHandler()
+    path = str(temp_dir / f"model-{codec}.pt")
+    model_config = {**MODEL_CONFIG, "input_dim": 512, "num_classes": 256}
+    model = SimpleClassifier(input_dim=512, num_classes=256)
+
+    saved = handler.run(
+        {
+            "action": "save",
+            "path": path,
+            "model": model_config,
+            "compression": codec,
+        },
+        model,
+    )
+    assert saved["compression"] == codec
+
+    restored = load_checkpoint(path)
+    expected = model.state_dict()
+    assert restored.keys() == expected.keys()
+    for name, tensor in expected.items():
+        assert torch.equal(restored[name], tensor)
+
+    loaded = handler.handle(
+        MCPRequest(
+            id="ckpt-load-compressed",
+            method="lightning.checkpoint",
+            params={"action": "load", "path": path, "model": model_config},
+        )
+    )
+    assert loaded.result["structuredContent"]["format"] == "state_dict"
+
+    listed = handler.handle(
+        MCPRequest(
+            id="ckpt-list",
+            method="lightning.checkpoint",
+            params={"action": "list", "directory": str(temp_dir)},
+        )
+    )
+    (entry,) = listed.result["structuredContent"]["checkpoints"]
+    assert entry["compression"] == codec
+    assert entry["compression_ratio"] > 0
+
+
+def test_checkpoint_rejects_unknown_codec(temp_dir):
+    """
+    CheckpointHandler must reject unsupported compression codecs.
+    """
+
+    with pytest.raises(ValueError):
+        CheckpointHandler().handle(
+            MCPRequest(
+                id="ckpt-bad-codec",
+                method="lightning.checkpoint",
+                params={
+                    "action": "save",
+                    "path": str(temp_dir / "model.pt"),
+                    "model": MODEL_CONFIG,
+                    "compression": "rar",
+                },
+            )
+        )
+
+
+def test_checkpoint_reduced_precision_export(temp_dir):
+    """
+    bf16 export should halve tensor bytes, keep allow-listed tensors at fp32,
+    and load back into an fp32 model.
+    """
+
+    handler = CheckpointHandler()
+    path = str(temp_dir / "model-bf16.pt")
+
+    saved = handler.handle(
+        MCPRequest(
+            id="ckpt-save-bf16",
+            method="lightning.checkpoint",
+            params={
+                "action": "save",
+                "path": path,
+                "model": MODEL_CONFIG,
+                "dtype": "bf16",
+                "keep_full_precision": ["*.bias"],
+            },
+        )
+    )
+    structured = saved.result["structuredContent"]
+    assert structured["dtype"] == "bf16"
+    assert structured["kept_full_precision"] == ["model.bias"]
+    # 4x3 fp32 weight -> bf16 saves 2 bytes per element
+    assert structured["bytes_saved"] == 4 * 3 * 2
+    assert 0 < structured["max_abs_deviation"] < 1e-2
+
+    loaded = handler.handle(
+        MCPRequest(
+            id="ckpt-load-bf16",
+            method="lightning.checkpoint",
+            params={"action": "load", "path": path, "model": MODEL_CONFIG},
+        )
+    )
+    assert loaded.result["structuredContent"]["model_class"] == "SimpleClassifier"
+
+
+def test_checkpoint_compare(temp_dir):
+    """
+    compare should report per-tensor differences between two checkpoints.
+    """
+
+    handler = CheckpointHandler()
+    path_a = str(temp_dir / "a.pt")
+    path_b = str(temp_dir / "b.pt")
+    for path in (path_a, path_b):
+        handler.handle(
+            MCPRequest(
+                id="ckpt-save",
+                method="lightning.checkpoint",
+                params={"action": "save", "path": path, "model": MODEL_CONFIG},
+            )
+        )
+
+    same = handler.handle(
+        MCPRequest(
+            id="ckpt-compare-same",
+            method="lightning.checkpoint",
+            params={"action": "compare", "path": path_a, "other_path": path_a},
+        )
+    ).result["structuredContent"]
+    assert same["summary"]["identical"] is True
+    assert same["tensors"]["model.weight"]["max_abs_diff"] == 0.0
+
+    # Two independently initialized models differ everywhere
+    diff = handler.handle(
+        MCPRequest(
+            id="ckpt-compare-diff",
+            method="lightning.checkpoint",
+            params={
+                "action": "compare",
+                "path": path_a,
+                "other_path": path_b,
+                "changed_only": True,
+            },
+        )
+    ).result["structuredContent"]
+    assert diff["summary"]["changed"] == 2
+    assert set(diff["tensors"]) == {"model.weight", "model.bias"}
+    weight = diff["tensors"]["model.weight"]
+    assert weight["equal"] is False
+    assert weight["shape"] == [3, 4]
+    assert weight["max_abs_diff"] > 0
+    assert weight["diff_norm"] > 0
+
+
+def test_checkpoint_compare_treats_matching_nans_as_equal(temp_dir):
+    """
+    compare should report a checkpoint holding NaNs as identical to its copy.
+    """
+
+    state = SimpleClassifier(input_dim=4, num_classes=3).state_dict()
+    state["model.weight"][0, 0] = float("nan")
+    state["model.weight"][1, 1] = float("inf")
+    path_a = str(temp_dir / "nan_a.pt")
+    path_b = str(temp_dir / "nan_b.pt")
+    torch.save(state, path_a)
+    torch.save({k: v.clone() for k, v in state.items()}, path_b)
+
+    handler = CheckpointHandler()
+    same = handler.handle(
+        MCPRequest(
+            id="ckpt-compare-nan",
+            method="lightning.checkpoint",
+            params={"action": "compare", "path": path_a, "other_path": path_b},
+        )
+    ).result["structuredContent"]
+    assert same["summary"]["identical"] is True
+    assert same["summary"]["changed"] == 0
+    weight = same["tensors"]["model.weight"]
+    assert weight["equal"] is True
+    assert weight["max_abs_diff"] == 0.0
+    assert weight["diff_norm"] == 0.0
+
+    # A NaN on only one side is still a change
+    state["model.weight"][2, 2] = float("nan")
+    torch.save(state, path_a)
+    diff = handler.handle(
+        MCPRequest(
+            id="ckpt-compare-nan-diff",
+            method="lightning.checkpoint",
+            params={"action": "compare", "path": path_a, "other_path": path_b},
+        )
+    ).result["structuredContent"]
+    assert diff["summary"]["changed"] == 1
+    assert diff["tensors"]["model.weight"]["equal"] is False
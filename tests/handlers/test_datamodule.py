@@ -0,0 +1,201 @@
+import functools
+import os
+import threading
+import time
+
+import pytest
+import pytorch_lightning as pl
+import torch
+from torch.utils.data import DataLoader, TensorDataset
+
+from lightning_mcp.handlers import base
+from lightning_mcp.handlers.base import (
+    _datamodules,
+    clear_datamodules,
+    load_datamodule,
+    loader_defaults,
+)
+from lightning_mcp.handlers.train import TrainHandler
+from lightning_mcp.handlers.validate import ValidateHandler
+from lightning_mcp.protocol import MCPRequest
+
+MODEL = {"_target_": "lightning_mcp.models.simple.SimpleClassifier"}
+TRAINER = {"accelerator": "cpu", "max_epochs": 1, "enable_checkpointing": False}
+
+
+class CountingDataModule(pl.LightningDataModule):
+    """Random data; counts instances and the dataloaders it builds."""
+
+    instances = 0
+
+    def __init__(self, batch_size=4, num_workers=0, persistent_workers=False, pin_memory=False):
+        super().__init__()
+        CountingDataModule.instances += 1
+        self.loader_kwargs = {
+            "batch_size": batch_size,
+            "num_workers": num_workers,
+            "persistent_workers": persistent_workers,
+            "pin_memory": pin_memory,
+        }
+        self.loaders_built = 0
+
+    def _loader(self, n):
+        self.loaders_built += 1
+        return DataLoader(TensorDataset(torch.randn(n, 4), torch.randint(0, 3, (n,))), **self.loader_kwargs)
+
+    def train_dataloader(self):
+        return self._loader(16)
+
+    def val_dataloader(self):
+        return self._loader(8)
+
+
+DATAMODULE = {"_target_": f"{__name__}.CountingDataModule", "num_workers": 0}
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    CountingDataModule.instances = 0
+    yield
+    clear_datamodules()
+
+
+def _call(handler, method, **params):
+    response = handler.handle(MCPRequest(id="dm-1", method=method, params=params))
+    return response.result["structuredContent"]
+
+
+def test_datamodule_is_built_once_and_reused():
+    """Calls with the same config share one datamodule and its DataLoaders."""
+    first = _call(TrainHandler(), "lightning.train", model=MODEL, trainer=TRAINER, datamodule=DATAMODULE)
+    second = _call(TrainHandler(), "lightning.train", model=MODEL, trainer=TRAINER, datamodule=DATAMODULE)
+    _call(ValidateHandler(), "lightning.validate", model=MODEL, trainer=TRAINER, datamodule=DATAMODULE)
+
+    # 16 samples in batches of 4 from the datamodule, not the model's 64
+    assert first["trainer"]["steps_run"] == second["trainer"]["steps_run"] == 4
+    assert CountingDataModule.instances == 1
+    (datamodule, _, _), = _datamodules.values()
+    # One train and one val DataLoader, reused by every call
+    assert datamodule.loaders_built == 2
+
+
+def test_loader_defaults_fill_accepted_kwargs():
+    """Tuned loader settings fill only the arguments the class accepts."""
+    datamodule = load_datamodule({"_target_": f"{__name__}.CountingDataModule", "batch_size": 2})
+    expected = loader_defaults()
+
+    # prefetch_factor is not a CountingDataModule argument, so it is not passed
+    assert datamodule.loader_kwargs == {
+        "batch_size": 2,
+        "num_workers": expected["num_workers"],
+        "persistent_workers": expected["num_workers"] > 0,
+        "pin_memory": torch.cuda.is_available(),
+    }
+    assert expected["num_workers"] <= min(4, os.cpu_count() or 1)
+    assert loader_defaults(0) == {
+        "num_workers": 0,
+        "persistent_workers": False,
+        "prefetch_factor": None,
+        "pin_memory": torch.cuda.is_available(),
+    }
+
+
+def test_datamodule_target_must_be_a_datamodule():
+    """A _target_ that is not a LightningDataModule is a TypeError."""
+    with pytest.raises(TypeError, match="not a LightningDataModule"):
+        _call(TrainHandler(), "lightning.train", model=MODEL, datamodule=MODEL)
+
+
+def _start_workers(config):
+    """Read a batch outside a Trainer run; return the val loader and its worker processes."""
+    with base.use_datamodule({"datamodule": config}) as datamodule:
+        loader = datamodule.val_dataloader()
+        next(iter(loader))
+        return loader, list(loader._iterator._workers)
+
+
+def test_least_recently_used_datamodule_is_evicted_and_its_workers_stopped(monkeypatch):
+    """Beyond the limit the oldest datamodule is dropped and its workers shut down."""
+    monkeypatch.setattr(base, "_MAX_DATAMODULES", 2)
+    configs = [
+        {**DATAMODULE, "batch_size": size, "num_workers": 1, "persistent_workers": True}
+        for size in (2, 4, 8)
+    ]
+
+    loader, workers = _start_workers(configs[0])
+    assert workers and all(w.is_alive() for w in workers)
+    _call(ValidateHandler(), "lightning.validate", model=MODEL, trainer=TRAINER, datamodule=configs[1])
+    # Using the first config again makes the second the least recently used
+    assert _start_workers(configs[0]) == (loader, workers)
+    _call(ValidateHandler(), "lightning.validate", model=MODEL, trainer=TRAINER, datamodule=configs[2])
+
+    assert CountingDataModule.instances == 3
+    assert [dm.loader_kwargs["batch_size"] for dm, _, _ in _datamodules.values()] == [2, 8]
+    assert all(w.is_alive() for w in workers)
+
+    _call(ValidateHandler(), "lightning.validate", model=MODEL, trainer=TRAINER, datamodule=configs[1])
+    assert [dm.loader_kwargs["batch_size"] for dm, _, _ in _datamodules.values()] == [8, 4]
+    assert loader._iterator is None
+    for w in workers:
+        w.join(timeout=10)
+    assert not any(w.is_alive() for w in workers)
+
+
+def test_datamodule_evicted_while_in_use_is_stopped_after_use(monkeypatch):
+    """A request still using an evicted datamodule shuts its workers down when done."""
+    monkeypatch.setattr(base, "_MAX_DATAMODULES", 1)
+    config = {**DATAMODULE, "num_workers": 1, "persistent_workers": True}
+
+    with base.use_datamodule({"datamodule": config}) as datamodule:
+        loader = datamodule.val_dataloader()
+        next(iter(loader))
+        workers = list(loader._iterator._workers)
+        _call(ValidateHandler(), "lightning.validate", model=MODEL, trainer=TRAINER, datamodule=DATAMODULE)
+        assert all(w.is_alive() for w in workers)
+
+    assert loader._iterator is None
+    for w in workers:
+        w.join(timeout=10)
+    assert not any(w.is_alive() for w in workers)
+
+
+def test_slow_build_is_shared_and_does_not_block_other_configs(monkeypatch):
+    """Concurrent misses wait for one build; hits on other configs go straight through."""
+    gate = threading.Event()
+    init = CountingDataModule.__init__
+
+    @functools.wraps(init)
+    def slow_init(self, *args, **kwargs):
+        if kwargs.get("batch_size") == 2:
+            gate.wait(10)
+        init(self, *args, **kwargs)
+
+    monkeypatch.setattr(CountingDataModule, "__init__", slow_init)
+    slow, fast = ({**DATAMODULE, "batch_size": size} for size in (2, 4))
+    with base.use_datamodule({"datamodule": fast}):
+        pass
+
+    built = []
+
+    def use_slow():
+        with base.use_datamodule({"datamodule": slow}) as datamodule:
+            built.append(datamodule)
+
+    threads = [threading.Thread(target=use_slow) for _ in range(2)]
+    for t in threads:
+        t.start()
+    while not base._building:
+        time.sleep(0.001)
+
+    start = time.monotonic()
+    with base.use_datamodule({"datamodule": fast}) as datamodule:
+        assert datamodule.loader_kwargs["batch_size"] == 4
+    assert time.monotonic() - start < 1.0
+    assert not gate.is_set()
+
+    gate.set()
+    for t in threads:
+        t.join(timeout=10)
+    assert len(built) == 2 and built[0] is built[1]
+    assert CountingDataModule.instances == 2
+    assert not base._building
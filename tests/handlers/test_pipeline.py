@@ -0,0 +1,71 @@
+import os
+
+import pytest
+import torch
+
+from lightning_mcp.handlers.pipeline import PipelineHandler
+from lightning_mcp.protocol import MCPRequest
+
+MODEL = {"_target_": "lightning_mcp.models.simple.SimpleClassifier"}
+TRAINER = {"accelerator": "cpu", "max_epochs": 1, "enable_checkpointing": False}
+
+
+def _run(params, method="lightning.pipeline"):
+    response = PipelineHandler().handle(MCPRequest(id="pipeline-1", method=method, params=params))
+    return response.result["structuredContent"]
+
+
+def test_pipeline_steps_share_one_model(temp_dir):
+    """Every step acts on the same model instance."""
+    before = os.path.join(temp_dir, "before.pt")
+    after = os.path.join(temp_dir, "after.pt")
+
+    structured = _run({
+        "model": MODEL,
+        "trainer": TRAINER,
+        "steps": [
+            {"tool": "checkpoint", "action": "save", "path": before},
+            {"tool": "train"},
+            {"tool": "validate", "trainer": {"limit_val_batches": 1}},
+            {"tool": "lightning.checkpoint", "action": "save", "path": after},
+            {"tool": "predict"},
+        ],
+    })
+
+    assert structured["status"] == "completed"
+    assert [s["tool"] for s in structured["steps"]] == [
+        "checkpoint", "train", "validate", "checkpoint", "predict",
+    ]
+    assert all(s["status"] == "completed" and s["time_ms"] >= 0 for s in structured["steps"])
+    assert "val_loss" in structured["steps"][2]["result"]["metrics"]
+    assert structured["steps"][4]["result"]["num_batches"] > 0
+    assert structured["timings_ms"]["total"] >= structured["timings_ms"]["model_load"]
+
+    # Training updated the same instance the checkpoint steps saved
+    a, b = torch.load(before), torch.load(after)
+    assert a.keys() == b.keys()
+    assert any(not torch.equal(a[k], b[k]) for k in a)
+
+
+def test_pipeline_stops_at_failed_step(temp_dir):
+    """A failing step ends the pipeline; later steps do not run."""
+    structured = _run({
+        "model": MODEL,
+        "trainer": TRAINER,
+        "steps": [
+            {"tool": "validate"},
+            {"tool": "checkpoint", "action": "load", "path": os.path.join(temp_dir, "missing.pt")},
+            {"tool": "predict"},
+        ],
+    })
+
+    assert structured["status"] == "failed"
+    assert structured["failed_step"] == 1
+    assert "FileNotFoundError" in structured["error"]
+    assert [s["status"] for s in structured["steps"]] == ["completed", "failed", "skipped"]
+
+
+def test_pipeline_rejects_unknown_tool():
+    """Unknown step tools are rejected before anything runs."""
+    with pytest.raises(ValueError, match="unknown tool"):
+        _run({"model": MODEL, "steps": [{"tool": "deploy"}]})
@@ -0,0 +1,30 @@
+import torch
+
+from lightning_mcp.handlers import base
+from lightning_mcp.handlers.base import load_model, preload_model
+
+CFG = {"_target_": "lightning_mcp.models.simple.SimpleClassifier", "input_dim": 6}
+
+
+def test_shared_load_reuses_preloaded_weights(monkeypatch, temp_dir):
+    monkeypatch.setattr(base, "_shared_weights", {})
+
+    source = load_model({"model": CFG})
+    path = f"{temp_dir}/weights.pt"
+    torch.save(source.state_dict(), path)
+
+    nbytes = preload_model(CFG, checkpoint=path)
+    assert nbytes == base.shared_weights_bytes() > 0
+
+    a = load_model({"model": CFG}, shared=True)
+    b = load_model({"model": CFG}, shared=True)
+    assert a is not b
+    assert a.model.weight.is_shared()
+    assert a.model.weight.data_ptr() == b.model.weight.data_ptr()
+    assert torch.equal(a.model.weight, source.model.weight)
+
+    # Training and unmatched configs still get their own weights
+    fresh = load_model({"model": CFG})
+    assert fresh.model.weight.data_ptr() != a.model.weight.data_ptr()
+    other = load_model({"model": {**CFG, "input_dim": 7}}, shared=True)
+    assert not other.model.weight.is_shared()
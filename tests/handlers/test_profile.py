@@ -0,0 +1,125 @@
+import json
+import os
+
+import pytest
+
+from lightning_mcp.handlers.profile import ProfileHandler
+from lightning_mcp.metrics import REGISTRY
+from lightning_mcp.protocol import MCPRequest
+
+MODEL = {"_target_": "lightning_mcp.models.simple.SimpleClassifier"}
+
+
+def test_profile_train_steps_with_chrome_trace(temp_dir):
+    """
+    Profiling training steps should return the top ops and write a Chrome trace.
+    """
+
+    trace_path = os.path.join(temp_dir, "trace.json")
+
+    response = ProfileHandler().handle(
+        MCPRequest(
+            id="profile-1",
+            method="lightning.profile",
+            params={
+                "model": MODEL,
+                "trainer": {"accelerator": "cpu"},
+                "schedule": {"wait": 1, "warmup": 1, "active": 2},
+                "top_n": 5,
+                "trace_path": trace_path,
+            },
+        )
+    )
+
+    structured = response.result["structuredContent"]
+    assert structured["mode"] == "train"
+    assert structured["steps_run"] == 4
+    assert structured["complete"] is True
+    assert 0 < len(structured["ops"]) <= 5
+
+    op = structured["ops"][0]
+    assert {"name", "calls", "self_cpu_time_ms", "self_cpu_memory_bytes", "input_shapes"} <= set(op)
+    times = [row["self_cpu_time_ms"] for row in structured["ops"]]
+    assert times == sorted(times, reverse=True)
+
+    assert structured["trace_path"] == trace_path
+    with open(trace_path) as f:
+        assert "traceEvents" in json.load(f)
+
+
+def test_profile_predict_steps():
+    """
+    Predict mode should profile exactly the active prediction steps.
+    """
+
+    response = ProfileHandler().handle(
+        MCPRequest(
+            id="profile-2",
+            method="lightning.profile",
+            params={
+                "model": MODEL,
+                "trainer": {"accelerator": "cpu"},
+                "mode": "predict",
+                "schedule": {"wait": 0, "warmup": 0, "active": 2},
+                "sort_by": "count",
+            },
+        )
+    )
+
+    structured = response.result["structuredContent"]
+    assert structured["steps_run"] == 2
+    assert any("linear" in row["name"] for row in structured["ops"])
+    assert structured["trace_path"] is None
+
+
+def test_profile_rejects_empty_active_window():
+    """
+    A schedule without active steps is rejected.
+    """
+
+    with pytest.raises(ValueError, match="schedule.active"):
+        ProfileHandler().handle(
+            MCPRequest(
+                id="profile-3",
+                method="lightning.profile",
+                params={"model": MODEL, "schedule": {"active": 0}},
+            )
+        )
+
+
+def test_profile_train_is_not_recorded_as_training():
+    """
+    Profiled fits must not count towards the server's training metrics.
+    """
+
+    runs = ("lightning_mcp_train_runs_total", ())
+    before = REGISTRY.collect()[0].get(runs, 0.0)
+
+    ProfileHandler().handle(
+        MCPRequest(
+            id="profile-metrics",
+            method="lightning.profile",
+            params={
+                "model": MODEL,
+                "trainer": {"accelerator": "cpu"},
+                "schedule": {"wait": 0, "warmup": 0, "active": 1},
+            },
+        )
+    )
+
+    assert REGISTRY.collect()[0].get(runs, 0.0) == before
+
+
+def test_profile_rejects_unknown_schedule_keys():
+    """
+    Misspelled schedule keys are rejected instead of silently ignored.
+    """
+
+    with pytest.raises(ValueError, match="Unknown schedule key"):
+        ProfileHandler().handle(
+            MCPRequest(
+                id="profile-4",
+                method="lightning.profile",
+                params={"model": MODEL, "schedule": {"active": 2, "repeat": 3}},
+            )
+        )
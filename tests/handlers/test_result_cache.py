@@ -0,0 +1,140 @@
+import os
+import time
+
+import pytest
+import torch
+
+from lightning_mcp.handlers import base
+from lightning_mcp.handlers.base import preload_model
+from lightning_mcp.handlers.test import TestHandler
+from lightning_mcp.handlers.validate import ValidateHandler
+from lightning_mcp.protocol import MCPRequest
+from lightning_mcp.result_cache import ResultCache, configure_result_cache
+
+MODEL = {"_target_": "lightning_mcp.models.simple.SimpleClassifier"}
+TRAINER = {"accelerator": "cpu", "deterministic": True}
+
+
+@pytest.fixture
+def cache_dir(temp_dir):
+    path = os.path.join(temp_dir, "results")
+    configure_result_cache(path)
+    yield path
+    configure_result_cache(None)
+
+
+def _call(handler, method, **params):
+    response = handler.handle(MCPRequest(id="cache-1", method=method, params=params))
+    return response.result["structuredContent"]
+
+
+def test_deterministic_validate_is_served_from_cache(cache_dir):
+    """A repeated deterministic, seeded validate is answered from the cache."""
+    first = _call(ValidateHandler(), "lightning.validate", model=MODEL, trainer=TRAINER, seed=7)
+    second = _call(ValidateHandler(), "lightning.validate", model=MODEL, trainer=TRAINER, seed=7)
+
+    assert "cached" not in first
+    assert second["cached"] is True
+    assert second["metrics"] == first["metrics"]
+    assert len(os.listdir(cache_dir)) == 1
+
+    # Same seed without the cache reproduces the stored metrics
+    fresh = _call(ValidateHandler(), "lightning.validate", model=MODEL, trainer=TRAINER, seed=7, cache=False)
+    assert "cached" not in fresh
+    assert fresh["metrics"] == first["metrics"]
+
+    # A different tool or seed is a different entry
+    assert "cached" not in _call(TestHandler(), "lightning.test", model=MODEL, trainer=TRAINER, seed=7)
+    assert "cached" not in _call(ValidateHandler(), "lightning.validate", model=MODEL, trainer=TRAINER, seed=8)
+
+
+def test_cache_requires_seed_and_deterministic(cache_dir):
+    """Requests without a seed or deterministic trainer never touch the cache."""
+    for params in (
+        {"trainer": TRAINER},
+        {"trainer": {"accelerator": "cpu"}, "seed": 7},
+    ):
+        _call(ValidateHandler(), "lightning.validate", model=MODEL, **params)
+        assert "cached" not in _call(ValidateHandler(), "lightning.validate", model=MODEL, **params)
+    assert os.listdir(cache_dir) == []
+
+
+@pytest.mark.usefixtures("cache_dir")
+def test_checkpoint_content_is_part_of_the_key(temp_dir):
+    """Rewriting the checkpoint file invalidates its cached results."""
+    from lightning_mcp.models.simple import SimpleClassifier
+
+    ckpt = os.path.join(temp_dir, "weights.pt")
+    state = SimpleClassifier().state_dict()
+    torch.save(state, ckpt)
+    params = {"model": MODEL, "trainer": TRAINER, "seed": 7, "ckpt_path": ckpt}
+
+    _call(ValidateHandler(), "lightning.validate", **params)
+    assert _call(ValidateHandler(), "lightning.validate", **params)["cached"] is True
+
+    torch.save({k: v + 1 for k, v in state.items()}, ckpt)
+    assert "cached" not in _call(ValidateHandler(), "lightning.validate", **params)
+
+
+def test_checkpoint_digests_are_bounded(temp_dir, monkeypatch):
+    """Rewrites replace a path's digest; the least recently used paths are dropped."""
+    from lightning_mcp import result_cache
+
+    monkeypatch.setattr(result_cache, "_MAX_DIGESTS", 2)
+    cache = ResultCache(os.path.join(temp_dir, "results"))
+    paths = [os.path.join(temp_dir, f"{name}.pt") for name in "abc"]
+    for i, path in enumerate(paths):
+        torch.save({"w": torch.tensor([float(i)])}, path)
+
+    first = cache.key("lightning.validate", {}, paths[0])
+    for version in range(3):
+        torch.save({"w": torch.tensor([float(version + 10)])}, paths[0])
+        os.utime(paths[0], ns=(0, version + 1))
+        assert cache.key("lightning.validate", {}, paths[0]) != first
+    assert len(cache._digests) == 1
+
+    cache.key("lightning.validate", {}, paths[1])
+    cache.key("lightning.validate", {}, paths[0])
+    cache.key("lightning.validate", {}, paths[2])
+    assert list(cache._digests) == [os.path.abspath(p) for p in (paths[0], paths[2])]
+
+
+def test_ttl_and_size_eviction(temp_dir):
+    """Entries expire after the TTL and the oldest go first over the size budget."""
+    cache = ResultCache(os.path.join(temp_dir, "ttl"), ttl_seconds=0.05)
+    key = cache.key("validate", {"seed": 1})
+    cache.put(key, {"metrics": {"val_loss": 1.0}})
+    assert cache.get(key)["metrics"] == {"val_loss": 1.0}
+    time.sleep(0.1)
+    assert cache.get(key) is None
+
+    cache = ResultCache(os.path.join(temp_dir, "size"), max_bytes=300)
+    keys = [cache.key("validate", {"seed": i}) for i in range(3)]
+    for i, key in enumerate(keys):
+        cache.put(key, {"metrics": {"val_loss": float(i)}, "pad": "x" * 100})
+        time.sleep(0.01)
+    assert cache.get(keys[0]) is None
+    assert cache.get(keys[2]) is not None
+
+
+@pytest.mark.usefixtures("cache_dir")
+def test_preloaded_weights_are_part_of_the_key(monkeypatch, temp_dir):
+    """Re-preloading different weights for a config does not hit the old entries."""
+    from lightning_mcp.models.simple import SimpleClassifier
+
+    monkeypatch.setattr(base, "_shared_weights", {})
+    monkeypatch.setattr(base, "_shared_digests", {})
+    ckpt = os.path.join(temp_dir, "preload.pt")
+    state = SimpleClassifier().state_dict()
+    torch.save(state, ckpt)
+    params = {"model": MODEL, "trainer": TRAINER, "seed": 7}
+
+    preload_model(MODEL, ckpt)
+    first = _call(ValidateHandler(), "lightning.validate", **params)
+    assert _call(ValidateHandler(), "lightning.validate", **params)["cached"] is True
+
+    torch.save({k: v * 2 for k, v in state.items()}, ckpt)
+    preload_model(MODEL, ckpt)
+    second = _call(ValidateHandler(), "lightning.validate", **params)
+    assert "cached" not in second
+    assert second["metrics"] != first["metrics"]
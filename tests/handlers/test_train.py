@@ -57,3 +57,95 @@ def test_train_simple_model_cpu():
     # Metrics must exist (values may vary)
     assert "metrics" in structured
     assert isinstance(structured["metrics"], dict)
+
+    # Throughput / data-stall report
+    assert structured["performance"]["samples"] == 64
+    assert structured["performance"]["steps"] == 8
+
+
+def test_train_resume_from_lightning_checkpoint(temp_dir):
+    """
+    Resuming from a full Lightning checkpoint should continue from the
+    stored step and only run the remaining epochs.
+    """
+
+    handler = TrainHandler()
+    model_config = {
+        "_target_": "lightning_mcp.models.simple.SimpleClassifier",
+        "input_dim": 4,
+        "num_classes": 3,
+    }
+
+    first = handler.handle(
+        MCPRequest(
+            id="train-first",
+            method="lightning.train",
+            params={
+                "model": model_config,
+                "trainer": {"max_epochs": 1, "accelerator": "cpu"},
+                "checkpoint": {"dirpath": str(temp_dir)},
+            },
+        )
+    )
+    saves = first.result["structuredContent"]["checkpointing"]["saves"]
+    ckpt_path = saves[-1]["path"]
+
+    response = handler.handle(
+        MCPRequest(
+            id="train-resume",
+            method="lightning.train",
+            params={
+                "model": model_config,
+                "trainer": {"max_epochs": 2, "accelerator": "cpu"},
+                "resume_from": ckpt_path,
+            },
+        )
+    )
+
+    trainer_info = response.result["structuredContent"]["trainer"]
+    assert trainer_info["resumed_from"] == ckpt_path
+    assert trainer_info["start_step"] == 8
+    assert trainer_info["steps_run"] == 8
+    assert trainer_info["global_step"] == 16
+
+
+def test_train_resume_completed_run(temp_dir):
+    """Resuming a run that already reached max_epochs reports zero steps run."""
+
+    handler = TrainHandler()
+    model_config = {
+        "_target_": "lightning_mcp.models.simple.SimpleClassifier",
+        "input_dim": 4,
+        "num_classes": 3,
+    }
+    trainer_config = {"max_epochs": 1, "accelerator": "cpu"}
+
+    first = handler.handle(
+        MCPRequest(
+            id="train-complete",
+            method="lightning.train",
+            params={
+                "model": model_config,
+                "trainer": trainer_config,
+                "checkpoint": {"dirpath": str(temp_dir)},
+            },
+        )
+    )
+    ckpt_path = first.result["structuredContent"]["checkpointing"]["saves"][-1]["path"]
+
+    response = handler.handle(
+        MCPRequest(
+            id="train-resume-complete",
+            method="lightning.train",
+            params={
+                "model": model_config,
+                "trainer": trainer_config,
+                "resume_from": ckpt_path,
+            },
+        )
+    )
+
+    trainer_info = response.result["structuredContent"]["trainer"]
+    assert trainer_info["start_step"] == 8
+    assert trainer_info["global_step"] == 8
+    assert trainer_info["steps_run"] == 0
@@ -40,3 +40,23 @@ def test_train_missing_model_config():
 
     with pytest.raises(ValueError):
         handler.handle(request)
+
+
+def test_train_resume_from_missing_checkpoint():
+    """
+    TrainHandler must fail fast if the checkpoint to resume from does not exist.
+    """
+
+    handler = TrainHandler()
+
+    request = MCPRequest(
+        id="missing-ckpt",
+        method="lightning.train",
+        params={
+            "model": {"_target_": "lightning_mcp.models.simple.SimpleClassifier"},
+            "resume_from": "/does/not/exist.ckpt",
+        },
+    )
+
+    with pytest.raises(FileNotFoundError):
+        handler.handle(request)
@@ -0,0 +1,105 @@
+import torch
+
+from lightning_mcp.handlers.train import TrainHandler
+from lightning_mcp.lightning.callbacks import _HostBufferPool, _snapshot_to_host
+from lightning_mcp.protocol import MCPRequest
+
+
+def test_train_async_checkpointing(temp_dir):
+    """
+    TrainHandler should write periodic checkpoints in the background and
+    report how long the training thread was blocked for each save.
+    """
+
+    handler = TrainHandler()
+
+    request = MCPRequest(
+        id="train-ckpt-1",
+        method="lightning.train",
+        params={
+            "model": {
+                "_target_": "lightning_mcp.models.simple.SimpleClassifier",
+                "input_dim": 4,
+                "num_classes": 3,
+            },
+            "trainer": {
+                "max_epochs": 1,
+                "accelerator": "cpu",
+            },
+            "checkpoint": {
+                "dirpath": str(temp_dir),
+                "every_n_train_steps": 4,
+            },
+        },
+    )
+
+    response = handler.handle(request)
+    structured = response.result["structuredContent"]
+
+    report = structured["checkpointing"]
+    # 64 samples / batch_size 8 = 8 steps -> saves at steps 4 and 8
+    assert report["num_saves"] == 2
+    assert [s["step"] for s in report["saves"]] == [4, 8]
+
+    for save in report["saves"]:
+        assert save["blocked_ms"] >= 0
+        assert save["size_bytes"] > 0
+        ckpt = torch.load(save["path"], weights_only=False)
+        assert ckpt["global_step"] == save["step"]
+        assert "optimizer_states" in ckpt
+        assert "model.weight" in ckpt["state_dict"]
+
+    # Atomic publish leaves no temporary files behind
+    assert sorted(p.name for p in temp_dir.iterdir()) == [
+        "epoch=0-step=4.ckpt",
+        "epoch=0-step=8.ckpt",
+    ]
+
+
+def test_train_async_checkpointing_dedups_step_and_epoch_triggers(temp_dir):
+    """The epoch-end save at step 8 coincides with the step trigger and is skipped."""
+
+    handler = TrainHandler()
+
+    request = MCPRequest(
+        id="train-ckpt-2",
+        method="lightning.train",
+        params={
+            "model": {
+                "_target_": "lightning_mcp.models.simple.SimpleClassifier",
+                "input_dim": 4,
+                "num_classes": 3,
+            },
+            "trainer": {
+                "max_epochs": 1,
+                "accelerator": "cpu",
+            },
+            "checkpoint": {
+                "dirpath": str(temp_dir),
+                "every_n_train_steps": 4,
+                "every_n_epochs": 1,
+            },
+        },
+    )
+
+    report = handler.handle(request).result["structuredContent"]["checkpointing"]
+
+    assert [s["step"] for s in report["saves"]] == [4, 8]
+
+
+def test_snapshot_reuses_pooled_host_buffers():
+    """Buffers given back to the pool are reused by the next snapshot."""
+
+    pool = _HostBufferPool()
+    weight = torch.randn(3, 4)
+
+    snapshot, buffers, ready = _snapshot_to_host({"w": weight, "step": 1}, pool)
+    assert ready is None
+    assert torch.equal(snapshot["w"], weight)
+    assert snapshot["w"].data_ptr() != weight.data_ptr()
+
+    pool.give(buffers)
+    weight.add_(1.0)
+    again, _, _ = _snapshot_to_host({"w": weight, "step": 2}, pool)
+    assert again["w"].data_ptr() == buffers[0].data_ptr()
+    assert torch.equal(again["w"], weight)
@@ -0,0 +1,104 @@
+import pytest
+import torch
+
+from lightning_mcp.handlers.test import TestHandler
+from lightning_mcp.handlers.validate import ValidateHandler
+from lightning_mcp.lightning.batch_cache import BatchCache, configure_batch_cache
+from lightning_mcp.models.simple import SimpleClassifier
+from lightning_mcp.protocol import MCPRequest
+
+MODEL = {"_target_": "lightning_mcp.models.simple.SimpleClassifier"}
+TRAINER = {"accelerator": "cpu"}
+
+
+@pytest.fixture
+def loader_calls(monkeypatch):
+    """Count how often SimpleClassifier builds its val/test dataloaders."""
+    calls = {"val": 0, "test": 0}
+    for stage in calls:
+        original = getattr(SimpleClassifier, f"{stage}_dataloader")
+
+        def counted(self, _stage=stage, _original=original):
+            calls[_stage] += 1
+            return _original(self)
+
+        monkeypatch.setattr(SimpleClassifier, f"{stage}_dataloader", counted)
+    return calls
+
+
+@pytest.fixture
+def batch_cache():
+    cache = configure_batch_cache(1024 * 1024)
+    yield cache
+    configure_batch_cache(None)
+
+
+def _call(handler, method, **params):
+    response = handler.handle(MCPRequest(id="batches-1", method=method, params=params))
+    return response.result["structuredContent"]
+
+
+def test_repeated_evaluation_replays_recorded_batches(batch_cache, loader_calls):
+    """The second identical evaluation replays the first one's batches."""
+    first = _call(ValidateHandler(), "lightning.validate", model=MODEL, trainer=TRAINER, seed=5)
+    second = _call(ValidateHandler(), "lightning.validate", model=MODEL, trainer=TRAINER, seed=5)
+    _call(TestHandler(), "lightning.test", model=MODEL, trainer=TRAINER)
+    _call(TestHandler(), "lightning.test", model=MODEL, trainer=TRAINER)
+
+    assert loader_calls == {"val": 1, "test": 1}
+    assert second["metrics"] == first["metrics"]
+    # 32 samples of 4 float32 features plus int64 labels, per stage
+    assert len(batch_cache) == 2
+    assert batch_cache.nbytes == 2 * 32 * (4 * 4 + 8)
+
+    # A different model config is different data
+    _call(ValidateHandler(), "lightning.validate", model={**MODEL, "input_dim": 8}, trainer=TRAINER)
+    assert loader_calls["val"] == 2
+
+
+def test_seed_is_part_of_the_key(batch_cache, loader_calls):
+    """SimpleClassifier draws its data from the seeded RNG: another seed is other data."""
+    seven = _call(ValidateHandler(), "lightning.validate", model=MODEL, trainer=TRAINER, seed=7)
+    eight = _call(ValidateHandler(), "lightning.validate", model=MODEL, trainer=TRAINER, seed=8)
+    _call(ValidateHandler(), "lightning.validate", model=MODEL, trainer=TRAINER)
+
+    assert loader_calls["val"] == 3
+    assert len(batch_cache) == 3
+    assert eight["metrics"] != seven["metrics"]
+    again = _call(ValidateHandler(), "lightning.validate", model=MODEL, trainer=TRAINER, seed=8)
+    assert loader_calls["val"] == 3
+    assert again["metrics"] == eight["metrics"]
+
+
+def test_data_over_budget_is_not_recorded(loader_calls):
+    """Data larger than the whole budget always goes through the loader."""
+    configure_batch_cache(100)
+    try:
+        _call(ValidateHandler(), "lightning.validate", model=MODEL, trainer=TRAINER)
+        _call(ValidateHandler(), "lightning.validate", model=MODEL, trainer=TRAINER)
+    finally:
+        configure_batch_cache(None)
+
+    # First call: partial recording, then the regular loader; second: regular only
+    assert loader_calls["val"] == 3
+
+
+def test_least_recently_used_entries_are_evicted():
+    """The entry used longest ago makes room first."""
+    cache = BatchCache(max_bytes=2 * 64)
+
+    def batches():
+        return [torch.zeros(16)]  # 64 bytes
+
+    cache.loader("a", batches)
+    cache.loader("b", batches)
+    cache.loader("a", batches)
+    cache.loader("c", batches)
+
+    assert len(cache) == 2
+    assert cache.nbytes == 128
+    # "a" was used after "b", so "b" made room for "c"
+    assert list(cache.loader("a", lambda: pytest.fail("a was evicted")))[0].shape == (16,)
+    recorded = []
+    cache.loader("b", lambda: recorded.append("b") or batches())
+    assert recorded == ["b"]
@@ -0,0 +1,54 @@
+import time
+
+from lightning_mcp.lightning.trainer import LightningTrainerService
+from lightning_mcp.models.simple import SimpleClassifier
+
+
+def test_performance_summary_for_fit_and_validate():
+    service = LightningTrainerService(
+        max_epochs=2,
+        accelerator="cpu",
+        enable_checkpointing=False,
+        limit_val_batches=2,
+    )
+    model = SimpleClassifier()
+    service.fit(model)
+
+    perf = service.performance.summary("fit")
+    # 64 samples per epoch in batches of 8; in-fit validation is not counted
+    assert perf["steps"] == 16
+    assert perf["samples"] == 128
+    assert [e["samples"] for e in perf["epochs"]] == [64, 64]
+    assert perf["samples_per_sec"] > 0
+    assert set(perf["time_ms"]) == {"data_wait", "forward", "backward", "optimizer"}
+    assert perf["step_ms"]["p50"] <= perf["step_ms"]["p99"] <= perf["step_ms"]["max"]
+    assert perf["bound"] in ("input", "compute")
+    assert perf["peak_rss_bytes"] > 0
+    assert service.performance.summary("validate") is None
+
+    service.validate(model)
+    perf = service.performance.summary("validate")
+    assert perf["steps"] == 2
+    assert perf["samples"] == 16
+    assert set(perf["time_ms"]) == {"data_wait", "forward"}
+
+
+
+def test_performance_data_wait_excludes_checkpoint_snapshots(temp_dir, monkeypatch):
+    def _slow_batch_end(*_args, **_kwargs):
+        time.sleep(0.01)
+
+    service = LightningTrainerService(
+        checkpoint={"dirpath": str(temp_dir), "every_n_train_steps": 100},
+        max_steps=4,
+        accelerator="cpu",
+        limit_val_batches=0,
+    )
+    # Stands in for a slow snapshot in the checkpoint callback
+    monkeypatch.setattr(service.async_checkpoint, "on_train_batch_end", _slow_batch_end)
+    service.fit(SimpleClassifier())
+
+    time_ms = service.performance.summary("fit")["time_ms"]
+    # The sleep lands in the step (optimizer phase), not in data wait
+    assert time_ms["optimizer"] >= 40
+    assert time_ms["data_wait"] < 40
@@ -0,0 +1,36 @@
+from lightning_mcp.lightning.trainer import LightningTrainerService
+from lightning_mcp.models.simple import SimpleClassifier
+from lightning_mcp.progress import Progress, track_progress
+
+
+def test_progress_reports_steps_and_batches():
+    """Tracked runs record completed steps (fit) or batches (validate) with totals."""
+
+    service = LightningTrainerService(
+        max_epochs=1,
+        accelerator="cpu",
+        enable_checkpointing=False,
+        limit_val_batches=2,
+    )
+    model = SimpleClassifier()
+    progress = Progress()
+
+    with track_progress(progress):
+        service.fit(model)
+        # 64 samples / batch_size 8; in-fit validation does not reset it
+        assert progress.state == (8, 8)
+
+        service.validate(model)
+        assert progress.state == (2, 2)
+
+
+def test_progress_untracked_run_records_nothing():
+    """Without a tracking scope the reporter is a no-op."""
+
+    progress = Progress()
+    with track_progress(progress):
+        pass
+    LightningTrainerService(max_steps=2, accelerator="cpu", enable_checkpointing=False).fit(
+        SimpleClassifier()
+    )
+    assert progress.state is None
@@ -0,0 +1,183 @@
+import json
+import os
+import threading
+
+import numpy as np
+import pytest
+import torch
+from pytorch_lightning import Trainer
+
+from lightning_mcp.handlers.data import DataHandler
+from lightning_mcp.lightning.shards import (
+    ShardedBatchLoader,
+    ShardedDataModule,
+    ShardedDataset,
+    ingest,
+)
+from lightning_mcp.models.simple import SimpleClassifier
+
+
+@pytest.fixture
+def npz(temp_dir):
+    path = os.path.join(temp_dir, "data.npz")
+    x = np.arange(40, dtype=np.float32).reshape(10, 4)
+    np.savez(path, x=x, y=np.arange(10) % 3)
+    return path
+
+
+def test_csv_ingest_and_in_order_batches(temp_dir):
+    source = os.path.join(temp_dir, "data.csv")
+    with open(source, "w") as f:
+        f.write("a,label,b\n")
+        for i in range(10):
+            f.write(f"{i}.5,{i % 3},{-i}\n")
+
+    dataset = ingest(source, os.path.join(temp_dir, "ds"), shard_rows=3, label_column="label")
+    info = dataset.describe()
+    assert info["rows"] == 10
+    assert info["shard_rows"] == [3, 3, 3, 1]
+    assert info["fields"]["x"]["shape"] == [2]
+
+    batches = list(ShardedBatchLoader(dataset, batch_size=2, fields=["x", "y"]))
+    assert [len(y) for _, y in batches] == [2, 2, 2, 2, 2]
+    x = torch.cat([b[0] for b in batches])
+    y = torch.cat([b[1] for b in batches])
+    assert torch.equal(x[:, 0], torch.arange(10) + 0.5)
+    assert torch.equal(x[:, 1], -torch.arange(10).float())
+    assert torch.equal(y, torch.arange(10) % 3)
+
+    with pytest.raises(FileExistsError):
+        ingest(source, os.path.join(temp_dir, "ds"))
+
+
+def test_raw_binary_shards_are_memory_mapped(npz, temp_dir):
+    dataset = ingest(npz, os.path.join(temp_dir, "ds"), shard_rows=4)
+    # Rewrite the index to point at raw copies of the .npy shards
+    for entry in dataset.shards:
+        for name, file in entry["files"].items():
+            raw = file.replace(".npy", ".bin")
+            np.load(os.path.join(dataset.path, file)).tofile(os.path.join(dataset.path, raw))
+            entry["files"][name] = raw
+    with open(os.path.join(dataset.path, "index.json"), "w") as f:
+        json.dump(dataset.index, f)
+
+    raw = ShardedDataset(dataset.path)
+    x, y = next(iter(ShardedBatchLoader(raw, batch_size=4, prefetch=0)))
+    assert isinstance(raw.shard(0)["x"], np.memmap)
+    assert torch.equal(x, torch.arange(16).float().reshape(4, 4))
+    assert torch.equal(y, torch.tensor([0, 1, 2, 0]))
+
+
+def test_shuffled_ranks_split_the_rows(npz, temp_dir):
+    dataset = ingest(npz, os.path.join(temp_dir, "ds"), shard_rows=4)
+
+    seen = []
+    for rank in range(2):
+        loader = ShardedBatchLoader(dataset, batch_size=3, shuffle=True, num_replicas=2, rank=rank)
+        rows = torch.cat([x for x, _ in loader])
+        assert len(rows) == loader.num_samples == 2 + 2 + 1
+        seen.extend(rows[:, 0].long().tolist())
+    # Shards of 4, 4 and 2 rows split evenly between the two ranks
+    assert sorted(seen) == [r * 4 for r in range(10)]
+
+
+def test_datamodule_trains_from_shards(npz, temp_dir):
+    path = DataHandler().run({
+        "action": "ingest", "source": npz, "output": os.path.join(temp_dir, "ds"), "shard_rows": 4,
+    })["path"]
+    described = DataHandler().run({"action": "describe", "path": path})
+    assert described["num_shards"] == 3
+    assert described["fields"]["y"]["dtype"] == np.dtype(np.int64).str
+
+    datamodule = ShardedDataModule(train=path, val=path, batch_size=4, seed=0)
+    trainer = Trainer(
+        max_epochs=2, accelerator="cpu", logger=False, enable_progress_bar=False,
+        enable_checkpointing=False, enable_model_summary=False,
+    )
+    trainer.fit(SimpleClassifier(), datamodule=datamodule)
+    assert trainer.global_step == 2 * 3
+
+
+def test_data_tool_errors(temp_dir):
+    with pytest.raises(FileNotFoundError):
+        DataHandler().run({"action": "describe", "path": str(temp_dir)})
+    with pytest.raises(ValueError, match="Unsupported"):
+        DataHandler().run({
+            "action": "ingest", "source": __file__, "output": os.path.join(temp_dir, "ds"),
+        })
+    assert not os.path.exists(os.path.join(temp_dir, "ds"))
+    with pytest.raises(ValueError, match="Unknown action"):
+        DataHandler().run({"action": "convert"})
+
+
+@pytest.mark.parametrize("bad_row", ["7.5,x,1", "7.5,1"])
+def test_failed_csv_ingest_leaves_no_dataset(temp_dir, bad_row):
+    source = os.path.join(temp_dir, "data.csv")
+    with open(source, "w") as f:
+        f.write("a,label,b\n")
+        for i in range(6):
+            f.write(f"{i}.5,{i % 3},{-i}\n")
+        f.write(f"{bad_row}\n")
+
+    # The first two shards are written before the bad row is reached
+    output = os.path.join(temp_dir, "ds")
+    with pytest.raises(ValueError):
+        ingest(source, output, shard_rows=3, label_column="label")
+    assert not os.path.exists(output)
+
+    # An existing directory is kept, without the partial shards
+    os.makedirs(output)
+    with pytest.raises(ValueError):
+        ingest(source, output, shard_rows=3, label_column="label")
+    assert os.listdir(output) == []
+
+
+def test_compressed_npz_is_streamed_per_shard(temp_dir):
+    source = os.path.join(temp_dir, "data.npz")
+    x = np.arange(70, dtype=np.float64).reshape(7, 5, 2)
+    np.savez_compressed(source, x=x, label=np.arange(7, dtype=np.int16))
+
+    dataset = ingest(source, os.path.join(temp_dir, "ds"), shard_rows=3)
+    assert dataset.describe()["shard_rows"] == [3, 3, 1]
+    assert dataset.fields["x"] == {"dtype": x.dtype.str, "shape": [5, 2]}
+    xs, labels = zip(*ShardedBatchLoader(dataset, batch_size=7, fields=["x", "label"]), strict=True)
+    assert np.array_equal(xs[0].numpy(), x)
+    assert labels[0].tolist() == list(range(7))
+
+    fortran = os.path.join(temp_dir, "fortran.npz")
+    np.savez(fortran, x=np.asfortranarray(x))
+    with pytest.raises(ValueError, match="Fortran"):
+        ingest(fortran, os.path.join(temp_dir, "ds2"))
+
+
+def test_epochs_cut_short_still_reshuffle(npz, temp_dir):
+    dataset = ingest(npz, os.path.join(temp_dir, "ds"), shard_rows=4)
+    loader = ShardedBatchLoader(dataset, batch_size=10, shuffle=True, seed=0, prefetch=0)
+
+    # Only the first batch of each epoch is taken, as with limit_train_batches
+    first = [next(iter(loader))[1].tolist() for _ in range(3)]
+    assert len({tuple(y) for y in first}) == 3
+    loader.set_epoch(1)
+    assert next(iter(loader))[1].tolist() == first[1]
+
+
+def test_stopping_early_does_not_wait_for_prefetch(npz, temp_dir, monkeypatch):
+    dataset = ingest(npz, os.path.join(temp_dir, "ds"), shard_rows=2)
+    release = threading.Event()
+    warm = dataset.warm
+
+    def slow_warm(i):
+        if i > 0:
+            release.wait()
+        return warm(i)
+
+    monkeypatch.setattr(dataset, "warm", slow_warm)
+    batches = iter(ShardedBatchLoader(dataset, batch_size=2, prefetch=2))
+    next(batches)
+    try:
+        closer = threading.Thread(target=batches.close)
+        closer.start()
+        closer.join(timeout=5)
+        assert not closer.is_alive()
+    finally:
+        release.set()
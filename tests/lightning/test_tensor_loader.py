@@ -0,0 +1,85 @@
+import pytest
+import pytorch_lightning as pl
+import torch
+from torch.utils.data import DataLoader, TensorDataset
+
+from lightning_mcp.lightning.tensor_loader import TensorBatchLoader
+from lightning_mcp.models.simple import SimpleClassifier
+
+
+@pytest.fixture
+def tensors():
+    return torch.arange(20).float().unsqueeze(1), torch.arange(20)
+
+
+def test_in_order_batches_match_dataloader(tensors):
+    loader = TensorBatchLoader(*tensors, batch_size=8)
+    expected = list(DataLoader(TensorDataset(*tensors), batch_size=8))
+
+    batches = list(loader)
+    assert len(loader) == len(batches) == 3
+    for (x, y), (ex, ey) in zip(batches, expected, strict=True):
+        assert torch.equal(x, ex)
+        assert torch.equal(y, ey)
+    # Slices are views of the source tensors
+    assert batches[0][0].data_ptr() == tensors[0].data_ptr()
+
+    assert [len(y) for _, y in TensorBatchLoader(*tensors, batch_size=8, drop_last=True)] == [8, 8]
+
+
+def test_shuffle_is_a_new_permutation_each_epoch(tensors):
+    loader = TensorBatchLoader(*tensors, batch_size=6, shuffle=True, seed=1)
+    first = torch.cat([y for _, y in loader])
+    second = torch.cat([y for _, y in loader])
+
+    assert sorted(first.tolist()) == list(range(20))
+    assert not torch.equal(first, second)
+    # Inputs and labels stay paired
+    for x, y in loader:
+        assert torch.equal(x.squeeze(1).long(), y)
+
+    loader.set_epoch(0)
+    assert torch.equal(torch.cat([y for _, y in loader]), first)
+
+
+@pytest.mark.parametrize("shuffle", [False, True])
+def test_shards_cover_all_samples(tensors, shuffle):
+    shards = [
+        torch.cat([y for _, y in TensorBatchLoader(
+            *tensors, batch_size=4, shuffle=shuffle, num_replicas=3, rank=rank
+        )])
+        for rank in range(3)
+    ]
+
+    # ceil(20 / 3) = 7 samples each, padded by wrapping around
+    assert [len(s) for s in shards] == [7, 7, 7]
+    assert set(torch.cat(shards).tolist()) == set(range(20))
+
+    with pytest.raises(ValueError, match="rank"):
+        TensorBatchLoader(*tensors, num_replicas=2, rank=2)
+
+
+def test_epochs_cut_short_still_reshuffle(tensors):
+    """limit_train_batches stops each epoch early; the next one gets a new order."""
+    seen = []
+
+    class Recorder(SimpleClassifier):
+        def __init__(self):
+            super().__init__(input_dim=1, num_classes=20)
+
+        def train_dataloader(self):
+            return TensorBatchLoader(*tensors, batch_size=5, shuffle=True, seed=1)
+
+        def training_step(self, batch, batch_idx):
+            seen.append(batch[1].tolist())
+            return super().training_step(batch, batch_idx)
+
+    trainer = pl.Trainer(
+        accelerator="cpu", max_epochs=3, limit_train_batches=1, limit_val_batches=0,
+        enable_checkpointing=False, logger=False, enable_progress_bar=False,
+        enable_model_summary=False,
+    )
+    trainer.fit(Recorder())
+
+    assert len(seen) == 3
+    assert len({tuple(batch) for batch in seen}) == 3
@@ -0,0 +1,61 @@
+"""Tests for the bench load generator and record/replay."""
+
+import io
+import json
+import subprocess
+import sys
+
+from lightning_mcp import bench
+
+
+def test_cli_bench_load_stdio():
+    result = subprocess.run(
+        [
+            sys.executable, "-m", "lightning_mcp.cli", "bench", "load",
+            "--duration", "1", "--concurrency", "2",
+            "--method", "tools/list=3", "--method", "initialize",
+        ],
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    assert result.returncode == 0, result.stderr
+
+    report = json.loads(result.stdout)
+    assert report["concurrency"] == 2
+    assert report["errors"] == 0
+    assert set(report["methods"]) == {"initialize", "tools/list"}
+    assert report["methods"]["tools/list"]["count"] > report["methods"]["initialize"]["count"]
+    stats = report["methods"]["tools/list"]
+    assert stats["p50_ms"] <= stats["p95_ms"] <= stats["p99_ms"] <= stats["max_ms"]
+
+
+def test_record_then_replay():
+    session = "\n".join(json.dumps(m) for m in [
+        {"id": "1", "method": "initialize", "params": {}},
+        {"method": "notifications/initialized"},
+        {"id": "2", "method": "tools/call", "params": {"name": "lightning.stats", "arguments": {}}},
+    ]) + "\n"
+    recording = io.StringIO()
+    client_out = io.StringIO()
+
+    bench.record(recording, client_in=io.StringIO(session), client_out=client_out)
+
+    # The client saw both responses; all three messages were recorded in order
+    responses = [json.loads(line) for line in client_out.getvalue().splitlines()]
+    assert sorted(r["id"] for r in responses) == ["1", "2"]
+    entries = [json.loads(line) for line in recording.getvalue().splitlines()]
+    assert [e["message"].get("method") for e in entries] == [
+        "initialize", "notifications/initialized", "tools/call",
+    ]
+    assert entries == sorted(entries, key=lambda e: e["t"])
+
+    target = bench.StdioTarget()
+    try:
+        report = bench.replay(target, recording.getvalue().splitlines(), speed=10.0)
+    finally:
+        target.close()
+
+    assert report["requests"] == 2
+    assert report["errors"] == 0
+    assert set(report["methods"]) == {"initialize", "tools/call:lightning.stats"}
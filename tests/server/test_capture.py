@@ -0,0 +1,33 @@
+from lightning_mcp.capture import OutputCapture, RequestLog
+
+
+def test_request_log_is_bounded():
+    """
+    RequestLog keeps only the most recent lines and counts the dropped ones.
+    """
+
+    log = RequestLog(max_lines=3)
+    log.write("a\nb\nc\nd\ne\n", "stdout")
+
+    snapshot = log.snapshot()
+    assert snapshot["output"] == ["[stdout] c", "[stdout] d", "[stdout] e"]
+    assert snapshot["dropped"] == 2
+
+
+def test_output_routed_to_current_request():
+    """
+    Writes made inside a request scope land in that request's log only.
+    """
+
+    capture = OutputCapture()
+
+    with capture.request() as first:
+        capture.route("from first\n", "stderr")
+        with capture.request() as second:
+            capture.route("from second\n", "stdout")
+        capture.route("partial line", "stderr")
+    capture.route("outside\n", "stdout")
+
+    assert first.snapshot()["output"] == ["[stderr] from first", "[stderr] partial line"]
+    assert second.snapshot()["output"] == ["[stdout] from second"]
+    assert capture.unscoped.snapshot()["output"] == ["[stdout] outside"]
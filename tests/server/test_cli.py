@@ -110,3 +110,33 @@ def test_cli_train_simple_model():
     assert content["status"] == "completed"
     assert content["model"]["class"] == "SimpleClassifier"
     assert "train_loss" in content["metrics"]
+
+
+def test_cli_diagnostics_capture_output():
+    """Output written by a handler is returned per request, not on stdout."""
+    response = run_mcp_command({
+        "id": "cli-diag-1",
+        "method": "lightning.train",
+        "params": {
+            "model": {
+                "_target_": "lightning_mcp.models.simple.SimpleClassifier",
+                "input_dim": 4,
+                "num_classes": 3,
+            },
+            "trainer": {
+                "max_epochs": 1,
+                "accelerator": "cpu",
+                "enable_model_summary": True,
+            },
+            "diagnostics": True,
+        },
+    })
+
+    assert response["id"] == "cli-diag-1"
+    assert "error" not in response
+
+    diagnostics = response["result"]["diagnostics"]
+    assert diagnostics["isolated"] is True
+    output = "\n".join(diagnostics["output"])
+    # The model summary table is printed by Lightning during fit
+    assert "Params" in output
@@ -0,0 +1,90 @@
+"""Single-flight coalescing of identical in-flight requests."""
+
+import threading
+
+from lightning_mcp.coalesce import SingleFlight, request_key
+from lightning_mcp.metrics import REGISTRY
+from lightning_mcp.protocol import MCPRequest, MCPResponse
+from lightning_mcp.tools import list_tools
+
+
+def _coalesced_count(tool: str) -> float:
+    return REGISTRY.snapshot()["counters"].get(
+        f'lightning_mcp_coalesced_requests_total{{tool="{tool}"}}', 0.0
+    )
+
+
+def _run_concurrently(flights, method, n, release_after):
+    """Issue ``n`` identical calls; the first blocks until all have joined."""
+    calls = []
+    started = threading.Event()
+    release = threading.Event()
+
+    def _fn():
+        calls.append(1)
+        started.set()
+        release.wait(timeout=10)
+        return MCPResponse(id="leader", result={"value": [1, 2, 3]})
+
+    responses = {}
+
+    def _client(i):
+        request = MCPRequest(id=f"req-{i}", method=method, params={"what": "environment"})
+        responses[i] = flights.call(request, _fn)
+
+    threads = [threading.Thread(target=_client, args=(0,))]
+    threads[0].start()
+    started.wait(timeout=10)
+    threads += [threading.Thread(target=_client, args=(i,)) for i in range(1, n)]
+    for t in threads[1:]:
+        t.start()
+    release_after()
+    release.set()
+    for t in threads:
+        t.join(timeout=10)
+    return calls, responses
+
+
+def test_identical_read_only_calls_share_one_execution():
+    flights = SingleFlight()
+    before = _coalesced_count("lightning.inspect")
+
+    def _wait_for_followers():
+        while True:
+            with flights._lock:
+                if sum(f.followers for f in flights._flights.values()) == 3:
+                    return
+
+    calls, responses = _run_concurrently(flights, "lightning.inspect", 4, _wait_for_followers)
+
+    assert len(calls) == 1
+    assert [responses[i].id for i in range(4)] == ["leader", "req-1", "req-2", "req-3"]
+    assert all(r.result == {"value": [1, 2, 3]} for r in responses.values())
+    # Followers get their own copies
+    assert responses[1].result is not responses[2].result
+    assert _coalesced_count("lightning.inspect") - before == 3
+    assert not flights._flights
+
+
+def test_tools_with_side_effects_are_not_coalesced():
+    flights = SingleFlight()
+    calls, responses = _run_concurrently(flights, "lightning.train", 3, lambda: None)
+    assert len(calls) == 3
+
+
+def test_stats_calls_are_not_coalesced():
+    # Each stats call must read the registry itself, not share a snapshot
+    flights = SingleFlight()
+    calls, responses = _run_concurrently(flights, "lightning.stats", 3, lambda: None)
+    assert len(calls) == 3
+    # ... although stats is still advertised as read-only
+    stats = next(t for t in list_tools() if t["name"] == "lightning.stats")
+    assert stats["annotations"] == {"readOnlyHint": True}
+
+
+def test_request_key_is_canonical():
+    a = request_key("lightning.validate", {"model": {"a": 1, "b": 2}, "_meta": {"timings": True}})
+    b = request_key("lightning.validate", {"model": {"b": 2, "a": 1}})
+    assert a == b
+    assert a != request_key("lightning.test", {"model": {"a": 1, "b": 2}})
+    assert a != request_key("lightning.validate", {"model": {"a": 1, "b": 3}})
@@ -0,0 +1,23 @@
+from lightning_mcp.executor import BoundedExecutor, ServerBusyError
+
+
+def test_submit_batch_retries_when_its_last_call_frees_a_slot(monkeypatch):
+    """A busy error racing with the batch's own last completion is retried, not returned."""
+    executor = BoundedExecutor(max_workers=1, queue_depth=0)
+    submit = executor.submit
+    calls = []
+
+    def _busy_once(fn, *args):
+        calls.append(args)
+        if len(calls) == 1:
+            # As if the slot was taken until just before the batch took its lock
+            raise ServerBusyError("Server busy")
+        return submit(fn, *args)
+
+    monkeypatch.setattr(executor, "submit", _busy_once)
+    try:
+        futures = executor.submit_batch(lambda x: x * 2, [21])
+        assert [f.result() for f in futures] == [42]
+        assert len(calls) == 2
+    finally:
+        executor.shutdown()
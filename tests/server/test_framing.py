@@ -0,0 +1,99 @@
+"""Content-Length framing for the stdio transport."""
+
+import io
+import json
+import subprocess
+import sys
+
+from lightning_mcp.framing import FramedReader, detect_framing
+from lightning_mcp.server import MCPServer
+
+
+def _frame(message: dict, indent: int | None = None) -> bytes:
+    body = json.dumps(message, indent=indent).encode()
+    return b"Content-Length: %d\r\n\r\n" % len(body) + body
+
+
+def _read_frames(data: bytes) -> list[dict]:
+    reader = FramedReader(io.BufferedReader(io.BytesIO(data)))
+    messages = []
+    while (body := reader.read_message()) is not None:
+        messages.append(json.loads(body))
+    return messages
+
+
+def test_framed_server_roundtrip():
+    """Framed requests get framed responses; bad bodies get -32700, notifications nothing."""
+    stdin = io.BufferedReader(io.BytesIO(
+        _frame({"id": "1", "method": "initialize", "params": {}}, indent=2)  # body spans lines
+        + _frame({"method": "notifications/initialized"})
+        + b"Content-Length: 9\r\nContent-Type: application/json\r\n\r\n{invalid}"
+        + _frame({"id": "2", "method": "tools/list", "params": {}})
+    ))
+    stdout = io.BytesIO()
+    MCPServer(stdin=stdin, stdout=stdout, framing="content-length").serve_forever()
+
+    responses = _read_frames(stdout.getvalue())
+    assert [r.get("id") for r in responses] == ["1", None, "2"]
+    assert responses[0]["result"]["serverInfo"]["name"] == "lightning-mcp"
+    assert responses[1]["error"]["code"] == -32700
+    assert responses[2]["result"]["tools"]
+
+
+def test_framed_reader_large_body_in_small_reads():
+    """A body much larger than the read buffer is assembled across many reads."""
+    blob = "x" * (1024 * 1024)
+    data = _frame({"id": "big", "blob": blob}) + _frame({"id": "small"})
+    reader = FramedReader(io.BufferedReader(io.BytesIO(data), buffer_size=4096))
+
+    assert json.loads(reader.read_message())["blob"] == blob
+    assert json.loads(reader.read_message())["id"] == "small"
+    assert reader.read_message() is None
+
+
+def test_framed_server_truncated_body():
+    """A body cut short by end of input is reported as a parse error."""
+    stdin = io.BufferedReader(io.BytesIO(b"Content-Length: 100\r\n\r\n{}"))
+    stdout = io.BytesIO()
+    MCPServer(stdin=stdin, stdout=stdout, framing="content-length").serve_forever()
+
+    (response,) = _read_frames(stdout.getvalue())
+    assert response["error"]["code"] == -32700
+
+
+def test_cli_detects_framing():
+    """The CLI answers framed input with frames and line input with lines."""
+    requests = [
+        {"id": "1", "method": "initialize", "params": {}},
+        {"id": "2", "method": "tools/list", "params": {}},
+    ]
+    framed = subprocess.run(
+        [sys.executable, "-m", "lightning_mcp.cli"],
+        input=b"".join(_frame(r) for r in requests),
+        capture_output=True,
+        timeout=120,
+        check=True,
+    )
+    assert [r["id"] for r in _read_frames(framed.stdout)] == ["1", "2"]
+
+    lines = subprocess.run(
+        [sys.executable, "-m", "lightning_mcp.cli"],
+        input="".join(json.dumps(r) + "\n" for r in requests).encode(),
+        capture_output=True,
+        timeout=120,
+        check=True,
+    )
+    assert [json.loads(line)["id"] for line in lines.stdout.splitlines()] == ["1", "2"]
+
+
+def test_detect_framing_matches_header_name_case_insensitively():
+    """Only a (possibly partial) Content-Length header selects framing, in any case."""
+
+    def _detect(data: bytes) -> str:
+        return detect_framing(io.BufferedReader(io.BytesIO(data)))
+
+    assert _detect(b"CONTENT-LENGTH: 2\r\n\r\n{}") == "content-length"
+    assert _detect(b"\r\ncontent-length: 2\r\n\r\n{}") == "content-length"
+    assert _detect(b"Cont") == "content-length"
+    assert _detect(b'{"id": "1"}\n') == "line"
+    assert _detect(b"Content-Type: application/json\r\n\r\n") == "line"
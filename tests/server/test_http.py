@@ -1,3 +1,5 @@
+import json
+
 from fastapi.testclient import TestClient
 
 from lightning_mcp.http_server import app
@@ -106,3 +108,220 @@ def test_http_inspect_environment():
     assert "python" in structured
     assert "torch" in structured
     assert "lightning" in structured
+
+
+def test_http_metrics_endpoint():
+    """GET /metrics serves request and error counts in Prometheus format."""
+    client.post("/mcp", json={"id": "m-1", "method": "tools/list", "params": {}})
+    client.post("/mcp", json={"id": "m-2", "method": "no.such.method", "params": {}})
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    text = response.text
+    assert "# TYPE lightning_mcp_requests_total counter" in text
+    assert 'lightning_mcp_requests_total{method="tools/list",tool=""}' in text
+    assert 'lightning_mcp_request_duration_seconds_bucket{method="tools/list",tool="",le="+Inf"}' in text
+    assert 'lightning_mcp_errors_total{code="-32601"}' in text
+    assert "lightning_mcp_requests_in_flight 0" in text
+    assert "process_resident_memory_bytes" in text
+    assert "lightning_mcp_torch_threads" in text
+
+
+def test_http_busy_rejects_but_cheap_methods_stay_inline():
+    """A full executor yields 429/-32000 while tools/list is still served."""
+    import threading
+
+    from lightning_mcp import http_server
+
+    http_server.configure_executor(max_workers=1, queue_depth=0)
+    release = threading.Event()
+    try:
+        blocker = http_server._executor.submit(release.wait)
+
+        busy = client.post(
+            "/mcp",
+            json={"id": "busy-1", "method": "lightning.inspect", "params": {"what": "environment"}},
+        )
+        assert busy.status_code == 429
+        assert busy.json()["error"]["code"] == -32000
+        assert busy.json()["id"] == "busy-1"
+
+        cheap = client.post("/mcp", json={"id": "busy-2", "method": "tools/list", "params": {}})
+        assert cheap.status_code == 200
+        assert "tools" in cheap.json()["result"]
+    finally:
+        release.set()
+        blocker.result()
+        http_server.configure_executor()
+
+
+def test_http_streamable_sse_response(monkeypatch):
+    """Clients accepting text/event-stream get keep-alives, then the result."""
+    from lightning_mcp import http_server
+
+    monkeypatch.setattr(http_server, "SSE_KEEPALIVE_SECONDS", 0.001)
+
+    response = client.post(
+        "/mcp",
+        json={
+            "id": "sse-1",
+            "method": "tools/call",
+            "params": {
+                "name": "lightning.inspect",
+                "arguments": {"what": "environment"},
+                "_meta": {"progressToken": "tok"},
+            },
+        },
+        headers={"Accept": "application/json, text/event-stream"},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    messages = [
+        json.loads(line[len("data: "):])
+        for line in response.text.splitlines()
+        if line.startswith("data: ")
+    ]
+    final = messages[-1]
+    assert final["id"] == "sse-1"
+    assert "python" in final["result"]["structuredContent"]
+    for note in messages[:-1]:
+        assert note["method"] == "notifications/progress"
+        assert note["params"]["progressToken"] == "tok"
+
+
+def test_http_sse_progress_counts_training_steps(monkeypatch):
+    """Progress notifications report increasing step counts, never elapsed time."""
+    from lightning_mcp import http_server
+
+    monkeypatch.setattr(http_server, "SSE_KEEPALIVE_SECONDS", 0.001)
+
+    response = client.post(
+        "/mcp",
+        json={
+            "id": "sse-train",
+            "method": "tools/call",
+            "params": {
+                "name": "lightning.train",
+                "arguments": {
+                    "model": {"_target_": "lightning_mcp.models.simple.SimpleClassifier"},
+                    "trainer": {"max_epochs": 2, "accelerator": "cpu"},
+                },
+                "_meta": {"progressToken": "train-tok"},
+            },
+        },
+        headers={"Accept": "text/event-stream"},
+    )
+
+    messages = [
+        json.loads(line[len("data: "):])
+        for line in response.text.splitlines()
+        if line.startswith("data: ")
+    ]
+    assert messages[-1]["result"]["structuredContent"]["trainer"]["global_step"] == 16
+    steps = [note["params"]["progress"] for note in messages[:-1]]
+    assert steps == sorted(set(steps))
+    for note in messages[:-1]:
+        assert isinstance(note["params"]["progress"], int)
+        assert note["params"]["total"] == 16
+
+
+def test_http_sse_disconnect_still_records_the_request(monkeypatch):
+    """A client dropping the stream does not leave the request counted as in flight."""
+    import asyncio
+    import threading
+    import time
+
+    from lightning_mcp import http_server
+    from lightning_mcp.metrics import REGISTRY
+
+    monkeypatch.setattr(http_server, "SSE_KEEPALIVE_SECONDS", 0.001)
+    release = threading.Event()
+    handle = http_server.inspect_handler.handle
+
+    def slow_handle(request):
+        release.wait(10)
+        return handle(request)
+
+    monkeypatch.setattr(http_server.inspect_handler, "handle", slow_handle)
+
+    def in_flight():
+        counters, _ = REGISTRY.collect()
+        started = counters.get(("lightning_mcp_requests_started", ()), 0.0)
+        return started - counters.get(("lightning_mcp_requests_finished", ()), 0.0)
+
+    def calls():
+        counters, _ = REGISTRY.collect()
+        key = ("lightning_mcp_requests_total", (("method", "tools/call"), ("tool", "lightning.inspect")))
+        return counters.get(key, 0.0)
+
+    body = json.dumps({
+        "id": "sse-drop",
+        "method": "tools/call",
+        "params": {"name": "lightning.inspect", "arguments": {"what": "environment"}},
+    }).encode()
+
+    async def drop_after_first_chunk():
+        """Drive the ASGI app directly: disconnect once the first SSE bytes arrive."""
+        first_chunk = asyncio.Event()
+        messages = [{"type": "http.request", "body": body, "more_body": False}]
+
+        async def receive():
+            if messages:
+                return messages.pop()
+            await first_chunk.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            if message["type"] == "http.response.body" and message.get("body"):
+                first_chunk.set()
+
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+            "method": "POST", "path": "/mcp", "raw_path": b"/mcp", "query_string": b"",
+            "root_path": "", "scheme": "http", "server": ("test", 80), "client": ("test", 1),
+            "headers": [(b"content-type", b"application/json"), (b"accept", b"text/event-stream")],
+        }
+        await app(scope, receive, send)
+
+    before, calls_before = in_flight(), calls()
+    try:
+        asyncio.run(drop_after_first_chunk())
+        # Disconnected, but the handler is still running
+        assert in_flight() == before + 1
+    finally:
+        release.set()
+    deadline = time.monotonic() + 10
+    while in_flight() != before and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert in_flight() == before
+    assert calls() == calls_before + 1
+
+
+def test_http_batch():
+    """A batch returns one array: a response per request, none for notifications."""
+    response = client.post(
+        "/mcp",
+        json=[
+            {"id": "b-1", "method": "lightning.inspect", "params": {"what": "environment"}},
+            {"method": "notifications/initialized"},
+            {"id": 2, "method": "tools/list", "params": {}},
+            {"id": "b-3", "method": "lightning.inspect", "params": {"what": "environment"}},
+            42,
+        ],
+    )
+    assert response.status_code == 200
+    payload = response.json()
+    assert [r.get("id") for r in payload] == ["b-1", "2", "b-3", None]
+    assert "error" not in payload[0] and "error" not in payload[2]
+    assert "tools" in payload[1]["result"]
+    assert payload[3]["error"]["code"] == -32600
+
+    notifications = client.post("/mcp", json=[{"method": "notifications/initialized"}])
+    assert notifications.status_code == 202
+    assert notifications.content == b""
+
+    empty = client.post("/mcp", json=[])
+    assert empty.json()["error"]["code"] == -32600
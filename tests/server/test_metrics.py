@@ -0,0 +1,69 @@
+import threading
+
+from lightning_mcp.metrics import MetricsRegistry
+
+
+def test_metrics_registry_aggregates_thread_shards():
+    registry = MetricsRegistry()
+
+    def _work():
+        for _ in range(1000):
+            start = registry.request_started()
+            registry.request_finished("tools/call", "lightning.inspect", start, None)
+
+    threads = [threading.Thread(target=_work) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    snapshot = registry.snapshot()
+    key = 'lightning_mcp_requests_total{method="tools/call",tool="lightning.inspect"}'
+    assert snapshot["counters"][key] == 4000
+    assert snapshot["histograms"][
+        'lightning_mcp_request_duration_seconds{method="tools/call",tool="lightning.inspect"}'
+    ]["count"] == 4000
+    assert snapshot["gauges"]["lightning_mcp_requests_in_flight"] == 0
+
+
+def test_metrics_render_histogram_is_cumulative():
+    registry = MetricsRegistry()
+    registry.observe("lightning_mcp_request_duration_seconds", 0.002, (("method", "m"),))
+    registry.observe("lightning_mcp_request_duration_seconds", 2.0, (("method", "m"),))
+    registry.inc_error(-32602)
+
+    text = registry.render()
+
+    assert 'lightning_mcp_request_duration_seconds_bucket{method="m",le="0.001"} 0' in text
+    assert 'lightning_mcp_request_duration_seconds_bucket{method="m",le="0.005"} 1' in text
+    assert 'lightning_mcp_request_duration_seconds_bucket{method="m",le="+Inf"} 2' in text
+    assert 'lightning_mcp_request_duration_seconds_count{method="m"} 2' in text
+    assert 'lightning_mcp_errors_total{code="-32602"} 1' in text
+
+
+def test_metrics_registry_retires_shards_of_exited_threads():
+    registry = MetricsRegistry()
+
+    for _ in range(3):
+        t = threading.Thread(target=registry.inc, args=("lightning_mcp_train_runs_total",))
+        t.start()
+        t.join()
+    assert registry.collect()[0][("lightning_mcp_train_runs_total", ())] == 3
+    assert registry._shards == []
+
+    registry.inc("lightning_mcp_train_runs_total")
+    assert registry.collect()[0][("lightning_mcp_train_runs_total", ())] == 4
+    assert len(registry._shards) == 1
+
+
+def test_metrics_const_labels_prefix_every_series():
+    registry = MetricsRegistry()
+    registry.set_const_labels((("worker", "1"),))
+    registry.inc_error(-32602)
+    registry.observe("lightning_mcp_request_duration_seconds", 0.002)
+
+    text = registry.render()
+    assert 'lightning_mcp_errors_total{worker="1",code="-32602"} 1' in text
+    assert 'lightning_mcp_request_duration_seconds_count{worker="1"} 1' in text
+    assert 'lightning_mcp_requests_in_flight{worker="1"} 0' in text
+    assert 'lightning_mcp_errors_total{worker="1",code="-32602"}' in registry.snapshot()["counters"]
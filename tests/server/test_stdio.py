@@ -1,6 +1,7 @@
 import io
 import json
 
+from lightning_mcp.handlers.base import build_tool_response
 from lightning_mcp.server import MCPServer
 
 
@@ -75,3 +76,158 @@ def test_stdio_server_inspect_environment_roundtrip():
     structured = response["result"]["structuredContent"]
     assert "python" in structured
     assert "torch" in structured
+
+
+def test_stdio_server_phase_timings():
+    """
+    Requests opting in via _meta.timings get a per-phase breakdown.
+    """
+
+    request = {
+        "id": "timings-1",
+        "method": "tools/call",
+        "params": {
+            "name": "lightning.validate",
+            "arguments": {
+                "model": {"_target_": "lightning_mcp.models.simple.SimpleClassifier"},
+                "trainer": {"accelerator": "cpu"},
+            },
+            "_meta": {"timings": True},
+        },
+    }
+
+    untimed_request = {
+        **request,
+        "id": "timings-2",
+        "params": {**request["params"], "_meta": {}},
+    }
+
+    stdin = io.StringIO(json.dumps(request) + "\n" + json.dumps(untimed_request) + "\n")
+    stdout = io.StringIO()
+
+    server = MCPServer(stdin=stdin, stdout=stdout)
+    server.serve_forever()
+
+    stdout.seek(0)
+    timed = json.loads(stdout.readline())
+    untimed = json.loads(stdout.readline())
+
+    timings = timed["result"]["_meta"]["timings"]
+    for name in ("import", "model_init", "trainer_init", "validate", "metrics", "serialize"):
+        assert timings[name] >= 0
+    assert timings["dispatch"] >= timings["validate"]
+    assert timings["response_dump"] >= 0
+
+    assert "_meta" not in untimed["result"]
+
+
+def test_stdio_server_stats_tool():
+    """
+    lightning.stats dumps the metrics registry, including training throughput.
+    """
+
+    train = {
+        "id": "stats-1",
+        "method": "tools/call",
+        "params": {
+            "name": "lightning.train",
+            "arguments": {
+                "model": {"_target_": "lightning_mcp.models.simple.SimpleClassifier"},
+                "trainer": {"max_epochs": 1, "accelerator": "cpu"},
+            },
+        },
+    }
+    stats = {
+        "id": "stats-2",
+        "method": "tools/call",
+        "params": {"name": "lightning.stats", "arguments": {}},
+    }
+
+    stdin = io.StringIO(json.dumps(train) + "\n" + json.dumps(stats) + "\n")
+    stdout = io.StringIO()
+
+    server = MCPServer(stdin=stdin, stdout=stdout)
+    server.serve_forever()
+
+    stdout.seek(0)
+    stdout.readline()
+    response = json.loads(stdout.readline())
+
+    structured = response["result"]["structuredContent"]
+    counters = structured["counters"]
+    assert counters['lightning_mcp_requests_total{method="tools/call",tool="lightning.train"}'] >= 1
+    assert counters["lightning_mcp_train_samples_total"] > 0
+    assert counters["lightning_mcp_train_steps_total"] > 0
+    assert structured["gauges"]["lightning_mcp_train_samples_per_second"] > 0
+    # The stats request itself is still in flight while the registry is read
+    assert structured["gauges"]["lightning_mcp_requests_in_flight"] == 1
+
+
+def test_stdio_server_batch():
+    """A batch larger than the executor still runs every request."""
+    from lightning_mcp.executor import BoundedExecutor
+
+    batch = [
+        {"id": f"b-{i}", "method": "lightning.inspect", "params": {"what": "environment"}}
+        for i in range(5)
+    ]
+    batch.insert(2, {"method": "notifications/initialized"})
+    stdin = io.StringIO(json.dumps(batch) + "\n" + json.dumps([]) + "\n")
+    stdout = io.StringIO()
+
+    server = MCPServer(stdin=stdin, stdout=stdout, executor=BoundedExecutor(max_workers=2, queue_depth=0))
+    server.serve_forever()
+
+    stdout.seek(0)
+    responses = json.loads(stdout.readline())
+    assert [r["id"] for r in responses] == [f"b-{i}" for i in range(5)]
+    assert all("error" not in r for r in responses)
+    assert json.loads(stdout.readline())["error"]["code"] == -32600
+
+
+def _batch_concurrency(server, n):
+    """Run a batch of ``n`` slow inspect calls; return the most that overlapped."""
+    import threading
+    import time
+
+    active, peak = [0], [0]
+    lock = threading.Lock()
+
+    def handle(request):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.05)
+        with lock:
+            active[0] -= 1
+        return build_tool_response(request.id, {"ok": True})
+
+    server._inspect_handler.handle = handle
+    # Distinct params, so the calls are not coalesced
+    batch = [
+        {"id": f"c-{i}", "method": "lightning.inspect", "params": {"what": "environment", "n": i}}
+        for i in range(n)
+    ]
+    responses = server._handle_message(json.dumps(batch))
+    assert [r.id for r in responses] == [f"c-{i}" for i in range(n)]
+    return peak[0]
+
+
+def test_stdio_batch_without_capture_runs_sequentially():
+    """Without output capture, handlers' fd redirections must not overlap."""
+    from lightning_mcp.capture import get_capture
+    from lightning_mcp.executor import BoundedExecutor
+
+    assert get_capture() is None
+    server = MCPServer(stdin=io.StringIO(), stdout=io.StringIO(), executor=BoundedExecutor(max_workers=3))
+    assert _batch_concurrency(server, 3) == 1
+
+
+def test_stdio_batch_with_capture_runs_concurrently(monkeypatch):
+    """With output capture installed, batch requests share the executor."""
+    from lightning_mcp import server as server_module
+    from lightning_mcp.executor import BoundedExecutor
+
+    monkeypatch.setattr(server_module, "get_capture", lambda: object())
+    server = MCPServer(stdin=io.StringIO(), stdout=io.StringIO(), executor=BoundedExecutor(max_workers=3))
+    assert _batch_concurrency(server, 3) > 1
@@ -0,0 +1,84 @@
+"""Unix domain socket transport and the stdio shim."""
+
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+
+from lightning_mcp.unix_server import UnixSocketServer
+
+
+def _call(sock_file, payload: dict) -> dict:
+    sock_file.write(json.dumps(payload).encode() + b"\n")
+    sock_file.flush()
+    return json.loads(sock_file.readline())
+
+
+def test_unix_server_serves_concurrent_clients(temp_dir):
+    path = os.path.join(temp_dir, "mcp.sock")
+    server = UnixSocketServer(path)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        assert os.stat(path).st_mode & 0o777 == 0o600
+
+        clients = []
+        for _ in range(2):
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.connect(path)
+            clients.append((sock, sock.makefile("rwb")))
+
+        # Interleave requests on both connections: each gets its own replies
+        for i, (_, f) in enumerate(clients):
+            response = _call(f, {"id": f"init-{i}", "method": "initialize", "params": {}})
+            assert response["id"] == f"init-{i}"
+            assert response["result"]["serverInfo"]["name"] == "lightning-mcp"
+        for i, (_, f) in enumerate(clients):
+            response = _call(f, {"id": f"list-{i}", "method": "tools/list", "params": {}})
+            assert response["id"] == f"list-{i}"
+            assert response["result"]["tools"]
+
+        for sock, f in clients:
+            f.close()
+            sock.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert not os.path.exists(path)
+
+
+def test_connect_shim_relays_stdio(temp_dir):
+    path = os.path.join(temp_dir, "mcp.sock")
+    server = UnixSocketServer(path)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        requests = [
+            {"id": "1", "method": "initialize", "params": {}},
+            {"id": "2", "method": "tools/list", "params": {}},
+        ]
+        out = subprocess.run(
+            [sys.executable, "-m", "lightning_mcp.cli", "connect", path],
+            input="".join(json.dumps(r) + "\n" for r in requests),
+            capture_output=True,
+            text=True,
+            timeout=60,
+            check=True,
+        )
+        responses = [json.loads(line) for line in out.stdout.splitlines()]
+        assert [r["id"] for r in responses] == ["1", "2"]
+        assert "error" not in responses[1]
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_stale_socket_is_replaced(temp_dir):
+    path = os.path.join(temp_dir, "mcp.sock")
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(path)
+    stale.close()  # leaves the file behind with nobody listening
+
+    server = UnixSocketServer(path)
+    server.server_close()
@@ -0,0 +1,74 @@
+"""Multi-worker HTTP serving with shared preloaded weights."""
+
+import json
+import signal
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _post(port: int, payload: dict) -> dict:
+    request = urllib.request.Request(
+        f"http://127.0.0.1:{port}/mcp",
+        data=json.dumps(payload).encode(),
+        headers={"Content-Type": "application/json"},
+    )
+    with urllib.request.urlopen(request, timeout=30) as response:
+        return json.loads(response.read())
+
+
+def test_workers_share_preloaded_weights(temp_dir):
+    model = {"_target_": "lightning_mcp.models.simple.SimpleClassifier", "input_dim": 512}
+    preload = f"{temp_dir}/preload.json"
+    with open(preload, "w") as f:
+        json.dump([{"model": model}], f)
+
+    port = _free_port()
+    proc = subprocess.Popen(
+        [
+            sys.executable, "-m", "lightning_mcp.cli",
+            "--http", "--port", str(port), "--workers", "2", "--preload", preload,
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = time.monotonic() + 90
+        while True:
+            try:
+                stats = _post(port, {
+                    "id": "s", "method": "tools/call",
+                    "params": {"name": "lightning.stats", "arguments": {}},
+                })
+                break
+            except OSError:
+                if time.monotonic() > deadline or proc.poll() is not None:
+                    raise
+                time.sleep(0.5)
+
+        structured = stats["result"]["structuredContent"]
+        assert structured["memory"]["shared_weights_bytes"] == (512 * 3 + 3) * 4
+        assert len(structured["workers"]) == 2
+        for worker in structured["workers"]:
+            assert worker["pss_bytes"] <= worker["rss_bytes"]
+        # Metrics are those of the answering worker, and say so
+        index = structured["worker"]["index"]
+        assert structured["worker"]["pid"] in {w["pid"] for w in structured["workers"]}
+        assert f'lightning_mcp_requests_in_flight{{worker="{index}"}}' in structured["gauges"]
+
+        predicted = _post(port, {
+            "id": "p", "method": "lightning.predict",
+            "params": {"model": model, "trainer": {"accelerator": "cpu"}},
+        })
+        assert predicted["result"]["structuredContent"]["num_batches"] == 2
+    finally:
+        proc.send_signal(signal.SIGTERM)
+        proc.wait(timeout=30)
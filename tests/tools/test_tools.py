@@ -119,3 +119,10 @@ def test_stdio_server_tools_call_wrapper():
     structured = response["result"]["structuredContent"]
     assert "python" in structured
     assert "torch" in structured
+
+
+def test_tools_accept_diagnostics_opt_in():
+    """Every tool schema declares the boolean 'diagnostics' opt-in."""
+
+    for tool in list_tools():
+        assert tool["inputSchema"]["properties"]["diagnostics"]["type"] == "boolean"